@@ -1,6 +1,7 @@
 import sys
 import os
-from flask import Flask, jsonify, request, render_template, redirect, url_for
+import click
+from flask import Flask, jsonify, request, render_template, redirect, url_for, flash
 from flask_login import LoginManager, current_user
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
@@ -13,6 +14,9 @@ from datetime import datetime
 from models.base import db
 from models.user import User, Role, UserRole, Permission
 from models.faculty import Faculty
+from models.activity_counter import FacultyActivityCounter
+from models.search_index import SearchTerm
+from models.directory_facet import FacultyDirectoryFacet
 from models.department import College, Department, Program, Branch
 from config.config import config
 
@@ -21,9 +25,11 @@ from routes.auth_routes import auth_bp
 from routes.faculty_routes import faculty_bp
 from routes.hod_routes import hod_bp
 from routes.admin_routes import admin_bp
+from routes.attachment_routes import attachments_bp
 from routes.api.auth_api import auth_api_bp
 from routes.api.faculty_api import faculty_api_bp
 from routes.api.admin_api import admin_api_bp
+from routes.api.search_api import search_api_bp
 
 # Initialize extensions
 login_manager = LoginManager()
@@ -39,6 +45,10 @@ def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    # Stream file uploads to disk, hashing and checking them as they arrive
+    from services.upload_ingestion import UploadRequest
+    app.request_class = UploadRequest
+    
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)  # Initialize Flask-Migrate with app and db
@@ -59,11 +69,13 @@ def create_app(config_name='default'):
     app.register_blueprint(faculty_bp, url_prefix='/faculty')
     app.register_blueprint(hod_bp, url_prefix='/hod')
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(attachments_bp, url_prefix='/attachments')
     
     # Register API blueprints
     app.register_blueprint(auth_api_bp, url_prefix='/api/auth')
     app.register_blueprint(faculty_api_bp, url_prefix='/api/faculty')
     app.register_blueprint(admin_api_bp, url_prefix='/api/admin')
+    app.register_blueprint(search_api_bp, url_prefix='/api/search')
     
     # Configure login manager
     login_manager.login_view = 'auth.login'
@@ -72,7 +84,9 @@ def create_app(config_name='default'):
     
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        # Roles and the user's own faculty row arrive in one query
+        from services.identity_service import IdentityService
+        return IdentityService.load_user(int(user_id))
     
     # Custom error handlers
     @app.errorhandler(403)
@@ -87,6 +101,15 @@ def create_app(config_name='default'):
     def internal_server_error(e):
         return render_template('errors/500.html'), 500
     
+    # Rejected uploads: the form is lost, so send the user back to it
+    @app.errorhandler(413)
+    @app.errorhandler(415)
+    def rejected_upload(e):
+        if request.path.startswith('/api/'):
+            return jsonify({"error": e.description}), e.code
+        flash(e.description, 'danger')
+        return redirect(request.referrer or url_for('index'))
+    
     # Exempting API routes from CSRF protection
     @app.before_request
     def csrf_protect():
@@ -96,6 +119,24 @@ def create_app(config_name='default'):
     @app.context_processor
     def inject_now():
         return {'now': datetime.now()}
+    
+    # Lookup labels for templates, served from the in-process registry
+    from services.lookup_registry import LookupRegistry
+    app.jinja_env.globals['lookup_label'] = LookupRegistry.label
+    
+    # Avatar and thumbnail URLs for gallery images
+    from services.thumbnail_service import ThumbnailService
+    app.jinja_env.globals['thumbnail_url'] = ThumbnailService.url
+    
+    # Documents under uploads/ are only served through /attachments/<id>
+    from services.attachment_access import AttachmentAccess
+    serve_static = app.view_functions['static']
+    
+    def static(filename):
+        if not AttachmentAccess.is_public_path(filename):
+            return page_not_found(None)
+        return serve_static(filename=filename)
+    app.view_functions['static'] = static
     # Root route
     # Root route
     @app.route('/')
@@ -109,12 +150,74 @@ def create_app(config_name='default'):
                 return redirect(url_for('faculty.dashboard'))
         return render_template('index.html', now=datetime.now())
     
+    @app.cli.command('repair-activity-counters')
+    def repair_activity_counters():
+        """Recompute every faculty activity counter from the activity tables."""
+        from services.counter_service import CounterService
+        count = CounterService.rebuild()
+        db.session.commit()
+        print(f'Rebuilt {count} faculty activity counters')
+    
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Rebuild the search inverted index from the faculty and activity tables."""
+        from services.search_service import SearchService
+        count = SearchService.rebuild()
+        db.session.commit()
+        print(f'Indexed {count} search documents')
+    
+    @app.cli.command('rebuild-directory-facets')
+    def rebuild_directory_facets():
+        """Recompute every faculty directory facet row."""
+        from services.directory_service import DirectoryService
+        count = DirectoryService.refresh()
+        db.session.commit()
+        print(f'Rebuilt {count} faculty directory facets')
+    
+    @app.cli.command('migrate-attachments')
+    def migrate_attachments():
+        """Move uploads saved before the blob store into it, merging duplicates and splitting off documents."""
+        from services.attachment_store import AttachmentStore
+        stats = AttachmentStore.migrate()
+        print(f"Migrated {stats['migrated']} attachments, merged {stats['merged']} duplicates, "
+              f"{stats['missing']} files missing")
+        separated = AttachmentStore.separate_documents()
+        print(f"Moved {separated} document references off shared gallery images")
+    
+    @app.cli.command('sweep-attachments')
+    @click.option('--dry-run', is_flag=True, help='Report orphans without deleting them.')
+    @click.option('--batch-size', default=500, show_default=True, help='Attachment rows checked per query batch.')
+    def sweep_attachments(dry_run, batch_size):
+        """Reclaim upload files and attachment rows nothing refers to; run it from cron."""
+        from services.attachment_store import AttachmentStore
+        stats = AttachmentStore.sweep(batch_size=batch_size, dry_run=dry_run)
+        verb = 'Found' if dry_run else 'Reclaimed'
+        print(f"Checked {stats['rows']} attachments against {stats['files']} files")
+        print(f"{verb} {stats['orphan_files']} orphaned files ({stats['orphan_bytes']} bytes) and "
+              f"{stats['unreferenced_rows']} unreferenced attachments ({stats['unreferenced_bytes']} bytes)")
+        print(f"{stats['missing_files']} attachments have no file")
+    
+    @app.cli.command('generate-thumbnails')
+    def generate_thumbnails():
+        """Render missing avatar and thumbnail images for every gallery image."""
+        from models.attachment import Attachment
+        from services.thumbnail_service import ThumbnailService
+        paths = [row.file_path for row in db.session.query(Attachment.file_path)
+                                                    .filter_by(attachment_type='gallery_image')]
+        futures = [ThumbnailService.generate_async(path) for path in paths
+                   if not ThumbnailService.is_rendered(path)]
+        futures = [future for future in futures if future is not None]
+        for future in futures:
+            future.result()
+        print(f'Rendered derivatives for {len(futures)} of {len(paths)} gallery images')
+    
     # Initialize database tables - Using Flask-Migrate instead of db.create_all()
     # Flask-Migrate will handle table creation through migrations
     with app.app_context():
         # Only create initial roles, db.create_all() is no longer needed
         _create_initial_roles()
         _create_lookup_tables()  # Add this line
+        LookupRegistry.warm()
     
     return app
 
@@ -0,0 +1,124 @@
+"""
+Benchmark the HOD department report at 100, 1,000 and 5,000 faculty.
+
+Compares the previous per-faculty COUNT loop with ReportService on an
+in-memory SQLite database and prints wall time and query count for each.
+
+    python benchmarks/department_report_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from models.base import db
+from models.user import User
+from models.department import College, Department
+from models.faculty import (
+    Faculty, FacultyAdditionalDetails, ResearchPublication, WorkshopSeminar,
+    HonoursAward, ResearchConsultancy
+)
+from services.report_service import ReportService
+
+SIZES = [100, 1000, 5000]
+
+
+def create_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(num_faculty):
+    """Create one department holding `num_faculty` faculty with random activity rows."""
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    
+    college = College(college_name='Benchmark College', college_code='BC')
+    department = Department(department_name='Benchmark', department_code='BM', college=college)
+    db.session.add(department)
+    db.session.flush()
+    
+    rng = random.Random(num_faculty)
+    faculty_rows = [{
+        'regdno': f'R{i:06d}',
+        'first_name': f'Faculty{i}',
+        'email': f'faculty{i}@example.com',
+        'join_date': date(2020, 1, 1),
+        'department_id': department.department_id
+    } for i in range(num_faculty)]
+    db.session.execute(Faculty.__table__.insert(), faculty_rows)
+    
+    faculty_ids = [row[0] for row in db.session.query(Faculty.faculty_id).all()]
+    db.session.execute(FacultyAdditionalDetails.__table__.insert(),
+                       [{'faculty_id': fid, 'position': 'Professor'} for fid in faculty_ids])
+    
+    for model, title_column in ((ResearchPublication, 'title'), (WorkshopSeminar, 'title'),
+                                (HonoursAward, 'award_title'), (ResearchConsultancy, 'project_title')):
+        rows = [{'faculty_id': fid, title_column: 'Benchmark entry'}
+                for fid in faculty_ids for _ in range(rng.randint(0, 6))]
+        if rows:
+            db.session.execute(model.__table__.insert(), rows)
+    
+    db.session.commit()
+    return department
+
+
+def legacy_report(department):
+    """The per-faculty loop previously used by HODController.department_report."""
+    faculty_members = Faculty.query.filter_by(department_id=department.department_id).all()
+    totals = [0, 0, 0, 0]
+    for faculty in faculty_members:
+        totals[0] += ResearchPublication.query.filter_by(faculty_id=faculty.faculty_id).count()
+        totals[1] += WorkshopSeminar.query.filter_by(faculty_id=faculty.faculty_id).count()
+        totals[2] += HonoursAward.query.filter_by(faculty_id=faculty.faculty_id).count()
+        totals[3] += ResearchConsultancy.query.filter_by(faculty_id=faculty.faculty_id).count()
+    return totals
+
+
+def engine_report(department):
+    report, rows = ReportService.department_report(department)
+    return [report['total_publications'], report['total_workshops'],
+            report['total_awards'], report['total_projects']]
+
+
+def measure(fn, department):
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', count)
+    db.session.expire_all()
+    start = time.perf_counter()
+    try:
+        result = fn(department)
+    finally:
+        elapsed = time.perf_counter() - start
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return result, elapsed, len(statements)
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        print(f"{'faculty':>8} {'variant':>8} {'seconds':>9} {'queries':>8}")
+        for size in SIZES:
+            department = seed(size)
+            legacy_totals, legacy_time, legacy_queries = measure(legacy_report, department)
+            engine_totals, engine_time, engine_queries = measure(engine_report, department)
+            assert legacy_totals == engine_totals, (legacy_totals, engine_totals)
+            print(f"{size:>8} {'legacy':>8} {legacy_time:>9.3f} {legacy_queries:>8}")
+            print(f"{size:>8} {'engine':>8} {engine_time:>9.3f} {engine_queries:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Check that the hot read paths are served by indexes.
+
+Seeds an SQLite database built from the models, runs the service calls and
+queries the controllers issue, captures every SELECT with its parameters and
+runs EXPLAIN QUERY PLAN on it. Exits with status 1 if any plan reads a table
+with a full scan, unless that check explicitly expects the scan (whole-table
+aggregates and small dimension tables). ANALYZE is not run, so the planner
+assumes production-sized tables instead of the few seeded rows.
+
+    python benchmarks/explain_queries.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from models.base import db
+from models.user import User, Role
+from models.department import College, Department
+from models.faculty import (
+    Faculty, FacultyAdditionalDetails, WorkExperience, TeachingActivity, ResearchPublication,
+    WorkshopSeminar, MDPFDP, HonoursAward, ResearchConsultancy, Activity, LookupTable
+)
+from config.constants import UserRoles, ProfileStatus, PUBLICATION_TYPES
+from services.approval_queue import ApprovalQueueService
+from services.counter_service import CounterService
+from services.directory_service import DirectoryService
+from services.hod_service import HODService
+from services.identity_service import IdentityContext, IdentityService
+from services.lookup_registry import LookupRegistry
+from services.profile_service import ProfileService
+from services.report_service import ReportService
+from services.search_service import SearchService
+from services.stats_service import StatsService
+from services.user_directory import UserDirectoryService
+
+NUM_DEPARTMENTS = 4
+FACULTY_PER_DEPARTMENT = 30
+
+# A plan step that reads every row of a table rather than seeking an index
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def create_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'explain.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['IDENTITY_CACHE_TTL'] = 0
+    app.config['STATS_CACHE_TTL'] = 0
+    db.init_app(app)
+    return app
+
+
+def seed():
+    """Create a few departments of faculty, each with one row in every activity table."""
+    db.create_all()
+    
+    roles = {name: Role(name=name) for name in (UserRoles.ADMIN, UserRoles.HOD, UserRoles.FACULTY)}
+    db.session.add_all(roles.values())
+    db.session.add_all(LookupTable(lookup_type='publication_type', lookup_value=value)
+                       for value in PUBLICATION_TYPES)
+    
+    college = College(college_name='Explain College', college_code='EC')
+    statuses = (ProfileStatus.PENDING, ProfileStatus.APPROVED, ProfileStatus.FROZEN)
+    
+    for d in range(NUM_DEPARTMENTS):
+        department = Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+        db.session.add(department)
+        db.session.flush()
+        
+        for i in range(FACULTY_PER_DEPARTMENT):
+            key = f'{d}_{i}'
+            user = User(username=f'user{key}', email=f'user{key}@example.com',
+                        first_name=f'First{key}', last_name=f'Last{key}')
+            user.password = 'explain'
+            user.roles.append(roles[UserRoles.HOD] if i == 0 else roles[UserRoles.FACULTY])
+            db.session.add(user)
+            db.session.flush()
+            
+            faculty = Faculty(user_id=user.user_id, regdno=f'R{key}', first_name=f'First{key}',
+                              last_name=f'Last{key}', email=f'faculty{key}@example.com',
+                              join_date=date(2020, 1, 1), department_id=department.department_id,
+                              profile_status=statuses[i % len(statuses)])
+            db.session.add(faculty)
+            db.session.flush()
+            
+            fid = faculty.faculty_id
+            db.session.add_all([
+                FacultyAdditionalDetails(faculty_id=fid),
+                WorkExperience(faculty_id=fid, institution_name='Institute', experience_type='Teaching'),
+                TeachingActivity(faculty_id=fid, course_name='Course'),
+                ResearchPublication(faculty_id=fid, title='Paper'),
+                WorkshopSeminar(faculty_id=fid, title='Workshop'),
+                MDPFDP(faculty_id=fid, title='Programme'),
+                HonoursAward(faculty_id=fid, award_title='Award'),
+                ResearchConsultancy(faculty_id=fid, project_title='Project'),
+                Activity(faculty_id=fid, activity_title='Activity')
+            ])
+    
+    admin = User(username='admin', email='admin@example.com', first_name='Admin')
+    admin.password = 'explain'
+    admin.roles.append(roles[UserRoles.ADMIN])
+    db.session.add(admin)
+    db.session.commit()
+    
+    return Faculty.query.filter_by(last_name='Last1_1').one()
+
+
+def build_checks(faculty):
+    """(name, callable, tables the plan may scan in full) for each read path."""
+    fid = faculty.faculty_id
+    department_id = faculty.department_id
+    department = db.session.get(Department, department_id)
+    first_page = UserDirectoryService.page({})
+    
+    return [
+        ('identity load', lambda: IdentityService._load_from_db(faculty.user_id), ()),
+        ('profile graph', lambda: ProfileService.load_profile(faculty_id=fid), ()),
+        ('profile by owner', lambda: ProfileService.load_profile(user_id=faculty.user_id), ()),
+        ('dashboard counters', lambda: CounterService.get_counts(fid), ()),
+        ('dashboard recent activities', lambda: Activity.query.filter_by(faculty_id=fid)
+            .order_by(Activity.created_at.desc()).limit(5).all(), ()),
+        ('work experiences', lambda: WorkExperience.query.filter_by(faculty_id=fid).all(), ()),
+        ('teaching activities', lambda: TeachingActivity.query.filter_by(faculty_id=fid).all(), ()),
+        ('publications', lambda: ResearchPublication.query.filter_by(faculty_id=fid).all(), ()),
+        ('workshops', lambda: WorkshopSeminar.query.filter_by(faculty_id=fid).all(), ()),
+        ('fdp/mdp', lambda: MDPFDP.query.filter_by(faculty_id=fid).all(), ()),
+        ('awards', lambda: HonoursAward.query.filter_by(faculty_id=fid).all(), ()),
+        ('projects', lambda: ResearchConsultancy.query.filter_by(faculty_id=fid).all(), ()),
+        ('additional details', lambda: FacultyAdditionalDetails.query.filter_by(faculty_id=fid).first(), ()),
+        ('regdno uniqueness', lambda: Faculty.query.filter_by(regdno='R0_0').first(), ()),
+        ('department report', lambda: ReportService.department_report(department), ()),
+        # Every department and HOD is listed, so those tables are read whole
+        ('institution report', ReportService.institution_report, ('departments', 'roles')),
+        # Grouped counts over the whole institution; faculty is covered by an index
+        ('stats snapshot', StatsService._compute_snapshot, ('roles', 'user_roles')),
+        ('pending queue', lambda: ApprovalQueueService.page(ProfileStatus.PENDING, {}), ()),
+        ('department frozen queue', lambda: ApprovalQueueService.page(
+            ProfileStatus.FROZEN, {}, department_id=department_id), ()),
+        ('user directory', lambda: UserDirectoryService.page({}), ()),
+        ('user directory next page', lambda: UserDirectoryService.page(
+            {'after': first_page['next_cursor'], 'limit': 20}), ()),
+        ('user directory by role', lambda: UserDirectoryService.page({'role': UserRoles.HOD}), ('roles',)),
+        ('hod assignments', HODService.hod_assignments, ('roles',)),
+        ('department heads', HODService.department_heads, ('departments', 'roles')),
+        ('hod candidates', lambda: HODService.candidates_page(department_id), ('roles',)),
+        # The registry deliberately loads the whole table once per process
+        ('lookup registry', LookupRegistry.warm, ('lookup_tables',)),
+        ('search', lambda: SearchService.search(IdentityContext(0, [UserRoles.ADMIN]), 'pap'), ()),
+        ('department search', lambda: SearchService.search(
+            IdentityContext(0, [UserRoles.HOD], department_id=department_id), 'work'), ()),
+        # The facet cube groups every facet row in scope by design
+        ('directory', lambda: DirectoryService.page({}), ('faculty_directory_facets', 'departments')),
+        ('department directory', lambda: DirectoryService.page(
+            {'status': ProfileStatus.APPROVED}, department_id=department_id), ('departments',)),
+    ]
+
+
+def capture(fn):
+    """Run fn and return the (statement, parameters) of every SELECT it issued."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    db.session.expire_all()
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return statements
+
+
+def full_scans(statement, parameters, tables):
+    """Return the real tables read with a full scan in the statement's plan."""
+    with db.engine.connect() as conn:
+        plan = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+    scans = []
+    for row in plan:
+        match = FULL_SCAN.match(row[-1])
+        if match and match.group(1) in tables:
+            scans.append(match.group(1))
+    return scans
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        faculty = seed()
+        tables = set(db.metadata.tables)
+        failures = 0
+        
+        for name, fn, allowed in build_checks(faculty):
+            statements = capture(fn)
+            unexpected = []
+            for statement, parameters in statements:
+                for table in full_scans(statement, parameters, tables):
+                    if table not in allowed:
+                        unexpected.append((table, statement))
+            
+            status = 'FAIL' if unexpected else 'ok'
+            print(f"{status:>4}  {name:<28} {len(statements):>3} queries")
+            for table, statement in unexpected:
+                print(f"      full scan of {table}:")
+                print('        ' + ' '.join(statement.split()))
+            failures += bool(unexpected)
+        
+        print(f"\n{failures} check(s) with unexpected full scans")
+    
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark /api/search ranking queries over 100,000 indexed documents.
+
+Seeds publications with titles drawn from a small vocabulary on an SQLite
+database, builds the inverted index with SearchService.rebuild and prints
+the median and worst latency of a few representative queries, as an admin
+and as an HOD.
+
+    python benchmarks/search_benchmark.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from models.base import db
+from models.department import College, Department
+from models.faculty import Faculty, ResearchPublication
+from models.search_index import SearchTerm
+from services.identity_service import IdentityContext
+from services.search_service import SearchService
+
+NUM_DOCUMENTS = 100000
+NUM_DEPARTMENTS = 10
+NUM_FACULTY = 1000
+RUNS = 20
+
+WORDS = ['learning', 'deep', 'network', 'neural', 'database', 'query', 'optimization', 'graph',
+         'distributed', 'systems', 'energy', 'solar', 'wireless', 'sensor', 'security', 'privacy',
+         'image', 'vision', 'language', 'model', 'analysis', 'control', 'robust', 'adaptive',
+         'cloud', 'edge', 'quantum', 'protein', 'materials', 'structural', 'concrete', 'fluid']
+
+QUERIES = ['learning', 'deep learn', 'dat', 'graph neural network', 'quantum materials', 'zz']
+
+
+def create_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'search.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed():
+    """Bulk insert faculty and publications, then build the index in one pass."""
+    db.create_all()
+    
+    college = College(college_name='Benchmark College', college_code='BC')
+    db.session.add_all(Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                       for d in range(NUM_DEPARTMENTS))
+    db.session.flush()
+    
+    db.session.execute(Faculty.__table__.insert(), [{
+        'regdno': f'R{i:06d}',
+        'first_name': f'Faculty{i}',
+        'email': f'faculty{i}@example.com',
+        'join_date': date(2020, 1, 1),
+        'department_id': i % NUM_DEPARTMENTS + 1
+    } for i in range(NUM_FACULTY)])
+    
+    rng = random.Random(NUM_DOCUMENTS)
+    db.session.execute(ResearchPublication.__table__.insert(), [{
+        'faculty_id': rng.randint(1, NUM_FACULTY),
+        'title': ' '.join(rng.sample(WORDS, 5)),
+        'journal_name': f'Journal {rng.randint(1, 200)}'
+    } for _ in range(NUM_DOCUMENTS)])
+    
+    start = time.perf_counter()
+    documents = SearchService.rebuild()
+    db.session.commit()
+    print(f"indexed {documents} documents, {SearchTerm.query.count()} postings "
+          f"in {time.perf_counter() - start:.1f}s\n")
+
+
+def measure(identity, query):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        results = SearchService.search(identity, query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return len(results), timings[len(timings) // 2], timings[-1]
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        seed()
+        viewers = [('admin', IdentityContext(0, ['admin'])),
+                   ('hod', IdentityContext(0, ['hod'], faculty_id=1, department_id=2))]
+        
+        print(f"{'viewer':>6} {'query':>22} {'hits':>5} {'median ms':>10} {'max ms':>8}")
+        for name, identity in viewers:
+            for query in QUERIES:
+                hits, median, worst = measure(identity, query)
+                print(f"{name:>6} {query:>22} {hits:>5} {median * 1000:>10.1f} {worst * 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
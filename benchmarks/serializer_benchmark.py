@@ -0,0 +1,160 @@
+"""
+Benchmark API serialization throughput in rows per second.
+
+Loads users, pending faculty and publications from an SQLite database and
+serializes the same objects three ways: the hand-built dicts the API
+handlers used before the schemas/ layer, CompiledSchema.serialize_many and
+marshmallow's own Schema.dump(many=True) on the same schema.
+
+    python benchmarks/serializer_benchmark.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy.orm import joinedload, selectinload
+from models.base import db
+from models.department import College, Department
+from models.faculty import Faculty, LookupTable, ResearchPublication
+from models.user import Role, User, UserRole
+from schemas.base import compiled
+from schemas.faculty import FacultySummarySchema, PublicationSchema
+from schemas.user import UserSchema
+from services.lookup_registry import LookupRegistry
+
+NUM_ROWS = 20000
+RUNS = 5
+
+
+def create_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'serializer.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed():
+    db.create_all()
+    rng = random.Random(NUM_ROWS)
+    
+    db.session.add_all([Role(name='faculty'), Role(name='hod')])
+    db.session.add_all(LookupTable(lookup_type='publication_type', lookup_value=f'Type {i}') for i in range(10))
+    college = College(college_name='Benchmark College', college_code='BC')
+    db.session.add_all(Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                       for d in range(10))
+    db.session.flush()
+    
+    db.session.execute(User.__table__.insert(), [{
+        'username': f'user{i}',
+        'email': f'user{i}@example.com',
+        'password_hash': 'x',
+        'first_name': 'User',
+        'last_name': str(i),
+        'is_active': True,
+        'created_at': datetime(2020, 1, 1, 9, 30)
+    } for i in range(NUM_ROWS)])
+    db.session.execute(UserRole.__table__.insert(), [{'user_id': i + 1, 'role_id': 1} for i in range(NUM_ROWS)])
+    
+    db.session.execute(Faculty.__table__.insert(), [{
+        'regdno': f'R{i:06d}',
+        'first_name': f'Faculty{i}',
+        'last_name': 'Member',
+        'email': f'faculty{i}@example.com',
+        'join_date': date(2015, 1, 1),
+        'department_id': i % 10 + 1,
+        'created_at': datetime(2020, 1, 1, 9, 30)
+    } for i in range(NUM_ROWS)])
+    
+    db.session.execute(ResearchPublication.__table__.insert(), [{
+        'faculty_id': rng.randint(1, NUM_ROWS),
+        'title': f'Publication {i}',
+        'journal_name': f'Journal {rng.randint(1, 200)}',
+        'type_id': rng.randint(1, 10),
+        'publication_date': date(2020, rng.randint(1, 12), rng.randint(1, 28))
+    } for i in range(NUM_ROWS)])
+    db.session.commit()
+
+
+# The hand-built dicts the handlers used before schemas/
+
+def user_dict(u):
+    return {
+        "user_id": u.user_id,
+        "username": u.username,
+        "email": u.email,
+        "first_name": u.first_name,
+        "last_name": u.last_name,
+        "is_active": u.is_active,
+        "roles": [role.name for role in u.roles],
+        "created_at": u.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def pending_dict(faculty):
+    return {
+        "faculty_id": faculty.faculty_id,
+        "name": faculty.full_name,
+        "email": faculty.email,
+        "department": faculty.department.department_name if faculty.department else None,
+        "join_date": faculty.join_date.strftime('%Y-%m-%d'),
+        "created_at": faculty.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def publication_dict(publication):
+    return {
+        "publication_id": publication.publication_id,
+        "title": publication.title,
+        "journal_name": publication.journal_name,
+        "type": LookupRegistry.label(publication.type_id, default=None),
+        "publication_date": publication.publication_date.strftime('%Y-%m-%d') if publication.publication_date else None,
+        "doi": publication.doi,
+        "description": publication.description,
+        "attachment_url": f"/attachments/{publication.attachment.attachment_id}" if publication.attachment else None
+    }
+
+
+def rows_per_second(serialize, rows):
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        serialize(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(rows) / best
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        seed()
+        LookupRegistry.warm()
+        
+        pending_schema = compiled(FacultySummarySchema, ('faculty_id', 'name', 'email', 'department',
+                                                         'join_date', 'created_at'))
+        cases = [
+            ('users', User.query.options(selectinload(User.roles)).all(), user_dict, UserSchema()),
+            ('pending faculty', Faculty.query.options(joinedload(Faculty.department)).all(),
+             pending_dict, pending_schema),
+            ('publications', ResearchPublication.query.options(joinedload(ResearchPublication.attachment)).all(),
+             publication_dict, PublicationSchema())
+        ]
+        
+        print(f"{'rows':>16} {'hand-built':>12} {'compiled':>12} {'Schema.dump':>12} {'speedup':>8}  (rows/sec)")
+        for name, rows, hand_built, schema in cases:
+            assert [hand_built(row) for row in rows[:100]] == schema.serialize_many(rows[:100])
+            manual = rows_per_second(lambda items: [hand_built(item) for item in items], rows)
+            fast = rows_per_second(schema.serialize_many, rows)
+            dumped = rows_per_second(lambda items: schema.dump(items, many=True), rows)
+            print(f"{name:>16} {manual:>12,.0f} {fast:>12,.0f} {dumped:>12,.0f} {fast / manual:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -25,7 +25,30 @@ class Config:
     PERMANENT_SESSION_LIFETIME = timedelta(hours=12)
     
     # Allowed uploads
-    ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+    ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'doc', 'docx'}
+    
+    # Largest single uploaded file in bytes, enforced while the upload streams in
+    MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 10 * 1024 * 1024))
+    
+    # Threads per worker rendering avatar and thumbnail images
+    THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', 2))
+    
+    # Attachment downloads: 'x-sendfile' (Apache, lighttpd) or 'x-accel-redirect'
+    # (nginx) hands the transfer to the front server; unset serves it from Python.
+    # ATTACHMENT_ACCEL_PREFIX is the internal nginx location aliased to UPLOAD_FOLDER.
+    ATTACHMENT_SENDFILE = os.environ.get('ATTACHMENT_SENDFILE')
+    ATTACHMENT_ACCEL_PREFIX = os.environ.get('ATTACHMENT_ACCEL_PREFIX', '/_protected_uploads/')
+    
+    # Attachment owner and permission cache lifetime in seconds; 0 disables it
+    ATTACHMENT_ACCESS_TTL = int(os.environ.get('ATTACHMENT_ACCESS_TTL', 60))
+    
+    # Dashboard statistics cache lifetime in seconds
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 60))
+    
+    # Identity cache shared by all workers on the host (default: instance/identity_cache.sqlite3);
+    # a TTL of 0 disables it
+    IDENTITY_CACHE_PATH = os.environ.get('IDENTITY_CACHE_PATH')
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 300))
     
     # Optional multiple DBs
     SQLALCHEMY_BINDS = {
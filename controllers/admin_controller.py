@@ -1,11 +1,20 @@
-from flask import current_app, flash, redirect, render_template, request, url_for, jsonify
+from flask import flash, redirect, render_template, request, url_for, jsonify
 from flask_login import current_user, login_required
 from models.base import db
 from models.faculty import Faculty
 from models.department import Department, College, Program, Branch
-from models.user import User, Role, UserRole
+from models.user import User, Role
 from config.constants import UserRoles, ProfileStatus
 from middleware.auth_middleware import admin_required, principal_required
+from services.stats_service import StatsService
+from services.report_service import ReportService
+from services.hod_service import HODService, PICKER_PAGE_SIZE
+from services.identity_service import IdentityService
+from services.user_directory import UserDirectoryService
+from services.approval_queue import ApprovalQueueService
+from services.profile_status import ProfileStatusService
+from services.attachment_store import AttachmentStore
+from services.thumbnail_service import ThumbnailService
 from flask_wtf import FlaskForm
 
 class AdminController:
@@ -19,34 +28,18 @@ class AdminController:
             return redirect(url_for('auth.login'))
             
         # Get counts for dashboard stats
-        faculty_count = Faculty.query.count()
-        department_count = Department.query.count()
-        pending_count = Faculty.query.filter_by(profile_status=ProfileStatus.PENDING).count()
-        frozen_count = Faculty.query.filter_by(profile_status=ProfileStatus.FROZEN).count()
+        status_counts = StatsService.status_counts()
         
         # Get recent faculty registrations
         recent_faculty = Faculty.query.order_by(Faculty.created_at.desc()).limit(5).all()
         
-        # Get roles distribution
-        admin_count = UserRole.query.join(Role).filter(Role.name == UserRoles.ADMIN).count()
-        principal_count = UserRole.query.join(Role).filter(Role.name == UserRoles.PRINCIPAL).count()
-        hod_count = UserRole.query.join(Role).filter(Role.name == UserRoles.HOD).count()
-        faculty_role_count = UserRole.query.join(Role).filter(Role.name == UserRoles.FACULTY).count()
-        
-        role_distribution = {
-            'admin': admin_count,
-            'principal': principal_count,
-            'hod': hod_count,
-            'faculty': faculty_role_count
-        }
-        
         return render_template('admin/dashboard.html',
-                              faculty_count=faculty_count,
-                              department_count=department_count,
-                              pending_count=pending_count,
-                              frozen_count=frozen_count,
+                              faculty_count=status_counts['total'],
+                              department_count=StatsService.department_count(),
+                              pending_count=status_counts[ProfileStatus.PENDING],
+                              frozen_count=status_counts[ProfileStatus.FROZEN],
                               recent_faculty=recent_faculty,
-                              role_distribution=role_distribution)
+                              role_distribution=StatsService.role_distribution())
     
     @staticmethod
     def manage_users():
@@ -110,11 +103,21 @@ class AdminController:
             flash('User added successfully', 'success')
             return redirect(url_for('admin.manage_users'))
                 
-        # GET request - display users
-        users = User.query.all()
+        # GET request - display one keyset page of users
+        try:
+            page = UserDirectoryService.page(request.args)
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            return redirect(url_for('admin.manage_users'))
         roles = Role.query.all()
         
-        return render_template('admin/manage_users.html', users=users, roles=roles)
+        return render_template('admin/manage_users.html',
+                              users=page['users'],
+                              roles=roles,
+                              filters=page['filters'],
+                              limit=page['limit'],
+                              next_cursor=page['next_cursor'],
+                              prev_cursor=page['prev_cursor'])
     @staticmethod
     def deactivate_user(user_id):
         """Deactivate a user."""
@@ -131,6 +134,7 @@ class AdminController:
         
         user.is_active = False
         db.session.commit()
+        IdentityService.invalidate(user.user_id)
         
         flash('User deactivated successfully', 'success')
         return redirect(url_for('admin.manage_users'))
@@ -145,6 +149,7 @@ class AdminController:
         
         user.is_active = True
         db.session.commit()
+        IdentityService.invalidate(user.user_id)
         
         flash('User activated successfully', 'success')
         return redirect(url_for('admin.manage_users'))
@@ -199,6 +204,7 @@ class AdminController:
                     user.roles.append(role)
             
             db.session.commit()
+            IdentityService.invalidate(user.user_id)
             
             flash('User updated successfully', 'success')
             return redirect(url_for('admin.manage_users'))
@@ -219,14 +225,18 @@ class AdminController:
             flash('You cannot delete your own account', 'danger')
             return redirect(url_for('admin.manage_users'))
         
-        # Delete faculty profile if exists
+        # Delete faculty profile if exists, releasing its attachments with it
         faculty = Faculty.query.filter_by(user_id=user.user_id).first()
         if faculty:
-            db.session.delete(faculty)
+            # Loading the cascade must not flush the released rows ahead of their owners
+            with db.session.no_autoflush:
+                AttachmentStore.release_faculty(faculty.faculty_id)
+                db.session.delete(faculty)
         
         # Delete user
         db.session.delete(user)
         db.session.commit()
+        IdentityService.invalidate(user_id)
         
         flash('User deleted successfully', 'success')
         return redirect(url_for('admin.manage_users'))
@@ -277,12 +287,9 @@ class AdminController:
                 college_id=college_id
             )
             
-            # Handle logo upload
+            # Handle logo upload; stored in the same transaction as the department
             if 'logo' in request.files and request.files['logo'].filename:
-                from controllers.faculty_controller import FacultyController
-                logo_file = request.files['logo']
-                filename = FacultyController._save_attachment(logo_file, 'gallery_image').file_path
-                department.logo = filename
+                department.logo = AttachmentStore.save(request.files['logo'], 'gallery_image').file_path
             
             db.session.add(department)
             db.session.commit()
@@ -308,12 +315,12 @@ class AdminController:
             department.department_code = request.form.get('department_code')
             department.college_id = request.form.get('college_id')
             
-            # Handle logo upload
+            # Handle logo upload, releasing the logo it replaces
             if 'logo' in request.files and request.files['logo'].filename:
-                from controllers.faculty_controller import FacultyController
-                logo_file = request.files['logo']
-                filename = FacultyController._save_attachment(logo_file, 'gallery_image').file_path
-                department.logo = filename
+                old_logo = department.logo
+                department.logo = AttachmentStore.save(request.files['logo'], 'gallery_image').file_path
+                if old_logo:
+                    AttachmentStore.release_path(old_logo)
             
             db.session.commit()
             
@@ -338,12 +345,9 @@ class AdminController:
             flash(f'Cannot delete department with {faculty_count} faculty members assigned', 'danger')
             return redirect(url_for('admin.manage_departments'))
         
-        # Delete department's logo if it exists
+        # Release department's logo if it exists; the blob may be shared
         if department.logo:
-            from controllers.faculty_controller import FacultyController
-            logo_path = os.path.join(current_app.config['UPLOAD_FOLDER'], department.logo)
-            if os.path.exists(logo_path):
-                os.remove(logo_path)
+            AttachmentStore.release_path(department.logo)
         
         # Delete department
         db.session.delete(department)
@@ -420,9 +424,16 @@ class AdminController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        pending_faculty = Faculty.query.filter_by(profile_status=ProfileStatus.PENDING).all()
+        # One cursor page of the queue, oldest first
+        try:
+            queue = ApprovalQueueService.page(ProfileStatus.PENDING, request.args)
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            return redirect(url_for('admin.pending_approvals'))
         
-        return render_template('admin/pending_approvals.html', pending_faculty=pending_faculty)
+        return render_template('admin/pending_approvals.html',
+                              pending_faculty=queue['faculty'],
+                              queue=queue)
     
     @staticmethod
     def frozen_profiles():
@@ -431,9 +442,57 @@ class AdminController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        frozen_faculty = Faculty.query.filter_by(profile_status=ProfileStatus.FROZEN).all()
+        # One cursor page of the queue, oldest first
+        try:
+            queue = ApprovalQueueService.page(ProfileStatus.FROZEN, request.args)
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            return redirect(url_for('admin.frozen_profiles'))
+        
+        return render_template('admin/frozen_profiles.html',
+                              frozen_faculty=queue['faculty'],
+                              queue=queue)
+    
+    @staticmethod
+    def approve_selected():
+        """Approve the profiles selected on the pending approvals page."""
+        return AdminController._change_selected_status('approve', 'admin.pending_approvals')
+    
+    @staticmethod
+    def freeze_selected():
+        """Freeze a selection of faculty profiles."""
+        return AdminController._change_selected_status('freeze', 'admin.frozen_profiles')
+    
+    @staticmethod
+    def unfreeze_selected():
+        """Unfreeze the profiles selected on the frozen profiles page."""
+        return AdminController._change_selected_status('unfreeze', 'admin.frozen_profiles')
+    
+    @staticmethod
+    def _change_selected_status(action, endpoint):
+        """Apply a bulk status action to the posted `faculty_ids` and go back to `endpoint`."""
+        if not (current_user.is_admin or current_user.is_principal or current_user.is_hod):
+            flash('Access denied', 'danger')
+            return redirect(url_for('auth.login'))
+        
+        try:
+            faculty_ids = ProfileStatusService.parse_ids(request.form.getlist('faculty_ids'))
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for(endpoint))
         
-        return render_template('admin/frozen_profiles.html', frozen_faculty=frozen_faculty)
+        # All or nothing: one scope check, one UPDATE, one batch of emails
+        result = ProfileStatusService.apply(action, faculty_ids, current_user.identity)
+        
+        if result['missing']:
+            flash('Some selected profiles no longer exist. No profiles were changed.', 'warning')
+        elif result['forbidden']:
+            flash('You can only change profiles of faculty in your department. No profiles were changed.', 'danger')
+        else:
+            past_tense = {'approve': 'approved', 'freeze': 'frozen', 'unfreeze': 'unfrozen'}[action]
+            flash(f"{len(result['updated'])} profile(s) {past_tense}", 'success')
+        
+        return redirect(url_for(endpoint))
     
     @staticmethod
     def faculty_report():
@@ -442,34 +501,14 @@ class AdminController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
         
-        # Get faculty count by department
-        departments = Department.query.all()
-        department_stats = []
-        
-        for dept in departments:
-            faculty_count = Faculty.query.filter_by(department_id=dept.department_id).count()
-            department_stats.append({
-                'department': dept,
-                'faculty_count': faculty_count
-            })
-        
-        # Get faculty count by status
-        status_counts = {
-            'total': Faculty.query.count(),
-            'pending': Faculty.query.filter_by(profile_status=ProfileStatus.PENDING).count(),
-            'approved': Faculty.query.filter_by(profile_status=ProfileStatus.APPROVED).count(),
-            'frozen': Faculty.query.filter_by(profile_status=ProfileStatus.FROZEN).count(),
-            'unfrozen': Faculty.query.filter_by(profile_status=ProfileStatus.UNFROZEN).count()
-        }
-        
-        # Get recent activities
-        from models.faculty import Activity
-        recent_activities = Activity.query.order_by(Activity.created_at.desc()).limit(10).all()
+        # Materialized report view model built in a fixed number of queries
+        report = ReportService.institution_report()
         
         return render_template('admin/faculty_report.html',
-                              department_stats=department_stats,
-                              status_counts=status_counts,
-                              recent_activities=recent_activities)
+                              department_stats=report['department_stats'],
+                              status_counts=report['status_counts'],
+                              recent_activities=report['recent_activities'])
+    
     @staticmethod
     def add_college():
         """Add a new college."""
@@ -497,12 +536,9 @@ class AdminController:
                 college_code=college_code
             )
             
-            # Handle logo upload
+            # Handle logo upload; stored in the same transaction as the college
             if 'logo' in request.files and request.files['logo'].filename:
-                from controllers.faculty_controller import FacultyController
-                logo_file = request.files['logo']
-                filename = FacultyController._save_attachment(logo_file, 'gallery_image').file_path
-                college.logo = filename
+                college.logo = AttachmentStore.save(request.files['logo'], 'gallery_image').file_path
             
             db.session.add(college)
             db.session.commit()
@@ -550,15 +586,29 @@ class AdminController:
             if hod_role not in user.roles:
                 user.roles.append(hod_role)
                 db.session.commit()
+                IdentityService.invalidate(user.user_id)
                 flash(f'{faculty.full_name} has been assigned as HOD', 'success')
             else:
                 flash(f'{faculty.full_name} is already a HOD', 'info')
         
-        # Get departments and faculty
-        departments = Department.query.all()
-        faculty_by_dept = {}
+        # Departments with their current HOD, from the HOD rows only
+        department_heads = HODService.department_heads()
+        
+        return render_template('admin/assign_hod.html', department_heads=department_heads, form=form)
+    
+    @staticmethod
+    def hod_candidates():
+        """Return one page of HOD candidates for a department as JSON; the route is admin-only like assign_hod."""
+        department_id = request.args.get('department_id', type=int)
+        if not department_id:
+            return jsonify({"error": "department_id is required"}), 400
+        
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', PICKER_PAGE_SIZE, type=int)
         
-        for dept in departments:
-            faculty_by_dept[dept.department_id] = Faculty.query.filter_by(department_id=dept.department_id).all()
+        candidates = HODService.candidates_page(department_id, page=page, per_page=per_page)
+        current_hod = candidates['current_hod']
+        if current_hod and current_hod['photo_path']:
+            current_hod['photo_url'] = ThumbnailService.url(current_hod['photo_path'])
         
-        return render_template('admin/assign_hod.html', departments=departments, faculty_by_dept=faculty_by_dept, form=form)
\ No newline at end of file
+        return jsonify(candidates), 200
@@ -0,0 +1,91 @@
+import mimetypes
+import os
+from flask import abort, current_app, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_login import current_user
+from werkzeug.utils import send_file
+from services.attachment_access import AttachmentAccess
+from services.identity_service import IdentityService
+
+
+# Blob names never change content, so browsers may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def _viewer():
+    """The signed-in user from the session cookie or a JWT bearer token, or None."""
+    if current_user.is_authenticated:
+        return current_user
+    if verify_jwt_in_request(optional=True):
+        return IdentityService.load_user(get_jwt_identity())
+    return None
+
+
+class AttachmentController:
+    """Controller for downloading uploaded files."""
+    
+    @staticmethod
+    def _cache_headers(response, record):
+        response.cache_control.private = True
+        if record['content_hash'] and record['file_path'].startswith('blobs/'):
+            response.cache_control.no_cache = None
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # Legacy names can be overwritten, so always revalidate
+            response.cache_control.no_cache = True
+        return response
+    
+    @staticmethod
+    def _accel_redirect(record, full_path, mimetype):
+        """Empty response telling nginx to send the file from its internal location."""
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = current_app.config['ATTACHMENT_ACCEL_PREFIX'] + record['file_path']
+        response.headers['Content-Disposition'] = 'inline'
+        response.set_etag(record['content_hash'] or f"{record['attachment_id']}-{os.stat(full_path).st_mtime_ns}")
+        response.last_modified = record['uploaded_at']
+        return response.make_conditional(request)
+    
+    @staticmethod
+    def serve(attachment_id):
+        """
+        Send an attachment to a viewer allowed to see it.
+        
+        Range, If-None-Match and If-Modified-Since requests are answered
+        with 206 and 304 responses. With ATTACHMENT_SENDFILE set the body is
+        left to the front server and only the headers come from here.
+        """
+        viewer = _viewer()
+        if viewer is None:
+            return current_app.login_manager.unauthorized()
+        
+        record = AttachmentAccess.record(attachment_id)
+        if record is None:
+            abort(404)
+        if not AttachmentAccess.allowed(viewer.identity, record):
+            abort(403)
+        
+        full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], *record['file_path'].split('/'))
+        if not os.path.isfile(full_path):
+            abort(404)
+        
+        extension = os.path.splitext(record['file_path'])[1]
+        mimetype = mimetypes.guess_type(record['file_path'])[0] or 'application/octet-stream'
+        mode = current_app.config.get('ATTACHMENT_SENDFILE')
+        
+        if mode == 'x-accel-redirect':
+            response = AttachmentController._accel_redirect(record, full_path, mimetype)
+        else:
+            response = send_file(
+                full_path,
+                request.environ,
+                mimetype=mimetype,
+                download_name=f'attachment-{attachment_id}{extension}',
+                conditional=True,
+                etag=record['content_hash'] or True,
+                use_x_sendfile=mode == 'x-sendfile',
+                response_class=current_app.response_class,
+                _root_path=current_app.root_path
+            )
+        
+        return AttachmentController._cache_headers(response, record)
@@ -1,19 +1,21 @@
-import os
 from datetime import datetime
-from flask import current_app, flash, redirect, render_template, request, url_for, jsonify, abort
+from flask import flash, redirect, render_template, request, url_for, jsonify, abort
 from flask_login import current_user, login_required
-from werkzeug.utils import secure_filename
 from models.base import db
 from models.faculty import (
     Faculty, FacultyAdditionalDetails, WorkExperience, TeachingActivity,
     ResearchPublication, WorkshopSeminar, MDPFDP, HonoursAward,
-    ResearchConsultancy, Activity, LookupTable  
+    ResearchConsultancy, Activity
 )
 from models.attachment import Attachment
 from models.department import Department, College
 from models.user import User
 from config.constants import ProfileStatus, Visibility, ExperienceTypes
 from middleware.auth_middleware import faculty_required
+from services.profile_service import ProfileService
+from services.counter_service import CounterService
+from services.lookup_registry import LookupRegistry
+from services.attachment_store import AttachmentStore
 
 
 class FacultyController:
@@ -27,23 +29,16 @@ class FacultyController:
             return redirect(url_for('auth.login'))
             
         # Get faculty profile
-        faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        faculty_id = current_user.identity.faculty_id
+        faculty = Faculty.query.get(faculty_id) if faculty_id else None
         
         # If faculty profile doesn't exist, redirect to create profile
         if not faculty:
             flash('Please complete your faculty profile', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
-        # Count different entries for dashboard statistics
-        stats = {
-            'publications': ResearchPublication.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'teaching': TeachingActivity.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'workshops': WorkshopSeminar.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'fdp_mdp': MDPFDP.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'awards': HonoursAward.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'projects': ResearchConsultancy.query.filter_by(faculty_id=faculty.faculty_id).count(),
-            'activities': Activity.query.filter_by(faculty_id=faculty.faculty_id).count()
-        }
+        # Dashboard statistics come from the activity counter cache
+        stats = CounterService.get_counts(faculty.faculty_id)
         
         # Get recent activities for dashboard display
         recent_activities = Activity.query.filter_by(faculty_id=faculty.faculty_id) \
@@ -64,10 +59,10 @@ class FacultyController:
             return redirect(url_for('auth.login'))
             
         # Check if faculty profile already exists
-        existing_profile = Faculty.query.filter_by(user_id=current_user.user_id).first()
-        if existing_profile:
+        existing_profile_id = current_user.identity.faculty_id
+        if existing_profile_id:
             flash('Faculty profile already exists', 'warning')
-            return redirect(url_for('faculty.view_profile', faculty_id=existing_profile.faculty_id))
+            return redirect(url_for('faculty.view_profile', faculty_id=existing_profile_id))
             
         if request.method == 'POST':
             # Get form data
@@ -145,7 +140,10 @@ class FacultyController:
     @staticmethod
     def view_profile(faculty_id):
         """View a faculty profile."""
-        faculty = Faculty.query.get_or_404(faculty_id)
+        # Load the whole profile graph up front so the template never lazy loads
+        faculty = ProfileService.load_profile(faculty_id=faculty_id)
+        if not faculty:
+            abort(404)
         
         # Only allow viewing if current user is the faculty member, an admin, a principal,
         # or an HOD of the same department
@@ -154,8 +152,7 @@ class FacultyController:
             pass
         elif current_user.is_hod:
             # HODs can only view faculty in their department
-            hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
-            if not hod_faculty or hod_faculty.department_id != faculty.department_id:
+            if not current_user.identity.can_manage_department(faculty.department_id):
                 flash('You can only view faculty in your department', 'danger')
                 return redirect(url_for('faculty.dashboard'))
         elif current_user.is_faculty:
@@ -167,28 +164,17 @@ class FacultyController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
         
-        # Get related data
-        additional_details = FacultyAdditionalDetails.query.filter_by(faculty_id=faculty_id).first()
-        work_experiences = WorkExperience.query.filter_by(faculty_id=faculty_id).all()
-        teaching_activities = TeachingActivity.query.filter_by(faculty_id=faculty_id).all()
-        research_publications = ResearchPublication.query.filter_by(faculty_id=faculty_id).all()
-        workshops_seminars = WorkshopSeminar.query.filter_by(faculty_id=faculty_id).all()
-        mdp_fdp = MDPFDP.query.filter_by(faculty_id=faculty_id).all()
-        honours_awards = HonoursAward.query.filter_by(faculty_id=faculty_id).all()
-        research_consultancy = ResearchConsultancy.query.filter_by(faculty_id=faculty_id).all()
-        activities = Activity.query.filter_by(faculty_id=faculty_id).all()
-        
         return render_template('faculty/view_profile.html',
                               faculty=faculty,
-                              additional_details=additional_details,
-                              work_experiences=work_experiences,
-                              teaching_activities=teaching_activities,
-                              research_publications=research_publications,
-                              workshops_seminars=workshops_seminars,
-                              mdp_fdp=mdp_fdp,
-                              honours_awards=honours_awards,
-                              research_consultancy=research_consultancy,
-                              activities=activities)
+                              additional_details=faculty.additional_details,
+                              work_experiences=faculty.work_experiences,
+                              teaching_activities=faculty.teaching_activities,
+                              research_publications=faculty.research_publications,
+                              workshops_seminars=faculty.workshops_seminars,
+                              mdp_fdp=faculty.mdp_fdp,
+                              honours_awards=faculty.honours_awards,
+                              research_consultancy=faculty.research_consultancy,
+                              activities=faculty.activities)
     
     @staticmethod
     def edit_profile(faculty_id):
@@ -219,8 +205,9 @@ class FacultyController:
             if 'photo' in request.files and request.files['photo'].filename:
                 photo_file = request.files['photo']
                 if faculty.photo_attachment_id:
-                    # Update existing attachment
-                    FacultyController._update_attachment(faculty.photo_attachment_id, photo_file)
+                    # Replace the existing attachment
+                    photo_attachment = FacultyController._update_attachment(faculty.photo_attachment_id, photo_file)
+                    faculty.photo_attachment_id = photo_attachment.attachment_id
                 else:
                     # Create new attachment
                     photo_attachment = FacultyController._save_attachment(photo_file, 'gallery_image')
@@ -229,8 +216,9 @@ class FacultyController:
             if 'aadhar' in request.files and request.files['aadhar'].filename:
                 aadhar_file = request.files['aadhar']
                 if faculty.aadhar_attachment_id:
-                    # Update existing attachment
-                    FacultyController._update_attachment(faculty.aadhar_attachment_id, aadhar_file)
+                    # Replace the existing attachment
+                    aadhar_attachment = FacultyController._update_attachment(faculty.aadhar_attachment_id, aadhar_file)
+                    faculty.aadhar_attachment_id = aadhar_attachment.attachment_id
                 else:
                     # Create new attachment
                     aadhar_attachment = FacultyController._save_attachment(aadhar_file, 'attachment')
@@ -239,8 +227,9 @@ class FacultyController:
             if 'pan' in request.files and request.files['pan'].filename:
                 pan_file = request.files['pan']
                 if faculty.pan_attachment_id:
-                    # Update existing attachment
-                    FacultyController._update_attachment(faculty.pan_attachment_id, pan_file)
+                    # Replace the existing attachment
+                    pan_attachment = FacultyController._update_attachment(faculty.pan_attachment_id, pan_file)
+                    faculty.pan_attachment_id = pan_attachment.attachment_id
                 else:
                     # Create new attachment
                     pan_attachment = FacultyController._save_attachment(pan_file, 'attachment')
@@ -463,8 +452,7 @@ class FacultyController:
             
         # For HODs, check if they're in the same department
         if current_user.is_hod and not current_user.is_admin and not current_user.is_principal:
-            hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
-            if not hod_faculty or hod_faculty.department_id != faculty.department_id:
+            if not current_user.identity.can_manage_department(faculty.department_id):
                 flash('You can only unfreeze faculty in your department', 'danger')
                 return redirect(url_for('faculty.dashboard'))
         
@@ -486,8 +474,7 @@ class FacultyController:
             
         # For HODs, check if they're in the same department
         if current_user.is_hod and not current_user.is_admin and not current_user.is_principal:
-            hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
-            if not hod_faculty or hod_faculty.department_id != faculty.department_id:
+            if not current_user.identity.can_manage_department(faculty.department_id):
                 flash('You can only approve faculty in your department', 'danger')
                 return redirect(url_for('faculty.dashboard'))
         
@@ -502,62 +489,37 @@ class FacultyController:
     @staticmethod
     def _save_attachment(file_obj, attachment_type):
         """Save a file attachment and return the attachment object."""
-        filename = secure_filename(file_obj.filename)
-        # Create unique filename by adding timestamp
-        unique_filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
-        
-        # Create upload directory if it doesn't exist
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-            
-        # Save file
-        file_path = os.path.join(upload_folder, unique_filename)
-        file_obj.save(file_path)
-        
-        # Create attachment record
-        attachment = Attachment(
-            file_path=unique_filename,
-            attachment_type=attachment_type
-        )
-        db.session.add(attachment)
+        # Identical content is stored once and shared between owners
+        attachment = AttachmentStore.save(file_obj, attachment_type)
         db.session.commit()
         
         return attachment
     
     @staticmethod
     def _update_attachment(attachment_id, file_obj):
-        """Update an existing attachment with a new file."""
-        attachment = Attachment.query.get_or_404(attachment_id)
+        """
+        Replace the file behind an attachment reference.
         
-        # Delete old file
-        old_file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], attachment.file_path)
-        if os.path.exists(old_file_path):
-            os.remove(old_file_path)
-            
-        # Save new file
-        filename = secure_filename(file_obj.filename)
-        unique_filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
-        
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-        file_obj.save(file_path)
+        Attachments may be shared, so the new content gets its own (possibly
+        existing) attachment and the old one loses a reference. Returns the
+        new attachment; the caller points its column at it and commits.
+        """
+        attachment = Attachment.query.get_or_404(attachment_id)
         
-        # Update attachment record
-        attachment.file_path = unique_filename
-        attachment.uploaded_at = datetime.utcnow()
-        db.session.commit()
+        new_attachment = AttachmentStore.save(file_obj, attachment.attachment_type)
+        AttachmentStore.release(attachment)
         
-        return attachment
+        return new_attachment
     
     @staticmethod
     def _delete_attachment(attachment):
-        """Delete an attachment and its file."""
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], attachment.file_path)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            
-        db.session.delete(attachment)
-        db.session.commit()
+        """
+        Drop a reference to an attachment, deleting its file with the last one.
+        
+        The caller deletes the owner and commits; the row goes in the same
+        flush and the file is removed once the commit succeeds.
+        """
+        AttachmentStore.release(attachment)
     # controllers/faculty_controller.py
     # Add these methods to the existing FacultyController class
 
@@ -682,12 +644,9 @@ class FacultyController:
         # Get existing publications
         publications = ResearchPublication.query.filter_by(faculty_id=faculty_id).all()
         
-        # Get publication types from lookup table
+        # Get publication types from the lookup registry
         from config.constants import PUBLICATION_TYPES
-        publication_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'publication_type',
-            LookupTable.lookup_value.in_(PUBLICATION_TYPES)
-        ).all()
+        publication_types = LookupRegistry.options('publication_type', PUBLICATION_TYPES)
         
         return render_template('faculty/manage_publications.html', 
                             faculty=faculty, 
@@ -709,12 +668,9 @@ class FacultyController:
             flash('This profile is currently frozen and cannot be edited', 'warning')
             return redirect(url_for('faculty.view_profile', faculty_id=faculty_id))
         
-        # Get publication types from lookup table
+        # Get publication types from the lookup registry
         from config.constants import PUBLICATION_TYPES
-        publication_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'publication_type',
-            LookupTable.lookup_value.in_(PUBLICATION_TYPES)
-        ).all()
+        publication_types = LookupRegistry.options('publication_type', PUBLICATION_TYPES)
         
         if request.method == 'POST':
             # Get form data
@@ -804,12 +760,9 @@ class FacultyController:
         # Get existing workshops
         workshops = WorkshopSeminar.query.filter_by(faculty_id=faculty_id).all()
         
-        # Get workshop types from lookup table
+        # Get workshop types from the lookup registry
         from config.constants import WORKSHOP_TYPES
-        workshop_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'workshop_type',
-            LookupTable.lookup_value.in_(WORKSHOP_TYPES)
-        ).all()
+        workshop_types = LookupRegistry.options('workshop_type', WORKSHOP_TYPES)
         
         return render_template('faculty/manage_workshops.html', 
                             faculty=faculty, 
@@ -831,12 +784,9 @@ class FacultyController:
             flash('This profile is currently frozen and cannot be edited', 'warning')
             return redirect(url_for('faculty.view_profile', faculty_id=faculty_id))
         
-        # Get workshop types from lookup table
+        # Get workshop types from the lookup registry
         from config.constants import WORKSHOP_TYPES
-        workshop_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'workshop_type',
-            LookupTable.lookup_value.in_(WORKSHOP_TYPES)
-        ).all()
+        workshop_types = LookupRegistry.options('workshop_type', WORKSHOP_TYPES)
         
         if request.method == 'POST':
             # Get form data
@@ -926,12 +876,9 @@ class FacultyController:
         # Get existing programs
         programs = MDPFDP.query.filter_by(faculty_id=faculty_id).all()
         
-        # Get program types from lookup table
+        # Get program types from the lookup registry
         from config.constants import FDP_MDP_TYPES
-        program_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'fdp_mdp_type',
-            LookupTable.lookup_value.in_(FDP_MDP_TYPES)
-        ).all()
+        program_types = LookupRegistry.options('fdp_mdp_type', FDP_MDP_TYPES)
         
         return render_template('faculty/manage_mdp_fdp.html', 
                             faculty=faculty, 
@@ -953,12 +900,9 @@ class FacultyController:
             flash('This profile is currently frozen and cannot be edited', 'warning')
             return redirect(url_for('faculty.view_profile', faculty_id=faculty_id))
         
-        # Get program types from lookup table
+        # Get program types from the lookup registry
         from config.constants import FDP_MDP_TYPES
-        program_types = LookupTable.query.filter(
-            LookupTable.lookup_type == 'fdp_mdp_type',
-            LookupTable.lookup_value.in_(FDP_MDP_TYPES)
-        ).all()
+        program_types = LookupRegistry.options('fdp_mdp_type', FDP_MDP_TYPES)
         
         if request.method == 'POST':
             # Get form data
@@ -1050,12 +994,9 @@ class FacultyController:
         # Get existing awards
         awards = HonoursAward.query.filter_by(faculty_id=faculty_id).all()
         
-        # Get award categories from lookup table
+        # Get award categories from the lookup registry
         from config.constants import AWARD_CATEGORIES
-        categories = LookupTable.query.filter(
-            LookupTable.lookup_type == 'award_category',
-            LookupTable.lookup_value.in_(AWARD_CATEGORIES)
-        ).all()
+        categories = LookupRegistry.options('award_category', AWARD_CATEGORIES)
         
         return render_template('faculty/manage_awards.html', 
                             faculty=faculty, 
@@ -1077,12 +1018,9 @@ class FacultyController:
             flash('This profile is currently frozen and cannot be edited', 'warning')
             return redirect(url_for('faculty.view_profile', faculty_id=faculty_id))
         
-        # Get award categories from lookup table
+        # Get award categories from the lookup registry
         from config.constants import AWARD_CATEGORIES
-        categories = LookupTable.query.filter(
-            LookupTable.lookup_type == 'award_category',
-            LookupTable.lookup_value.in_(AWARD_CATEGORIES)
-        ).all()
+        categories = LookupRegistry.options('award_category', AWARD_CATEGORIES)
         
         if request.method == 'POST':
             # Get form data
@@ -1170,10 +1108,8 @@ class FacultyController:
         # Get existing projects
         projects = ResearchConsultancy.query.filter_by(faculty_id=faculty_id).all()
         
-        # Get funding agencies from lookup table
-        funding_agencies = LookupTable.query.filter(
-            LookupTable.lookup_type == 'funding_agency'
-        ).all()
+        # Get funding agencies from the lookup registry
+        funding_agencies = LookupRegistry.options('funding_agency')
         
         return render_template('faculty/manage_projects.html', 
                             faculty=faculty, 
@@ -1195,10 +1131,8 @@ class FacultyController:
             flash('This profile is currently frozen and cannot be edited', 'warning')
             return redirect(url_for('faculty.view_profile', faculty_id=faculty_id))
         
-        # Get funding agencies from lookup table
-        funding_agencies = LookupTable.query.filter(
-            LookupTable.lookup_type == 'funding_agency'
-        ).all()
+        # Get funding agencies from the lookup registry
+        funding_agencies = LookupRegistry.options('funding_agency')
         
         if request.method == 'POST':
             # Get form data
@@ -6,6 +6,9 @@ from models.department import Department
 from models.user import User, Role, UserRole
 from config.constants import UserRoles, ProfileStatus
 from middleware.auth_middleware import hod_required
+from services.stats_service import StatsService
+from services.report_service import ReportService
+from services.approval_queue import ApprovalQueueService
 
 
 class HODController:
@@ -18,31 +21,22 @@ class HODController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # HOD's own faculty row comes from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('HOD profile not found. Please complete your faculty profile.', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
         # Get department
-        department = Department.query.get(hod_faculty.department_id)
+        department = Department.query.get(identity.department_id) if identity.department_id else None
         
         if not department:
             flash('Department not found', 'danger')
             return redirect(url_for('faculty.dashboard'))
             
-        # Get all faculty in the department
-        faculty_members = Faculty.query.filter_by(department_id=department.department_id).all()
-        
         # Count faculty by status
-        status_counts = {
-            'total': len(faculty_members),
-            'pending': sum(1 for f in faculty_members if f.profile_status == ProfileStatus.PENDING),
-            'approved': sum(1 for f in faculty_members if f.profile_status == ProfileStatus.APPROVED),
-            'frozen': sum(1 for f in faculty_members if f.profile_status == ProfileStatus.FROZEN),
-            'unfrozen': sum(1 for f in faculty_members if f.profile_status == ProfileStatus.UNFROZEN)
-        }
+        status_counts = StatsService.status_counts(department.department_id)
         
         # Get recent faculty registrations
         recent_faculty = Faculty.query.filter_by(department_id=department.department_id)\
@@ -50,10 +44,11 @@ class HODController:
                                .limit(5)\
                                .all()
         
+        hod_faculty = Faculty.query.get(identity.faculty_id)
+        
         return render_template('hod/dashboard.html',
                               hod=hod_faculty,
                               department=department,
-                              faculty_members=faculty_members,
                               status_counts=status_counts,
                               recent_faculty=recent_faculty)
     
@@ -64,15 +59,15 @@ class HODController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # HOD's own faculty row comes from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('HOD profile not found. Please complete your faculty profile.', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
         # Get department
-        department = Department.query.get(hod_faculty.department_id)
+        department = Department.query.get(identity.department_id) if identity.department_id else None
         
         if not department:
             flash('Department not found', 'danger')
@@ -92,29 +87,32 @@ class HODController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # HOD's own faculty row comes from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('HOD profile not found. Please complete your faculty profile.', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
         # Get department
-        department = Department.query.get(hod_faculty.department_id)
+        department = Department.query.get(identity.department_id) if identity.department_id else None
         
         if not department:
             flash('Department not found', 'danger')
             return redirect(url_for('faculty.dashboard'))
             
-        # Get all pending faculty in the department
-        pending_faculty = Faculty.query.filter_by(
-            department_id=department.department_id,
-            profile_status=ProfileStatus.PENDING
-        ).all()
+        # One cursor page of the department's pending queue, oldest first
+        try:
+            queue = ApprovalQueueService.page(ProfileStatus.PENDING, request.args,
+                                              department_id=department.department_id)
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            return redirect(url_for('hod.pending_approvals'))
         
         return render_template('hod/pending_approvals.html',
                               department=department,
-                              pending_faculty=pending_faculty)
+                              pending_faculty=queue['faculty'],
+                              queue=queue)
     
     @staticmethod
     def frozen_profiles():
@@ -123,29 +121,32 @@ class HODController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # HOD's own faculty row comes from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('HOD profile not found. Please complete your faculty profile.', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
         # Get department
-        department = Department.query.get(hod_faculty.department_id)
+        department = Department.query.get(identity.department_id) if identity.department_id else None
         
         if not department:
             flash('Department not found', 'danger')
             return redirect(url_for('faculty.dashboard'))
             
-        # Get all frozen faculty in the department
-        frozen_faculty = Faculty.query.filter_by(
-            department_id=department.department_id,
-            profile_status=ProfileStatus.FROZEN
-        ).all()
+        # One cursor page of the department's frozen queue, oldest first
+        try:
+            queue = ApprovalQueueService.page(ProfileStatus.FROZEN, request.args,
+                                              department_id=department.department_id)
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            return redirect(url_for('hod.frozen_profiles'))
         
         return render_template('hod/frozen_profiles.html',
                               department=department,
-                              frozen_faculty=frozen_faculty)
+                              frozen_faculty=queue['faculty'],
+                              queue=queue)
     
     @staticmethod
     def department_report():
@@ -154,69 +155,21 @@ class HODController:
             flash('Access denied', 'danger')
             return redirect(url_for('auth.login'))
             
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # HOD's own faculty row comes from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('HOD profile not found. Please complete your faculty profile.', 'warning')
             return redirect(url_for('faculty.create_profile'))
             
         # Get department
-        department = Department.query.get(hod_faculty.department_id)
+        department = Department.query.get(identity.department_id) if identity.department_id else None
         
         if not department:
             flash('Department not found', 'danger')
             return redirect(url_for('faculty.dashboard'))
             
-        # Get all faculty in the department
-        faculty_members = Faculty.query.filter_by(department_id=department.department_id).all()
+        # Per-faculty activity counts and department totals in one grouped query
+        report_data, faculty_rows = ReportService.department_report(department)
         
-        # Collect statistics
-        total_publications = 0
-        total_workshops = 0
-        total_awards = 0
-        total_projects = 0
-        
-        for faculty in faculty_members:
-            # Count publications
-            from models.faculty import ResearchPublication
-            publications = ResearchPublication.query.filter_by(faculty_id=faculty.faculty_id).count()
-            total_publications += publications
-            
-            # Count workshops
-            from models.faculty import WorkshopSeminar
-            workshops = WorkshopSeminar.query.filter_by(faculty_id=faculty.faculty_id).count()
-            total_workshops += workshops
-            
-            # Count awards
-            from models.faculty import HonoursAward
-            awards = HonoursAward.query.filter_by(faculty_id=faculty.faculty_id).count()
-            total_awards += awards
-            
-            # Count projects
-            from models.faculty import ResearchConsultancy
-            projects = ResearchConsultancy.query.filter_by(faculty_id=faculty.faculty_id).count()
-            total_projects += projects
-        
-        # Calculate averages
-        num_faculty = len(faculty_members)
-        avg_publications = total_publications / num_faculty if num_faculty > 0 else 0
-        avg_workshops = total_workshops / num_faculty if num_faculty > 0 else 0
-        avg_awards = total_awards / num_faculty if num_faculty > 0 else 0
-        avg_projects = total_projects / num_faculty if num_faculty > 0 else 0
-        
-        # Prepare report data
-        report_data = {
-            'department': department,
-            'faculty_count': num_faculty,
-            'total_publications': total_publications,
-            'total_workshops': total_workshops,
-            'total_awards': total_awards,
-            'total_projects': total_projects,
-            'avg_publications': avg_publications,
-            'avg_workshops': avg_workshops,
-            'avg_awards': avg_awards,
-            'avg_projects': avg_projects
-        }
-        
-        return render_template('hod/department_report.html', report=report_data, faculty_members=faculty_members)
\ No newline at end of file
+        return render_template('hod/department_report.html', report=report_data, faculty_rows=faculty_rows)
\ No newline at end of file
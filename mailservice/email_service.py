@@ -1,6 +1,7 @@
 from flask import current_app, render_template
 from flask_mail import Message, Mail
 from threading import Thread
+from config.constants import ProfileStatus
 
 def send_async_email(app, mail, msg):
     """Send email asynchronously."""
@@ -25,6 +26,21 @@ def send_email(subject, recipients, text_body, html_body=None, sender=None, atta
     # Send email asynchronously to not block the request
     Thread(target=send_async_email, args=(app, mail, msg)).start()
 
+def send_async_emails(app, mail, messages):
+    """Send several emails over one SMTP connection."""
+    with app.app_context():
+        with mail.connect() as connection:
+            for msg in messages:
+                connection.send(msg)
+
+def send_emails(messages):
+    """Queue several emails to go out together from one background thread."""
+    if not messages:
+        return
+    
+    app = current_app._get_current_object()
+    Thread(target=send_async_emails, args=(app, Mail(app), messages)).start()
+
 def send_password_reset_email(user_email, token):
     """Send password reset email."""
     app = current_app._get_current_object()
@@ -65,50 +81,58 @@ def send_account_activation_email(user_email, token):
     
     send_email(subject, [user_email], text_body, html_body)
 
-def send_profile_approval_notification(faculty):
-    """Send notification email when a faculty profile is approved."""
-    subject = "Faculty Profile Approved"
+# Profile status -> (subject, message, HTML template) for status change notifications
+PROFILE_STATUS_NOTIFICATIONS = {
+    ProfileStatus.APPROVED: (
+        "Faculty Profile Approved",
+        "Your faculty profile has been approved. You can now log in to the Faculty Management System to access all features.",
+        'email/profile_approved.html'
+    ),
+    ProfileStatus.FROZEN: (
+        "Faculty Profile Frozen",
+        "Your faculty profile has been frozen. This means it can no longer be edited until unfrozen by an administrator or HOD.",
+        'email/profile_frozen.html'
+    ),
+    ProfileStatus.UNFROZEN: (
+        "Faculty Profile Unfrozen",
+        "Your faculty profile has been unfrozen. You can now edit your profile information.",
+        'email/profile_unfrozen.html'
+    )
+}
+
+def profile_status_message(faculty, status):
+    """Build the email telling a faculty member that their profile moved to `status`."""
+    subject, message, template = PROFILE_STATUS_NOTIFICATIONS[status]
     
-    text_body = f"""
+    msg = Message(subject, recipients=[faculty.email], sender=current_app.config['MAIL_DEFAULT_SENDER'])
+    msg.body = f"""
     Dear {faculty.full_name},
     
-    Your faculty profile has been approved. You can now log in to the Faculty Management System to access all features.
+    {message}
     
     Thank you.
     """
-    
-    html_body = render_template('email/profile_approved.html', faculty=faculty)
-    
-    send_email(subject, [faculty.email], text_body, html_body)
+    msg.html = render_template(template, faculty=faculty)
+    return msg
+
+def send_profile_approval_notification(faculty):
+    """Send notification email when a faculty profile is approved."""
+    send_emails([profile_status_message(faculty, ProfileStatus.APPROVED)])
 
 def send_profile_freeze_notification(faculty):
     """Send notification email when a faculty profile is frozen."""
-    subject = "Faculty Profile Frozen"
-    
-    text_body = f"""
-    Dear {faculty.full_name},
-    
-    Your faculty profile has been frozen. This means it can no longer be edited until unfrozen by an administrator or HOD.
-    
-    Thank you.
-    """
-    
-    html_body = render_template('email/profile_frozen.html', faculty=faculty)
-    
-    send_email(subject, [faculty.email], text_body, html_body)
+    send_emails([profile_status_message(faculty, ProfileStatus.FROZEN)])
 
 def send_profile_unfreeze_notification(faculty):
     """Send notification email when a faculty profile is unfrozen."""
-    subject = "Faculty Profile Unfrozen"
-    
-    text_body = f"""
-    Dear {faculty.full_name},
-    
-    Your faculty profile has been unfrozen. You can now edit your profile information.
-    
-    Thank you.
+    send_emails([profile_status_message(faculty, ProfileStatus.UNFROZEN)])
+
+def profile_status_messages(faculty_members, status):
     """
+    Build the emails for faculty members whose profiles moved to `status`.
     
-    html_body = render_template('email/profile_unfrozen.html', faculty=faculty)
-    
-    send_email(subject, [faculty.email], text_body, html_body)
\ No newline at end of file
+    Members without an email address are skipped. The messages are the
+    same as the single-profile notifications and can be sent as one batch
+    over a single connection with send_emails().
+    """
+    return [profile_status_message(faculty, status) for faculty in faculty_members if faculty.email]
@@ -100,28 +100,23 @@ def same_department_required(f):
             abort(400)  # Bad request if no faculty ID provided
             
         from models.faculty import Faculty
-        from models.base import db
         
         # Get the target faculty's department
         target_faculty = Faculty.query.get_or_404(faculty_id)
         
-        # Get the HOD's faculty profile and department
-        hod_faculty = Faculty.query.filter_by(user_id=current_user.user_id).first()
+        # The HOD's own faculty row and department come from the identity context
+        identity = current_user.identity
         
-        if not hod_faculty:
+        if not identity.faculty_id:
             flash('Your faculty profile is not set up properly', 'danger')
             abort(403)
             
-        # Check if this is an admin or principal (they can access any department)
-        if current_user.is_admin or current_user.is_principal:
-            return f(*args, **kwargs)
-            
-        # For HODs, check if they're in the same department
-        if current_user.is_hod and hod_faculty.department_id == target_faculty.department_id:
+        # Admins and principals can access any department, HODs their own
+        if identity.can_manage_department(target_faculty.department_id):
             return f(*args, **kwargs)
             
         # Allow faculty to access their own profile
-        if current_user.is_faculty and target_faculty.user_id == current_user.user_id:
+        if current_user.is_faculty and identity.owns_faculty(target_faculty.faculty_id):
             return f(*args, **kwargs)
             
         flash('You do not have permission to access this faculty profile', 'danger')
@@ -0,0 +1,37 @@
+"""add faculty activity counters
+
+Revision ID: 3f9a1c7d2b41
+Revises: 
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7d2b41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('faculty_activity_counters',
+    sa.Column('faculty_id', sa.Integer(), nullable=False),
+    sa.Column('publications', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('teaching', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('workshops', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('fdp_mdp', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('awards', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('projects', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('activities', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['faculty_id'], ['faculty.faculty_id'], ),
+    sa.PrimaryKeyConstraint('faculty_id')
+    )
+    # Existing faculty are backfilled with `flask repair-activity-counters`
+
+
+def downgrade():
+    op.drop_table('faculty_activity_counters')
@@ -0,0 +1,28 @@
+"""add faculty approval queue indexes
+
+Revision ID: 8c4e2a17f9d3
+Revises: 3f9a1c7d2b41
+Create Date: 2026-10-17 14:03:21.540912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2a17f9d3'
+down_revision = '3f9a1c7d2b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_faculty_department_status_created', 'faculty',
+                    ['department_id', 'profile_status', 'created_at'], unique=False)
+    op.create_index('ix_faculty_status_created', 'faculty',
+                    ['profile_status', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_faculty_status_created', table_name='faculty')
+    op.drop_index('ix_faculty_department_status_created', table_name='faculty')
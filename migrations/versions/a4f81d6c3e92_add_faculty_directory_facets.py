@@ -0,0 +1,41 @@
+"""add faculty directory facets
+
+Revision ID: a4f81d6c3e92
+Revises: e7b2c9a45f18
+Create Date: 2026-10-17 19:48:31.227605
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f81d6c3e92'
+down_revision = 'e7b2c9a45f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('faculty_directory_facets',
+    sa.Column('faculty_id', sa.Integer(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('college_id', sa.Integer(), nullable=True),
+    sa.Column('profile_status', sa.String(length=20), nullable=True),
+    sa.Column('teaching_experiences', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('industry_experiences', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('experience_years', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('publications', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('awards', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['faculty_id'], ['faculty.faculty_id'], ),
+    sa.PrimaryKeyConstraint('faculty_id')
+    )
+    op.create_index(op.f('ix_faculty_directory_facets_department_id'), 'faculty_directory_facets',
+                    ['department_id'], unique=False)
+    # Existing faculty are backfilled with `flask rebuild-directory-facets`
+
+
+def downgrade():
+    op.drop_index(op.f('ix_faculty_directory_facets_department_id'), table_name='faculty_directory_facets')
+    op.drop_table('faculty_directory_facets')
@@ -0,0 +1,33 @@
+"""add content addressed attachments
+
+Revision ID: b83d5e2c17a9
+Revises: a4f81d6c3e92
+Create Date: 2026-10-17 21:05:12.640183
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83d5e2c17a9'
+down_revision = 'a4f81d6c3e92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('file_size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('ref_count', sa.Integer(), nullable=False, server_default='1'))
+        batch_op.create_index(batch_op.f('ix_attachments_content_hash'), ['content_hash'], unique=True)
+    # Existing files are moved into the blob store with `flask migrate-attachments`
+
+
+def downgrade():
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_attachments_content_hash'))
+        batch_op.drop_column('ref_count')
+        batch_op.drop_column('file_size')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,31 @@
+"""dedupe attachments per type
+
+Revision ID: c6a1d93f0e57
+Revises: b83d5e2c17a9
+Create Date: 2026-10-18 09:12:37.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a1d93f0e57'
+down_revision = 'b83d5e2c17a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index('ix_attachments_content_hash')
+        batch_op.create_index(batch_op.f('ix_attachments_content_hash'), ['content_hash'], unique=False)
+        batch_op.create_unique_constraint('uq_attachments_content_hash_type', ['content_hash', 'attachment_type'])
+    # Documents shared with gallery images are split off with `flask migrate-attachments`
+
+
+def downgrade():
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_attachments_content_hash_type', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_attachments_content_hash'))
+        batch_op.create_index('ix_attachments_content_hash', ['content_hash'], unique=True)
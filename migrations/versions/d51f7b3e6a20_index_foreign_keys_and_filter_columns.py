@@ -0,0 +1,49 @@
+"""index foreign keys and hot filter columns
+
+Revision ID: d51f7b3e6a20
+Revises: 8c4e2a17f9d3
+Create Date: 2026-10-17 16:41:07.118394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd51f7b3e6a20'
+down_revision = '8c4e2a17f9d3'
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs indexed as ix_<table>_<column>, matching index=True on the models.
+# faculty.profile_status is covered by ix_faculty_status_created (8c4e2a17f9d3); user_roles.role_id
+# needs its own index because the primary key leads with user_id.
+INDEXES = [
+    ('faculty_additional_details', 'faculty_id'),
+    ('work_experiences', 'faculty_id'),
+    ('teaching_activities', 'faculty_id'),
+    ('research_publications', 'faculty_id'),
+    ('workshops_seminars', 'faculty_id'),
+    ('mdp_fdp', 'faculty_id'),
+    ('honours_awards', 'faculty_id'),
+    ('research_consultancy', 'faculty_id'),
+    ('activities', 'faculty_id'),
+    ('activities', 'created_at'),
+    ('faculty', 'user_id'),
+    ('faculty', 'department_id'),
+    ('faculty', 'created_at'),
+    ('lookup_tables', 'lookup_type'),
+    ('users', 'created_at'),
+    ('user_roles', 'role_id'),
+]
+
+
+def upgrade():
+    for table, column in INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade():
+    for table, column in reversed(INDEXES):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,37 @@
+"""add search inverted index
+
+Revision ID: e7b2c9a45f18
+Revises: d51f7b3e6a20
+Create Date: 2026-10-17 18:22:09.604137
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2c9a45f18'
+down_revision = 'd51f7b3e6a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('search_terms',
+    sa.Column('term', sa.String(length=64), nullable=False),
+    sa.Column('doc_type', sa.String(length=20), nullable=False),
+    sa.Column('doc_id', sa.Integer(), nullable=False),
+    sa.Column('faculty_id', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['faculty_id'], ['faculty.faculty_id'], ),
+    sa.PrimaryKeyConstraint('term', 'doc_type', 'doc_id')
+    )
+    op.create_index('ix_search_terms_document', 'search_terms', ['doc_type', 'doc_id'], unique=False)
+    op.create_index(op.f('ix_search_terms_faculty_id'), 'search_terms', ['faculty_id'], unique=False)
+    # Existing rows are indexed with `flask rebuild-search-index`
+
+
+def downgrade():
+    op.drop_index(op.f('ix_search_terms_faculty_id'), table_name='search_terms')
+    op.drop_index('ix_search_terms_document', table_name='search_terms')
+    op.drop_table('search_terms')
@@ -0,0 +1,97 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.base import db
+from models.faculty import (
+    Faculty, TeachingActivity, ResearchPublication, WorkshopSeminar,
+    MDPFDP, HonoursAward, ResearchConsultancy, Activity
+)
+
+
+# Counter column -> activity model it counts
+COUNTED_MODELS = {
+    'publications': ResearchPublication,
+    'teaching': TeachingActivity,
+    'workshops': WorkshopSeminar,
+    'fdp_mdp': MDPFDP,
+    'awards': HonoursAward,
+    'projects': ResearchConsultancy,
+    'activities': Activity
+}
+
+_COUNTER_BY_MODEL = {model: name for name, model in COUNTED_MODELS.items()}
+
+
+class FacultyActivityCounter(db.Model):
+    """Cached per-faculty activity counts, kept current by the session hooks below."""
+    __tablename__ = 'faculty_activity_counters'
+    
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), primary_key=True)
+    publications = db.Column(db.Integer, nullable=False, default=0)
+    teaching = db.Column(db.Integer, nullable=False, default=0)
+    workshops = db.Column(db.Integer, nullable=False, default=0)
+    fdp_mdp = db.Column(db.Integer, nullable=False, default=0)
+    awards = db.Column(db.Integer, nullable=False, default=0)
+    projects = db.Column(db.Integer, nullable=False, default=0)
+    activities = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    faculty = db.relationship('Faculty', backref=db.backref('activity_counter', uselist=False,
+                                                            cascade='all, delete-orphan'))
+    
+    def as_dict(self):
+        return {name: getattr(self, name) for name in COUNTED_MODELS}
+    
+    def __repr__(self):
+        return f'<FacultyActivityCounter {self.faculty_id}>'
+
+
+@event.listens_for(Session, 'after_flush')
+def _update_activity_counters(session, flush_context):
+    """Create counters for new faculty and apply the activity rows inserted or deleted by this flush."""
+    deltas = {}
+    removed_faculty = set()
+    # New faculty get their counter row in the same transaction, so reads never have to create it
+    created_faculty = set()
+    
+    for obj in session.new:
+        if isinstance(obj, Faculty):
+            created_faculty.add(obj.faculty_id)
+            continue
+        name = _COUNTER_BY_MODEL.get(type(obj))
+        if name and obj.faculty_id is not None:
+            deltas.setdefault(obj.faculty_id, {}).setdefault(name, 0)
+            deltas[obj.faculty_id][name] += 1
+    
+    for obj in session.deleted:
+        if isinstance(obj, Faculty):
+            removed_faculty.add(obj.faculty_id)
+            continue
+        name = _COUNTER_BY_MODEL.get(type(obj))
+        if name and obj.faculty_id is not None:
+            deltas.setdefault(obj.faculty_id, {}).setdefault(name, 0)
+            deltas[obj.faculty_id][name] -= 1
+    
+    if not deltas and not created_faculty:
+        return
+    
+    from services.counter_service import CounterService
+    
+    connection = session.connection()
+    table = FacultyActivityCounter.__table__
+    missing = list(created_faculty)
+    
+    for faculty_id, changes in deltas.items():
+        if faculty_id in removed_faculty or faculty_id in created_faculty:
+            continue
+        values = {name: table.c[name] + delta for name, delta in changes.items() if delta}
+        if not values:
+            continue
+        values['updated_at'] = datetime.utcnow()
+        result = connection.execute(table.update().where(table.c.faculty_id == faculty_id).values(**values))
+        if result.rowcount == 0:
+            missing.append(faculty_id)
+    
+    # New counters are computed from the (already flushed) source tables
+    if missing:
+        CounterService.rebuild(missing, connection=connection)
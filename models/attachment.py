@@ -6,10 +6,19 @@ from config.constants import Visibility
 class Attachment(db.Model):
     """Attachment model for storing file paths."""
     __tablename__ = 'attachments'
+    __table_args__ = (
+        # One row per content and type, so sharing a blob never changes who may see it
+        db.UniqueConstraint('content_hash', 'attachment_type', name='uq_attachments_content_hash_type'),
+    )
     
     attachment_id = db.Column(db.Integer, primary_key=True)
     file_path = db.Column(db.String(255), nullable=False)
     attachment_type = db.Column(db.Enum('attachment', 'gallery_image'), nullable=False)
+    # SHA-256 of the stored blob; NULL only for files not yet moved into the blob store
+    content_hash = db.Column(db.String(64), index=True)
+    file_size = db.Column(db.BigInteger)
+    # Number of owners (profile fields, activity rows, logos) sharing this row
+    ref_count = db.Column(db.Integer, nullable=False, default=1)
     visibility = db.Column(db.Enum(Visibility.SHOW, Visibility.HIDE), default=Visibility.SHOW)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
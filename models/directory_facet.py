@@ -0,0 +1,84 @@
+from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models.base import db
+from models.department import Department
+from models.faculty import Faculty, WorkExperience, ResearchPublication, HonoursAward
+
+
+# Attributes whose changes make a faculty member's facet row stale
+WATCHED_ATTRIBUTES = {
+    Faculty: ('department_id', 'profile_status'),
+    WorkExperience: ('faculty_id', 'experience_type', 'number_of_years'),
+    ResearchPublication: ('faculty_id',),
+    HonoursAward: ('faculty_id',)
+}
+
+
+class FacultyDirectoryFacet(db.Model):
+    """Per-faculty values of every directory filter, kept current by the session hook below."""
+    __tablename__ = 'faculty_directory_facets'
+    
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), primary_key=True)
+    department_id = db.Column(db.Integer, index=True)
+    college_id = db.Column(db.Integer)
+    profile_status = db.Column(db.String(20))
+    teaching_experiences = db.Column(db.Integer, nullable=False, default=0)
+    industry_experiences = db.Column(db.Integer, nullable=False, default=0)
+    experience_years = db.Column(db.Integer, nullable=False, default=0)
+    publications = db.Column(db.Integer, nullable=False, default=0)
+    awards = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    faculty = db.relationship('Faculty', backref=db.backref('directory_facet', uselist=False,
+                                                            cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        return f'<FacultyDirectoryFacet {self.faculty_id}>'
+
+
+def _changed(obj, attributes):
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_directory_facets(session, flush_context):
+    """Recompute the facet rows of faculty whose profile, experience or counts changed."""
+    stale = set()
+    removed = set()
+    moved_departments = set()
+    
+    for obj in session.new:
+        if type(obj) in WATCHED_ATTRIBUTES:
+            stale.add(obj.faculty_id)
+    
+    for obj in session.dirty:
+        attributes = WATCHED_ATTRIBUTES.get(type(obj))
+        if attributes and _changed(obj, attributes):
+            stale.add(obj.faculty_id)
+            # An activity moved to another faculty member changes the old owner too
+            if 'faculty_id' in attributes and type(obj) is not Faculty:
+                stale.update(inspect(obj).attrs.faculty_id.history.deleted)
+        elif isinstance(obj, Department) and _changed(obj, ('college_id',)):
+            moved_departments.add(obj.department_id)
+    
+    for obj in session.deleted:
+        if isinstance(obj, Faculty):
+            removed.add(obj.faculty_id)
+        elif type(obj) in WATCHED_ATTRIBUTES:
+            stale.add(obj.faculty_id)
+    
+    stale.discard(None)
+    stale -= removed
+    if not stale and not moved_departments:
+        return
+    
+    from services.directory_service import DirectoryService
+    
+    connection = session.connection()
+    if moved_departments:
+        stale.update(row[0] for row in connection.execute(
+            db.select(Faculty.faculty_id).where(Faculty.department_id.in_(moved_departments))
+        ))
+    DirectoryService.refresh(stale, connection=connection)
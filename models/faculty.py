@@ -8,9 +8,14 @@ from sqlalchemy import Enum
 class Faculty(db.Model):
     """Faculty model based on the faculty table in the schema."""
     __tablename__ = 'faculty'
+    __table_args__ = (
+        # Approval queues: per department and institution-wide, oldest first
+        db.Index('ix_faculty_department_status_created', 'department_id', 'profile_status', 'created_at'),
+        db.Index('ix_faculty_status_created', 'profile_status', 'created_at'),
+    )
     
     faculty_id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), index=True)
     regdno = db.Column(db.String(20), unique=True, nullable=False)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50))
@@ -29,8 +34,8 @@ class Faculty(db.Model):
     pan_attachment_id = db.Column(db.Integer, db.ForeignKey('attachments.attachment_id'))
     photo_attachment_id = db.Column(db.Integer, db.ForeignKey('attachments.attachment_id'))
     visibility = db.Column(db.Enum(Visibility.SHOW, Visibility.HIDE), default=Visibility.SHOW)
-    department_id = db.Column(db.Integer, db.ForeignKey('departments.department_id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.department_id'), index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -85,7 +90,7 @@ class FacultyAdditionalDetails(db.Model):
     __tablename__ = 'faculty_additional_details'
     
     detail_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     department = db.Column(db.String(255))
     position = db.Column(db.String(255))
     profilepic = db.Column(db.String(255))
@@ -125,7 +130,7 @@ class WorkExperience(db.Model):
     __tablename__ = 'work_experiences'
     
     experience_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     institution_name = db.Column(db.String(255), nullable=False)
     experience_type = db.Column(db.Enum(ExperienceTypes.TEACHING, ExperienceTypes.INDUSTRY), nullable=False)
     designation = db.Column(db.String(255))
@@ -150,7 +155,7 @@ class TeachingActivity(db.Model):
     __tablename__ = 'teaching_activities'
     
     activity_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     course_name = db.Column(db.String(200), nullable=False)
     semester = db.Column(db.String(20))
     year = db.Column(db.Integer)
@@ -173,7 +178,7 @@ class ResearchPublication(db.Model):
     __tablename__ = 'research_publications'
     
     publication_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     journal_name = db.Column(db.String(200))
     type_id = db.Column(db.Integer, db.ForeignKey('lookup_tables.lookup_id'))
@@ -198,7 +203,7 @@ class WorkshopSeminar(db.Model):
     __tablename__ = 'workshops_seminars'
     
     workshop_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     type_id = db.Column(db.Integer, db.ForeignKey('lookup_tables.lookup_id'))
     location = db.Column(db.String(100))
@@ -223,7 +228,7 @@ class MDPFDP(db.Model):
     __tablename__ = 'mdp_fdp'
     
     fdp_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     type_id = db.Column(db.Integer, db.ForeignKey('lookup_tables.lookup_id'))
     location = db.Column(db.String(100))
@@ -249,7 +254,7 @@ class HonoursAward(db.Model):
     __tablename__ = 'honours_awards'
     
     award_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     award_title = db.Column(db.String(200), nullable=False)
     awarded_by = db.Column(db.String(200))
     date = db.Column(db.Date)
@@ -272,7 +277,7 @@ class ResearchConsultancy(db.Model):
     __tablename__ = 'research_consultancy'
     
     project_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     project_title = db.Column(db.String(200), nullable=False)
     agency_id = db.Column(db.Integer, db.ForeignKey('lookup_tables.lookup_id'))
     start_date = db.Column(db.Date)
@@ -297,14 +302,14 @@ class Activity(db.Model):
     __tablename__ = 'activities'
     
     activity_id = db.Column(db.Integer, primary_key=True)
-    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
     activity_title = db.Column(db.String(200), nullable=False)
     type = db.Column(db.String(100))
     date = db.Column(db.Date)
     description = db.Column(db.Text)
     attachment_id = db.Column(db.Integer, db.ForeignKey('attachments.attachment_id'))
     visibility = db.Column(db.Enum(Visibility.SHOW, Visibility.HIDE), default=Visibility.SHOW)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -319,7 +324,7 @@ class LookupTable(db.Model):
     __tablename__ = 'lookup_tables'
     
     lookup_id = db.Column(db.Integer, primary_key=True)
-    lookup_type = db.Column(db.String(50), nullable=False)
+    lookup_type = db.Column(db.String(50), nullable=False, index=True)
     lookup_value = db.Column(db.String(100), nullable=False, unique=True)
     
     def __repr__(self):
@@ -0,0 +1,113 @@
+import re
+from sqlalchemy import event, inspect
+from models.base import db
+from models.faculty import Faculty, ResearchPublication, ResearchConsultancy, WorkshopSeminar
+
+
+# Document type -> (model, {indexed attribute: weight})
+INDEXED_MODELS = {
+    'faculty': (Faculty, {'first_name': 3, 'last_name': 3, 'regdno': 5, 'email': 2}),
+    'publication': (ResearchPublication, {'title': 3, 'journal_name': 1, 'doi': 4, 'description': 1}),
+    'project': (ResearchConsultancy, {'project_title': 3}),
+    'workshop': (WorkshopSeminar, {'title': 3})
+}
+
+MAX_TERM_LENGTH = 64
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric terms."""
+    if not text:
+        return []
+    return [token[:MAX_TERM_LENGTH] for token in _TOKEN.findall(str(text).lower())]
+
+
+class SearchTerm(db.Model):
+    """
+    One posting of the search inverted index: a term occurring in a document.
+    
+    Rows are rewritten by the mapper hooks below whenever an indexed document
+    is inserted, updated or deleted. The primary key leads with the term so
+    exact and prefix lookups are index range scans.
+    """
+    __tablename__ = 'search_terms'
+    
+    term = db.Column(db.String(MAX_TERM_LENGTH), primary_key=True)
+    doc_type = db.Column(db.String(20), primary_key=True)
+    doc_id = db.Column(db.Integer, primary_key=True)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.faculty_id'), nullable=False, index=True)
+    weight = db.Column(db.Integer, nullable=False, default=1)
+    
+    __table_args__ = (
+        db.Index('ix_search_terms_document', 'doc_type', 'doc_id'),
+    )
+    
+    def __repr__(self):
+        return f'<SearchTerm {self.term} {self.doc_type}:{self.doc_id}>'
+
+
+def document_postings(doc_type, values):
+    """Return {term: weight} for a document given its indexed attribute values."""
+    weights = INDEXED_MODELS[doc_type][1]
+    postings = {}
+    for attribute, weight in weights.items():
+        for term in tokenize(values.get(attribute)):
+            postings[term] = postings.get(term, 0) + weight
+    return postings
+
+
+def document_key(doc_type, obj):
+    """Return (doc_id, faculty_id) for an indexed object."""
+    model = INDEXED_MODELS[doc_type][0]
+    doc_id = getattr(obj, inspect(model).primary_key[0].key)
+    return doc_id, obj.faculty_id
+
+
+def _delete_document(connection, doc_type, doc_id):
+    table = SearchTerm.__table__
+    connection.execute(table.delete().where(table.c.doc_type == doc_type, table.c.doc_id == doc_id))
+
+
+def _index_document(connection, doc_type, obj, replace=True):
+    doc_id, faculty_id = document_key(doc_type, obj)
+    if replace:
+        _delete_document(connection, doc_type, doc_id)
+    
+    weights = INDEXED_MODELS[doc_type][1]
+    postings = document_postings(doc_type, {attribute: getattr(obj, attribute) for attribute in weights})
+    if postings:
+        connection.execute(SearchTerm.__table__.insert(), [
+            {'term': term, 'doc_type': doc_type, 'doc_id': doc_id, 'faculty_id': faculty_id, 'weight': weight}
+            for term, weight in postings.items()
+        ])
+
+
+def _register_index_hooks(doc_type, model, attributes):
+    watched = set(attributes) | {'faculty_id'}
+    
+    @event.listens_for(model, 'after_insert')
+    def _after_insert(mapper, connection, target):
+        _index_document(connection, doc_type, target, replace=False)
+    
+    @event.listens_for(model, 'after_update')
+    def _after_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[attribute].history.has_changes() for attribute in watched):
+            _index_document(connection, doc_type, target)
+    
+    # Postings reference faculty, so they are removed before the row itself
+    @event.listens_for(model, 'before_delete')
+    def _before_delete(mapper, connection, target):
+        doc_id, faculty_id = document_key(doc_type, target)
+        if doc_type == 'faculty':
+            # Documents owned by a removed faculty member go with it
+            table = SearchTerm.__table__
+            connection.execute(table.delete().where(table.c.faculty_id == faculty_id))
+        else:
+            _delete_document(connection, doc_type, doc_id)
+
+
+for _doc_type, (_model, _weights) in INDEXED_MODELS.items():
+    _register_index_hooks(_doc_type, _model, _weights)
@@ -15,7 +15,7 @@ class User(UserMixin, db.Model):
     first_name = db.Column(db.String(64))
     last_name = db.Column(db.String(64))
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -36,8 +36,22 @@ class User(UserMixin, db.Model):
     def verify_password(self, password):
         return check_password_hash(self.password_hash, password)
     
+    @property
+    def identity(self):
+        """Request-scoped identity context, built on first use if the loader did not set it."""
+        identity = self.__dict__.get('_identity')
+        if identity is None:
+            from services.identity_service import IdentityContext
+            identity = IdentityContext.from_user(self)
+            self._identity = identity
+        return identity
+    
+    @identity.setter
+    def identity(self, identity):
+        self._identity = identity
+    
     def has_role(self, role_name):
-        return any(role.name == role_name for role in self.roles)
+        return self.identity.has_role(role_name)
     
     @property
     def is_admin(self):
@@ -86,7 +100,7 @@ class UserRole(db.Model):
     __tablename__ = 'user_roles'
     
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True)
-    role_id = db.Column(db.Integer, db.ForeignKey('roles.role_id'), primary_key=True)
+    role_id = db.Column(db.Integer, db.ForeignKey('roles.role_id'), primary_key=True, index=True)
     assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
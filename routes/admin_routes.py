@@ -85,6 +85,21 @@ def pending_approvals():
 def frozen_profiles():
     return AdminController.frozen_profiles()
 
+@admin_bp.route('/faculty/approve-selected', methods=['POST'])
+@login_required
+def approve_selected():
+    return AdminController.approve_selected()
+
+@admin_bp.route('/faculty/freeze-selected', methods=['POST'])
+@login_required
+def freeze_selected():
+    return AdminController.freeze_selected()
+
+@admin_bp.route('/faculty/unfreeze-selected', methods=['POST'])
+@login_required
+def unfreeze_selected():
+    return AdminController.unfreeze_selected()
+
 @admin_bp.route('/faculty/report')
 @login_required
 def faculty_report():
@@ -96,6 +111,12 @@ def faculty_report():
 def assign_hod():
     return AdminController.assign_hod()
 
+@admin_bp.route('/faculty/assign-hod/candidates')
+@login_required
+@admin_required
+def hod_candidates():
+    return AdminController.hod_candidates()
+
 @admin_bp.route('/colleges/add', methods=['GET', 'POST'])
 @login_required
 @admin_required
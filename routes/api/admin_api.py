@@ -1,21 +1,38 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.base import db
-from models.user import User, Role, UserRole
 from models.faculty import Faculty
 from models.department import Department, College
-from config.constants import UserRoles, ProfileStatus
+from config.constants import ProfileStatus
+from services.stats_service import StatsService
+from services.identity_service import IdentityService
+from services.user_directory import UserDirectoryService
+from services.approval_queue import ApprovalQueueService
+from services.profile_status import ProfileStatusService
+from services.upload_ingestion import UploadMetrics
+from utils.streaming import STREAM_BATCH_SIZE, stream_json_array, wants_stream
+from schemas.base import compiled
+from schemas.department import DepartmentListSchema
+from schemas.faculty import FacultySummarySchema
+from schemas.user import UserSchema
 from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 import json
 
 admin_api_bp = Blueprint('admin_api', __name__)
 
+USER_SCHEMA = UserSchema()
+DEPARTMENT_SCHEMA = DepartmentListSchema()
+PENDING_SCHEMA = compiled(FacultySummarySchema, ('faculty_id', 'name', 'email', 'department', 'join_date', 'created_at'))
+RECENT_FACULTY_SCHEMA = compiled(FacultySummarySchema, ('faculty_id', 'name', 'email', 'department', 'status', 'created_at'))
+
 @admin_api_bp.route('/dashboard-stats', methods=['GET'])
 @jwt_required()
 def dashboard_stats():
     """API endpoint to get admin dashboard statistics."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -25,44 +42,19 @@ def dashboard_stats():
         return jsonify({"error": "Access denied"}), 403
     
     # Get counts for dashboard stats
-    faculty_count = Faculty.query.count()
-    department_count = Department.query.count()
-    pending_count = Faculty.query.filter_by(profile_status=ProfileStatus.PENDING).count()
-    frozen_count = Faculty.query.filter_by(profile_status=ProfileStatus.FROZEN).count()
-    
-    # Get roles distribution
-    admin_count = UserRole.query.join(Role).filter(Role.name == UserRoles.ADMIN).count()
-    principal_count = UserRole.query.join(Role).filter(Role.name == UserRoles.PRINCIPAL).count()
-    hod_count = UserRole.query.join(Role).filter(Role.name == UserRoles.HOD).count()
-    faculty_role_count = UserRole.query.join(Role).filter(Role.name == UserRoles.FACULTY).count()
-    
-    role_distribution = {
-        'admin': admin_count,
-        'principal': principal_count,
-        'hod': hod_count,
-        'faculty': faculty_role_count
-    }
+    status_counts = StatsService.status_counts()
     
     # Get recent faculty registrations
-    recent_faculty = Faculty.query.order_by(Faculty.created_at.desc()).limit(5).all()
-    recent_faculty_list = []
-    
-    for faculty in recent_faculty:
-        recent_faculty_list.append({
-            "faculty_id": faculty.faculty_id,
-            "name": faculty.full_name,
-            "email": faculty.email,
-            "department": Department.query.get(faculty.department_id).department_name if faculty.department_id else None,
-            "status": faculty.profile_status,
-            "created_at": faculty.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        })
+    recent_faculty = Faculty.query.options(joinedload(Faculty.department)) \
+                                  .order_by(Faculty.created_at.desc()).limit(5).all()
+    recent_faculty_list = RECENT_FACULTY_SCHEMA.serialize_many(recent_faculty)
     
     stats = {
-        "faculty_count": faculty_count,
-        "department_count": department_count,
-        "pending_count": pending_count,
-        "frozen_count": frozen_count,
-        "role_distribution": role_distribution,
+        "faculty_count": status_counts['total'],
+        "department_count": StatsService.department_count(),
+        "pending_count": status_counts[ProfileStatus.PENDING],
+        "frozen_count": status_counts[ProfileStatus.FROZEN],
+        "role_distribution": StatsService.role_distribution(),
         "recent_faculty": recent_faculty_list
     }
     
@@ -71,9 +63,13 @@ def dashboard_stats():
 @admin_api_bp.route('/users', methods=['GET'])
 @jwt_required()
 def get_users():
-    """API endpoint to get all users."""
+    """
+    API endpoint to get one keyset page of users.
+    
+    With `stream=1` every matching user is streamed as a JSON array instead.
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -82,30 +78,32 @@ def get_users():
     if not user.is_admin:
         return jsonify({"error": "Access denied"}), 403
     
-    # Get all users
-    users = User.query.all()
-    user_list = []
-    
-    for u in users:
-        user_list.append({
-            "user_id": u.user_id,
-            "username": u.username,
-            "email": u.email,
-            "first_name": u.first_name,
-            "last_name": u.last_name,
-            "is_active": u.is_active,
-            "roles": [role.name for role in u.roles],
-            "created_at": u.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    
-    return jsonify(user_list), 200
+    # Export: stream every matching user, roles loaded once per batch
+    if wants_stream(request.args):
+        users = UserDirectoryService.ordered_query(request.args).yield_per(STREAM_BATCH_SIZE)
+        return stream_json_array(users, USER_SCHEMA.serialize)
+    
+    # Filtered page of users, with roles fetched in one batched query
+    try:
+        page = UserDirectoryService.page(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    user_list = USER_SCHEMA.serialize_many(page['users'])
+    
+    return jsonify({
+        "users": user_list,
+        "limit": page['limit'],
+        "next_cursor": page['next_cursor'],
+        "prev_cursor": page['prev_cursor']
+    }), 200
 
 @admin_api_bp.route('/departments', methods=['GET'])
 @jwt_required()
 def get_departments():
     """API endpoint to get all departments."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -114,28 +112,30 @@ def get_departments():
     if not (user.is_admin or user.is_principal):
         return jsonify({"error": "Access denied"}), 403
     
-    # Get all departments
-    departments = Department.query.all()
-    department_list = []
-    
-    for dept in departments:
-        department_list.append({
-            "department_id": dept.department_id,
-            "department_name": dept.department_name,
-            "department_code": dept.department_code,
-            "college": College.query.get(dept.college_id).college_name if dept.college_id else None,
-            "faculty_count": Faculty.query.filter_by(department_id=dept.department_id).count(),
-            "logo": dept.logo
-        })
-    
-    return jsonify(department_list), 200
+    # Get all departments with college name and faculty count in a single query
+    faculty_counts = db.session.query(
+        Faculty.department_id, func.count(Faculty.faculty_id).label('faculty_count')
+    ).group_by(Faculty.department_id).subquery()
+    
+    departments = db.session.query(
+        Department, College.college_name, func.coalesce(faculty_counts.c.faculty_count, 0).label('faculty_count')
+    ).outerjoin(College, College.college_id == Department.college_id) \
+     .outerjoin(faculty_counts, faculty_counts.c.department_id == Department.department_id) \
+     .yield_per(STREAM_BATCH_SIZE)
+    
+    # Streamed as a JSON array while rows are fetched
+    return stream_json_array(departments, DEPARTMENT_SCHEMA.serialize)
 
 @admin_api_bp.route('/pending-approvals', methods=['GET'])
 @jwt_required()
 def get_pending_approvals():
-    """API endpoint to get faculty profiles pending approval."""
+    """
+    API endpoint to get faculty profiles pending approval.
+    
+    With `stream=1` the whole queue is streamed as a JSON array instead.
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -144,43 +144,46 @@ def get_pending_approvals():
     if not (user.is_admin or user.is_principal or user.is_hod):
         return jsonify({"error": "Access denied"}), 403
     
-    # For HODs, filter by department
+    # For HODs, restrict the queue to their own department
+    department_id = None
     if user.is_hod and not (user.is_admin or user.is_principal):
-        # Get HOD's faculty profile
-        hod_faculty = Faculty.query.filter_by(user_id=current_user_id).first()
-        
-        if not hod_faculty:
+        if not user.identity.faculty_id:
             return jsonify({"error": "HOD profile not found"}), 404
         
-        # Get pending faculty in the HOD's department
-        pending_faculty = Faculty.query.filter_by(
-            department_id=hod_faculty.department_id,
-            profile_status=ProfileStatus.PENDING
-        ).all()
-    else:
-        # Get all pending faculty for admin/principal
-        pending_faculty = Faculty.query.filter_by(profile_status=ProfileStatus.PENDING).all()
+        # An HOD without a department has no queue; None would mean every department
+        department_id = user.identity.hod_department_id
+        if department_id is None:
+            return jsonify({"error": "Department not found"}), 404
+    
+    # Export: stream the whole queue, oldest first
+    if wants_stream(request.args):
+        pending = ApprovalQueueService.ordered_query(ProfileStatus.PENDING, department_id) \
+                                      .yield_per(STREAM_BATCH_SIZE)
+        return stream_json_array(pending, PENDING_SCHEMA.serialize)
+    
+    # One cursor page of the queue, oldest first
+    try:
+        queue = ApprovalQueueService.page(ProfileStatus.PENDING, request.args, department_id=department_id)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
     
     # Format response
-    pending_list = []
-    for faculty in pending_faculty:
-        pending_list.append({
-            "faculty_id": faculty.faculty_id,
-            "name": faculty.full_name,
-            "email": faculty.email,
-            "department": Department.query.get(faculty.department_id).department_name if faculty.department_id else None,
-            "join_date": faculty.join_date.strftime('%Y-%m-%d'),
-            "created_at": faculty.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    
-    return jsonify(pending_list), 200
+    pending_list = PENDING_SCHEMA.serialize_many(queue['faculty'])
+    
+    return jsonify({
+        "pending": pending_list,
+        "total": queue['total'],
+        "limit": queue['limit'],
+        "next_cursor": queue['next_cursor'],
+        "prev_cursor": queue['prev_cursor']
+    }), 200
 
 @admin_api_bp.route('/approve-profile/<int:faculty_id>', methods=['POST'])
 @jwt_required()
 def approve_profile(faculty_id):
     """API endpoint to approve a faculty profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -218,7 +221,7 @@ def approve_profile(faculty_id):
 def unfreeze_profile(faculty_id):
     """API endpoint to unfreeze a faculty profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -249,4 +252,76 @@ def unfreeze_profile(faculty_id):
     
     return jsonify({
         "message": "Faculty profile unfrozen successfully"
-    }), 200
\ No newline at end of file
+    }), 200
+
+def _change_profile_statuses(action, past_tense):
+    """Shared body of the bulk status endpoints."""
+    current_user_id = get_jwt_identity()
+    user = IdentityService.load_user(current_user_id)
+    
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    # Check if user is admin, principal or HOD
+    if not (user.is_admin or user.is_principal or user.is_hod):
+        return jsonify({"error": "Access denied"}), 403
+    
+    # Validate request
+    if not request.is_json:
+        return jsonify({"error": "Missing JSON in request"}), 400
+    
+    try:
+        faculty_ids = ProfileStatusService.parse_ids(request.json.get('faculty_ids'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # All or nothing: one scope check, one UPDATE, one batch of emails
+    result = ProfileStatusService.apply(action, faculty_ids, user.identity)
+    
+    if result['missing']:
+        return jsonify({"error": "Faculty profile not found", "faculty_ids": result['missing']}), 404
+    
+    if result['forbidden']:
+        return jsonify({
+            "error": "You can only change faculty in your department",
+            "faculty_ids": result['forbidden']
+        }), 403
+    
+    return jsonify({
+        "message": f"{len(result['updated'])} faculty profile(s) {past_tense}",
+        "updated": result['updated'],
+        "unchanged": result['unchanged']
+    }), 200
+
+@admin_api_bp.route('/approve-profiles', methods=['POST'])
+@jwt_required()
+def approve_profiles():
+    """API endpoint to approve a list of faculty profiles ({"faculty_ids": [...]})."""
+    return _change_profile_statuses('approve', 'approved')
+
+@admin_api_bp.route('/freeze-profiles', methods=['POST'])
+@jwt_required()
+def freeze_profiles():
+    """API endpoint to freeze a list of faculty profiles."""
+    return _change_profile_statuses('freeze', 'frozen')
+
+@admin_api_bp.route('/unfreeze-profiles', methods=['POST'])
+@jwt_required()
+def unfreeze_profiles():
+    """API endpoint to unfreeze a list of faculty profiles."""
+    return _change_profile_statuses('unfreeze', 'unfrozen')
+
+@admin_api_bp.route('/upload-metrics', methods=['GET'])
+@jwt_required()
+def upload_metrics():
+    """API endpoint to get upload throughput and rejections for the worker serving the request."""
+    current_user_id = get_jwt_identity()
+    user = IdentityService.load_user(current_user_id)
+    
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    if not user.is_admin:
+        return jsonify({"error": "Access denied"}), 403
+    
+    return jsonify(UploadMetrics.snapshot()), 200
@@ -1,84 +1,95 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.base import db
-from models.user import User
 from models.faculty import (
     Faculty, FacultyAdditionalDetails, WorkExperience, TeachingActivity,
     ResearchPublication, WorkshopSeminar, MDPFDP, HonoursAward,
     ResearchConsultancy, Activity
 )
-from models.department import Department
 from config.constants import ProfileStatus, ExperienceTypes
+from services.profile_service import ProfileService
+from services.identity_service import IdentityService
+from services.directory_service import DirectoryService
+from services.lookup_registry import LookupRegistry
+from utils.streaming import STREAM_BATCH_SIZE, stream_json_array
+from utils.conditional import make_etag, not_modified, with_validators
+from schemas.base import compiled
+from schemas.faculty import FacultyDirectoryRowSchema, FacultyProfileSchema, WorkExperienceSchema
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 faculty_api_bp = Blueprint('faculty_api', __name__)
 
+EXPERIENCE_SCHEMA = WorkExperienceSchema()
+
+def _csv_arg(name):
+    """Comma-separated request argument as a list, or None if absent."""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
 @faculty_api_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
-    """API endpoint to get faculty profile."""
+    """
+    API endpoint to get faculty profile.
+    
+    `fields` is a comma-separated list of profile fields to return (all by
+    default) and `include` a list of related sections. Without either, the
+    full profile with additional details is returned. If only `fields` is
+    given, no sections are included. Responses carry an ETag and
+    Last-Modified; a matching If-None-Match or If-Modified-Since gets a 304.
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    # Get faculty profile
-    faculty = Faculty.query.filter_by(user_id=current_user_id).first()
+    fields = _csv_arg('fields')
+    include = _csv_arg('include')
     
-    if not faculty:
+    unknown = [name for name in fields or () if name not in ProfileService.FIELDS]
+    unknown += [name for name in include or () if name not in ProfileService.INCLUDES]
+    if unknown:
+        return jsonify({"error": f"Unknown field or section: {', '.join(unknown)}"}), 400
+    
+    if include is None:
+        include = [] if fields is not None else ['additional_details']
+    if fields is None:
+        fields = list(ProfileService.FIELDS)
+    
+    # Check the client's copy with one validator query before loading anything
+    faculty_id = user.identity.faculty_id
+    validators = ProfileService.validators(faculty_id, fields, include) if faculty_id else None
+    
+    if not validators:
         return jsonify({"message": "Faculty profile not created yet"}), 404
     
-    # Get additional details
-    additional_details = FacultyAdditionalDetails.query.filter_by(faculty_id=faculty.faculty_id).first()
+    state, last_modified = validators
+    etag = make_etag('profile', faculty_id, fields, include, state, LookupRegistry.fingerprint())
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
     
-    # Get department
-    department = None
-    if faculty.department_id:
-        department = Department.query.get(faculty.department_id)
+    # Only the requested columns, joins and sections are loaded
+    faculty = ProfileService.load_profile(faculty_id=faculty_id, sections=include, fields=fields)
+    
+    if not faculty:
+        return jsonify({"message": "Faculty profile not created yet"}), 404
     
     # Format response
-    profile = {
-        "faculty_id": faculty.faculty_id,
-        "regdno": faculty.regdno,
-        "name": faculty.full_name,
-        "gender": faculty.gender,
-        "dob": faculty.dob.strftime('%Y-%m-%d') if faculty.dob else None,
-        "contact_no": faculty.contact_no,
-        "email": faculty.email,
-        "address": faculty.address,
-        "join_date": faculty.join_date.strftime('%Y-%m-%d'),
-        "is_active": faculty.is_active,
-        "edit_enabled": faculty.edit_enabled,
-        "profile_status": faculty.profile_status,
-        "department": department.department_name if department else None,
-        "photo_url": f"/static/uploads/{faculty.photo_attachment.file_path}" if faculty.photo_attachment_id else None,
-        "additional_details": {} if not additional_details else {
-            "position": additional_details.position,
-            "father_name": additional_details.father_name,
-            "mother_name": additional_details.mother_name,
-            "marital_status": additional_details.marital_status,
-            "nationality": additional_details.nationality,
-            "religion": additional_details.religion,
-            "category": additional_details.category,
-            "aadhar_no": additional_details.aadhar_no,
-            "pan_no": additional_details.pan_no,
-            "blood_group": additional_details.blood_group,
-            "contact_no2": additional_details.contact_no2,
-            "scopus_author_id": additional_details.scopus_author_id,
-            "orcid_id": additional_details.orcid_id,
-            "google_scholar_id_link": additional_details.google_scholar_id_link
-        }
-    }
-    
-    return jsonify(profile), 200
+    profile = compiled(FacultyProfileSchema, tuple(fields) + tuple(include)).serialize(faculty)
+    
+    return with_validators(jsonify(profile), etag, last_modified), 200
 
 @faculty_api_bp.route('/profile', methods=['POST'])
 @jwt_required()
 def create_profile():
     """API endpoint to create faculty profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -133,7 +144,7 @@ def create_profile():
 def update_profile(faculty_id):
     """API endpoint to update faculty profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -189,7 +200,7 @@ def update_profile(faculty_id):
 def update_additional_details(faculty_id):
     """API endpoint to update faculty additional details."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -234,45 +245,44 @@ def update_additional_details(faculty_id):
 @faculty_api_bp.route('/work-experience/<int:faculty_id>', methods=['GET'])
 @jwt_required()
 def get_work_experiences(faculty_id):
-    """API endpoint to get faculty work experiences."""
+    """
+    API endpoint to get faculty work experiences.
+    
+    Supports conditional requests like get_profile.
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    # Get faculty profile
-    faculty = Faculty.query.get(faculty_id)
+    # The validator query doubles as the existence check
+    validators = ProfileService.validators(faculty_id, include=['work_experiences'])
     
-    if not faculty:
+    if not validators:
         return jsonify({"error": "Faculty profile not found"}), 404
     
-    # Get work experiences
-    experiences = WorkExperience.query.filter_by(faculty_id=faculty_id).all()
+    state, last_modified = validators
+    etag = make_etag('work_experiences', faculty_id, state)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
     
-    # Format response
-    experience_list = []
-    for exp in experiences:
-        experience_list.append({
-            "experience_id": exp.experience_id,
-            "institution_name": exp.institution_name,
-            "experience_type": exp.experience_type,
-            "designation": exp.designation,
-            "from_date": exp.from_date.strftime('%Y-%m-%d') if exp.from_date else None,
-            "to_date": exp.to_date.strftime('%Y-%m-%d') if exp.to_date else None,
-            "number_of_years": exp.number_of_years,
-            "responsibilities": exp.responsibilities,
-            "certificate_url": f"/static/uploads/{exp.service_certificate.file_path}" if exp.service_certificate_attachment_id else None
-        })
-    
-    return jsonify(experience_list), 200
+    # Get work experiences with their certificates, fetched in batches
+    experiences = WorkExperience.query.options(joinedload(WorkExperience.service_certificate)) \
+                                      .filter_by(faculty_id=faculty_id) \
+                                      .order_by(WorkExperience.experience_id) \
+                                      .yield_per(STREAM_BATCH_SIZE)
+    
+    # Streamed as a JSON array while rows are fetched
+    return with_validators(stream_json_array(experiences, EXPERIENCE_SCHEMA.serialize), etag, last_modified)
 
 @faculty_api_bp.route('/work-experience/<int:faculty_id>', methods=['POST'])
 @jwt_required()
 def add_work_experience(faculty_id):
     """API endpoint to add faculty work experience."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -333,7 +343,7 @@ def add_work_experience(faculty_id):
 def delete_work_experience(faculty_id, experience_id):
     """API endpoint to delete faculty work experience."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -370,7 +380,7 @@ def delete_work_experience(faculty_id, experience_id):
 def freeze_profile(faculty_id):
     """API endpoint to freeze faculty profile."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.load_user(current_user_id)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -391,3 +401,43 @@ def freeze_profile(faculty_id):
     return jsonify({
         "message": "Profile has been frozen. It can no longer be edited until unfrozen by an administrator or HOD."
     }), 200
+
+@faculty_api_bp.route('/directory', methods=['GET'])
+@jwt_required()
+def get_directory():
+    """API endpoint to browse the faculty directory with facet counts."""
+    current_user_id = get_jwt_identity()
+    user = IdentityService.load_user(current_user_id)
+    
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    # Check if user is admin, principal or HOD
+    if not (user.is_admin or user.is_principal or user.is_hod):
+        return jsonify({"error": "Access denied"}), 403
+    
+    # For HODs, restrict the directory and its facets to their own department
+    department_id = None
+    if not user.identity.is_institution_wide:
+        if not user.identity.faculty_id:
+            return jsonify({"error": "HOD profile not found"}), 404
+        
+        # An HOD without a department sees nothing; None would mean every department
+        department_id = user.identity.hod_department_id
+        if department_id is None:
+            return jsonify({"error": "Department not found"}), 404
+    
+    try:
+        directory = DirectoryService.page(request.args, department_id=department_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "faculty": compiled(FacultyDirectoryRowSchema).serialize_many(directory['faculty']),
+        "filters": directory['filters'],
+        "facets": directory['facets'],
+        "total": directory['total'],
+        "limit": directory['limit'],
+        "next_cursor": directory['next_cursor'],
+        "prev_cursor": directory['prev_cursor']
+    }), 200
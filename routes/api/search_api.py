@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.search_index import INDEXED_MODELS
+from services.identity_service import IdentityService
+from services.search_service import SearchService, SEARCH_RESULT_LIMIT, SEARCH_MAX_RESULT_LIMIT
+from utils.pagination import clamp_page_size
+
+search_api_bp = Blueprint('search_api', __name__)
+
+@search_api_bp.route('', methods=['GET'])
+@jwt_required()
+def search():
+    """API endpoint to search faculty, publications, projects and workshops."""
+    current_user_id = get_jwt_identity()
+    user = IdentityService.load_user(current_user_id)
+    
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    
+    # Optional comma-separated list of document types
+    doc_types = [doc_type for doc_type in (request.args.get('type') or '').split(',') if doc_type]
+    unknown = [doc_type for doc_type in doc_types if doc_type not in INDEXED_MODELS]
+    if unknown:
+        return jsonify({"error": f"Unknown type: {', '.join(unknown)}"}), 400
+    
+    limit = clamp_page_size(request.args.get('limit'), SEARCH_RESULT_LIMIT, SEARCH_MAX_RESULT_LIMIT)
+    
+    # Results are limited to the documents this user may view
+    results = SearchService.search(user.identity, query, doc_types=doc_types or None, limit=limit)
+    
+    return jsonify({
+        "query": query,
+        "results": results,
+        "limit": limit
+    }), 200
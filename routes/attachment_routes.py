@@ -0,0 +1,9 @@
+from flask import Blueprint
+from controllers.attachment_controller import AttachmentController
+
+attachments_bp = Blueprint('attachments', __name__)
+
+# Uploaded files, checked against the owning faculty member and the viewer's role
+@attachments_bp.route('/<int:attachment_id>')
+def serve(attachment_id):
+    return AttachmentController.serve(attachment_id)
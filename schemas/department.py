@@ -0,0 +1,13 @@
+from marshmallow import fields
+from schemas.base import CompiledSchema
+
+
+class DepartmentListSchema(CompiledSchema):
+    """A (Department, college_name, faculty_count) row of the departments listing."""
+    
+    department_id = fields.Integer(attribute='Department.department_id')
+    department_name = fields.String(attribute='Department.department_name')
+    department_code = fields.String(attribute='Department.department_code')
+    college = fields.String(attribute='college_name')
+    faculty_count = fields.Integer()
+    logo = fields.String(attribute='Department.logo')
@@ -0,0 +1,179 @@
+from marshmallow import fields
+from schemas.base import CompiledSchema
+from schemas.fields import AttachmentUrl, IsoDate, IsoDateTime, LookupLabel
+
+
+class AdditionalDetailsSchema(CompiledSchema):
+    position = fields.String()
+    father_name = fields.String()
+    mother_name = fields.String()
+    marital_status = fields.String()
+    nationality = fields.String()
+    religion = fields.String()
+    category = fields.String()
+    aadhar_no = fields.String()
+    pan_no = fields.String()
+    blood_group = fields.String()
+    contact_no2 = fields.String()
+    scopus_author_id = fields.String()
+    orcid_id = fields.String()
+    google_scholar_id_link = fields.String()
+
+
+class WorkExperienceSchema(CompiledSchema):
+    experience_id = fields.Integer()
+    institution_name = fields.String()
+    experience_type = fields.String()
+    designation = fields.String()
+    from_date = IsoDate()
+    to_date = IsoDate()
+    number_of_years = fields.Integer()
+    responsibilities = fields.String()
+    certificate_url = AttachmentUrl(attribute='service_certificate')
+
+
+class TeachingActivitySchema(CompiledSchema):
+    activity_id = fields.Integer()
+    course_name = fields.String()
+    course_code = fields.String()
+    semester = fields.String()
+    year = fields.Integer()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class PublicationSchema(CompiledSchema):
+    publication_id = fields.Integer()
+    title = fields.String()
+    journal_name = fields.String()
+    type = LookupLabel(attribute='type_id')
+    publication_date = IsoDate()
+    doi = fields.String()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class WorkshopSchema(CompiledSchema):
+    workshop_id = fields.Integer()
+    title = fields.String()
+    type = LookupLabel(attribute='type_id')
+    location = fields.String()
+    organized_by = fields.String()
+    date = IsoDate()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class FDPSchema(CompiledSchema):
+    fdp_id = fields.Integer()
+    title = fields.String()
+    type = LookupLabel(attribute='type_id')
+    location = fields.String()
+    organized_by = fields.String()
+    start_date = IsoDate()
+    end_date = IsoDate()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class AwardSchema(CompiledSchema):
+    award_id = fields.Integer()
+    award_title = fields.String()
+    awarded_by = fields.String()
+    category = LookupLabel(attribute='category_id')
+    date = IsoDate()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class ProjectSchema(CompiledSchema):
+    project_id = fields.Integer()
+    project_title = fields.String()
+    agency = LookupLabel(attribute='agency_id')
+    start_date = IsoDate()
+    end_date = IsoDate()
+    status = fields.String()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class ActivitySchema(CompiledSchema):
+    activity_id = fields.Integer()
+    activity_title = fields.String()
+    type = fields.String()
+    date = IsoDate()
+    description = fields.String()
+    attachment_url = AttachmentUrl(attribute='attachment')
+
+
+class FacultySummarySchema(CompiledSchema):
+    """One line of the approval queue and dashboard lists; load the department with it."""
+    
+    faculty_id = fields.Integer()
+    name = fields.String(attribute='full_name')
+    email = fields.String()
+    department = fields.String(attribute='department.department_name')
+    join_date = IsoDate()
+    status = fields.String(attribute='profile_status')
+    created_at = IsoDateTime()
+
+
+class FacultyDirectoryRowSchema(CompiledSchema):
+    """One row of the faculty directory, dumped from a DirectoryService.page() row."""
+    
+    faculty_id = fields.Integer()
+    name = fields.Method('dump_name')
+    regdno = fields.String()
+    email = fields.String()
+    department = fields.String(attribute='department_name')
+    college = fields.String(attribute='college_name')
+    profile_status = fields.String()
+    teaching_experiences = fields.Integer()
+    industry_experiences = fields.Integer()
+    experience_years = fields.Integer()
+    publications = fields.Integer()
+    awards = fields.Integer()
+    
+    def dump_name(self, row):
+        return f"{row.first_name} {row.last_name}" if row.last_name else row.first_name
+
+
+class FacultyProfileSchema(CompiledSchema):
+    """
+    A faculty profile and its sections.
+    
+    Field and section names match ProfileService.FIELDS and INCLUDES; dump
+    with `only` set to what ProfileService loaded.
+    """
+    
+    faculty_id = fields.Integer()
+    regdno = fields.String()
+    name = fields.String(attribute='full_name')
+    gender = fields.String()
+    dob = IsoDate()
+    contact_no = fields.String()
+    email = fields.String()
+    address = fields.String()
+    join_date = IsoDate()
+    is_active = fields.Boolean()
+    edit_enabled = fields.Boolean()
+    profile_status = fields.String()
+    department = fields.String(attribute='department.department_name')
+    photo_url = AttachmentUrl(attribute='photo_attachment')
+    
+    additional_details = fields.Method('dump_additional_details')
+    work_experiences = fields.Nested(WorkExperienceSchema, many=True)
+    teaching_activities = fields.Nested(TeachingActivitySchema, many=True)
+    research_publications = fields.Nested(PublicationSchema, many=True)
+    workshops_seminars = fields.Nested(WorkshopSchema, many=True)
+    mdp_fdp = fields.Nested(FDPSchema, many=True)
+    honours_awards = fields.Nested(AwardSchema, many=True)
+    research_consultancy = fields.Nested(ProjectSchema, many=True)
+    activities = fields.Nested(ActivitySchema, many=True)
+    
+    _additional_details = AdditionalDetailsSchema()
+    
+    def dump_additional_details(self, faculty):
+        # An empty object rather than null when none have been entered
+        details = faculty.additional_details
+        return self._additional_details.serialize(details) if details else {}
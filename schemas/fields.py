@@ -0,0 +1,69 @@
+from datetime import date
+from marshmallow import fields
+from services.lookup_registry import LookupRegistry
+
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def iso_date(value):
+    """'YYYY-MM-DD' for a date; isoformat() is several times faster than strftime."""
+    if value is None:
+        return None
+    if value.__class__ is date:
+        return value.isoformat()
+    return value.strftime(DATE_FORMAT)
+
+def iso_datetime(value):
+    """'YYYY-MM-DD HH:MM:SS' for a naive datetime, without going through strftime."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.isoformat(' ', 'seconds')
+    return value.strftime(DATETIME_FORMAT)
+
+def attachment_url(attachment):
+    return f"/attachments/{attachment.attachment_id}" if attachment else None
+
+
+class CompiledField(fields.Field):
+    """
+    Dump-only field whose value is formatted by a plain function.
+    
+    CompiledSchema calls `format_value` directly; `_serialize` keeps
+    Schema.dump producing the same output.
+    """
+    
+    format_value = None
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('dump_only', True)
+        super().__init__(**kwargs)
+    
+    def _serialize(self, value, attr, obj, **kwargs):
+        return self.format_value(value)
+
+
+class IsoDate(CompiledField):
+    """A date as 'YYYY-MM-DD'."""
+    
+    format_value = staticmethod(iso_date)
+
+
+class IsoDateTime(CompiledField):
+    """A naive UTC datetime as 'YYYY-MM-DD HH:MM:SS'."""
+    
+    format_value = staticmethod(iso_datetime)
+
+
+class LookupLabel(CompiledField):
+    """A lookup_tables id rendered as its value, from the LookupRegistry."""
+    
+    @staticmethod
+    def format_value(value):
+        return LookupRegistry.label(value, default=None)
+
+
+class AttachmentUrl(CompiledField):
+    """An Attachment relationship rendered as its public URL."""
+    
+    format_value = staticmethod(attachment_url)
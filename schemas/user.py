@@ -0,0 +1,16 @@
+from marshmallow import fields
+from schemas.base import CompiledSchema
+from schemas.fields import IsoDateTime
+
+
+class UserSchema(CompiledSchema):
+    """A user account with its role names; load roles eagerly when dumping many."""
+    
+    user_id = fields.Integer()
+    username = fields.String()
+    email = fields.String()
+    first_name = fields.String()
+    last_name = fields.String()
+    is_active = fields.Boolean()
+    roles = fields.Function(lambda user: [role.name for role in user.roles])
+    created_at = IsoDateTime()
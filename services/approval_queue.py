@@ -0,0 +1,62 @@
+from sqlalchemy.orm import joinedload
+from models.faculty import Faculty
+from services.stats_service import StatsService
+from utils.pagination import clamp_page_size, keyset_page
+
+
+QUEUE_PAGE_SIZE = 25
+QUEUE_MAX_PAGE_SIZE = 100
+
+# Oldest submissions first; faculty_id breaks ties between equal timestamps.
+# Served by ix_faculty_department_status_created / ix_faculty_status_created.
+QUEUE_SORT_KEY = (Faculty.created_at, Faculty.faculty_id)
+
+
+class ApprovalQueueService:
+    """Cursor-paginated faculty queues by profile status."""
+    
+    @staticmethod
+    def _query(status, department_id=None):
+        query = Faculty.query.options(
+            joinedload(Faculty.department),
+            joinedload(Faculty.photo_attachment)
+        ).filter(Faculty.profile_status == status)
+        
+        if department_id is not None:
+            query = query.filter(Faculty.department_id == department_id)
+        
+        return query
+    
+    @staticmethod
+    def ordered_query(status, department_id=None):
+        """The whole queue, oldest first, for streamed exports."""
+        return ApprovalQueueService._query(status, department_id) \
+                                   .order_by(*[column.asc() for column in QUEUE_SORT_KEY])
+    
+    @staticmethod
+    def page(status, args, department_id=None):
+        """
+        Return one page of faculty in `status`, optionally for one department.
+        
+        Understands `limit` and the `after`/`before` cursors from a previous
+        page, and raises ValueError for a malformed cursor. The total comes
+        from the cached StatsService snapshot, so paging through the queue
+        never recounts it.
+        """
+        limit = clamp_page_size(args.get('limit'), QUEUE_PAGE_SIZE, QUEUE_MAX_PAGE_SIZE)
+        
+        query = ApprovalQueueService._query(status, department_id)
+        
+        faculty, next_cursor, prev_cursor = keyset_page(
+            query, QUEUE_SORT_KEY, limit,
+            after=args.get('after'), before=args.get('before'),
+            descending=False
+        )
+        
+        return {
+            'faculty': faculty,
+            'total': StatsService.status_counts(department_id)[status],
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
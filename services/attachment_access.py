@@ -0,0 +1,127 @@
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from models.base import db
+from models.attachment import Attachment
+from services.attachment_store import AttachmentStore, PATH_REFERENCES
+
+
+# Images shown as avatars and logos to every signed-in user
+PUBLIC_ATTACHMENT_TYPES = ('gallery_image',)
+
+UPLOADS_PREFIX = 'uploads/'
+PUBLIC_UPLOAD_DIRECTORIES = ('derivatives/',)
+
+
+class AttachmentAccess:
+    """
+    Who may download an attachment, answered from a short-lived cache.
+    
+    For each attachment the cache keeps its file details and owners (the
+    faculty members whose profile or activities use it), plus the decision
+    already made for each viewer. Gallery images are visible to every
+    signed-in user. Other files are visible to the owners, to the HOD of an
+    owner's department and to admins and principals, the same rule as for
+    viewing a profile. Entries expire after ATTACHMENT_ACCESS_TTL seconds,
+    which bounds how long a changed owner or role goes unnoticed.
+    """
+    
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _settings():
+        config = current_app.config
+        return config.get('ATTACHMENT_ACCESS_TTL', 60), config.get('ATTACHMENT_ACCESS_CACHE_SIZE', 10000)
+    
+    @staticmethod
+    def _cached(key, load):
+        ttl, size = AttachmentAccess._settings()
+        now = time.monotonic()
+        
+        with AttachmentAccess._lock:
+            entry = AttachmentAccess._cache.get(key)
+            if entry and now < entry[0]:
+                AttachmentAccess._cache.move_to_end(key)
+                return entry[1]
+        
+        value = load()
+        if ttl:
+            with AttachmentAccess._lock:
+                AttachmentAccess._cache[key] = (now + ttl, value)
+                AttachmentAccess._cache.move_to_end(key)
+                while len(AttachmentAccess._cache) > size:
+                    AttachmentAccess._cache.popitem(last=False)
+        return value
+    
+    @staticmethod
+    def record(attachment_id):
+        """File details, owners and per-viewer decisions for an attachment, or None if it does not exist."""
+        def load():
+            attachment = db.session.get(Attachment, attachment_id)
+            if attachment is None:
+                return None
+            public = attachment.attachment_type in PUBLIC_ATTACHMENT_TYPES
+            return {
+                'attachment_id': attachment.attachment_id,
+                'file_path': attachment.file_path,
+                'content_hash': attachment.content_hash,
+                'uploaded_at': attachment.uploaded_at,
+                'public': public,
+                # Public files never need their owners
+                'owners': () if public else tuple(AttachmentStore.owners(attachment_id)),
+                'decisions': {}
+            }
+        
+        return AttachmentAccess._cached(('attachment', attachment_id), load)
+    
+    @staticmethod
+    def _decide(identity, record):
+        if record['public'] or identity.is_institution_wide:
+            return True
+        return any(identity.owns_faculty(faculty_id) or
+                   (identity.hod_department_id is not None and identity.can_manage_department(department_id))
+                   for faculty_id, department_id in record['owners'])
+    
+    @staticmethod
+    def allowed(identity, record):
+        """True if the viewer may download the attachment."""
+        decisions = record['decisions']
+        decision = decisions.get(identity.user_id)
+        if decision is None:
+            decision = decisions[identity.user_id] = AttachmentAccess._decide(identity, record)
+        return decision
+    
+    @staticmethod
+    def is_public_path(filename):
+        """
+        True if the static handler may serve a file under static/.
+        
+        Only derivatives and gallery images are served from uploads/ by
+        path; everything else goes through /attachments/<id>.
+        """
+        filename = posixpath.normpath(filename)
+        if not filename.startswith(UPLOADS_PREFIX):
+            return True
+        file_path = filename[len(UPLOADS_PREFIX):]
+        if file_path.startswith(PUBLIC_UPLOAD_DIRECTORIES):
+            return True
+        
+        def load():
+            # A document may name the same blob as a gallery image; the image makes it public
+            if db.session.query(Attachment.attachment_id) \
+                         .filter(Attachment.file_path == file_path,
+                                 Attachment.attachment_type.in_(PUBLIC_ATTACHMENT_TYPES)).first() is not None:
+                return True
+            # Logos saved before attachment rows existed
+            return any(db.session.query(column).filter(column == file_path).first() is not None
+                       for column in PATH_REFERENCES)
+        
+        return AttachmentAccess._cached(('path', file_path), load)
+    
+    @staticmethod
+    def invalidate():
+        with AttachmentAccess._lock:
+            AttachmentAccess._cache.clear()
@@ -0,0 +1,518 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+from models.base import db
+from models.attachment import Attachment
+from models.department import College, Department
+from models.faculty import Faculty
+from services.deferred_deletion import DeferredDeletion
+from services.thumbnail_service import ThumbnailService
+
+
+BLOB_DIRECTORY = 'blobs'
+COPY_CHUNK_SIZE = 64 * 1024
+MIGRATE_BATCH_SIZE = 200
+SWEEP_BATCH_SIZE = 500
+
+# Files and rows younger than this may belong to an upload still in flight
+SWEEP_GRACE_PERIOD = timedelta(hours=24)
+
+# String columns holding an attachment's file_path instead of a foreign key
+PATH_REFERENCES = (Department.logo, College.logo)
+
+# Foreign keys whose attachments are gallery images; every other one holds documents
+GALLERY_REFERENCES = (Faculty.__table__.c.photo_attachment_id,)
+
+
+def _full_path(file_path):
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], *file_path.split('/'))
+
+
+def _remove(full_path):
+    try:
+        os.remove(full_path)
+    except FileNotFoundError:
+        pass
+
+
+def _list_directory(folder):
+    """(files, directories) in a folder; uses the dirent type, so no stat per entry."""
+    files, directories = [], []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(entry.name)
+    except FileNotFoundError:
+        pass
+    return files, directories
+
+
+def _walk_files(root, prefix):
+    """Every file path under root, relative to UPLOAD_FOLDER, one directory listing at a time."""
+    files, directories = _list_directory(root)
+    for name in files:
+        yield prefix + name
+    for name in sorted(directories):
+        yield from _walk_files(os.path.join(root, name), prefix + name + '/')
+
+
+def _id_references():
+    """Every foreign key column pointing at attachments.attachment_id."""
+    return [column for table in db.Model.metadata.sorted_tables for column in table.columns
+            if any(fk.column.table.name == Attachment.__tablename__ for fk in column.foreign_keys)]
+
+
+class BlobWriter:
+    """
+    Temporary file in the blob tree that hashes everything written to it.
+    
+    commit() renames the file onto its content-addressed path; an existing
+    blob has the same bytes, so replacing it is harmless. Closing a writer
+    that was never committed removes the temporary file.
+    """
+    
+    def __init__(self):
+        temp_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], BLOB_DIRECTORY, 'tmp')
+        os.makedirs(temp_folder, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=temp_folder)
+        self._file = os.fdopen(fd, 'w+b', buffering=COPY_CHUNK_SIZE)
+        self._digest = hashlib.sha256()
+        self.size = 0
+        self.committed = None
+    
+    def write(self, data):
+        self._digest.update(data)
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+    
+    def read(self, size=-1):
+        return self._file.read(size)
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+    
+    def tell(self):
+        return self._file.tell()
+    
+    def hexdigest(self):
+        return self._digest.hexdigest()
+    
+    def commit(self, extension=''):
+        """Move the file onto its blob path and return (file_path, digest, size)."""
+        if self.committed is None:
+            self._file.close()
+            digest = self.hexdigest()
+            file_path = AttachmentStore.blob_path(digest, extension)
+            full_path = _full_path(file_path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(self.temp_path, full_path)
+            self.committed = (file_path, digest, self.size)
+        return self.committed
+    
+    def close(self):
+        self._file.close()
+        if self.committed is None:
+            _remove(self.temp_path)
+
+
+class AttachmentStore:
+    """
+    Content-addressed storage for uploads under UPLOAD_FOLDER.
+    
+    Blobs are named by the SHA-256 of their content and sharded two levels
+    deep (blobs/ab/cd/abcd...ext), so no directory holds more than a few
+    hundred entries and names never collide. Identical content is stored
+    once on disk. Its Attachment row is shared by owners of the same
+    attachment type and ref_count tracks them; a gallery image and a
+    document with the same bytes get separate rows naming the same blob,
+    so sharing content never makes a document public.
+    Paths keep the upload's extension so the static handler still serves
+    the right content type.
+    """
+    
+    @staticmethod
+    def blob_path(digest, extension=''):
+        """Path of a blob relative to UPLOAD_FOLDER."""
+        return '/'.join((BLOB_DIRECTORY, digest[:2], digest[2:4], digest + extension))
+    
+    @staticmethod
+    def _extension(filename):
+        return os.path.splitext(secure_filename(filename or ''))[1].lower()
+    
+    @staticmethod
+    def write_blob(stream, extension=''):
+        """
+        Copy a file-like object into the store.
+        
+        Returns (file_path, digest, size); see BlobWriter.
+        """
+        writer = BlobWriter()
+        try:
+            for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b''):
+                writer.write(chunk)
+            return writer.commit(extension)
+        finally:
+            writer.close()
+    
+    @staticmethod
+    def save(file_obj, attachment_type):
+        """
+        Store an uploaded FileStorage and return its Attachment.
+        
+        The returned attachment carries one more reference; the caller
+        points a column at it and commits.
+        """
+        extension = AttachmentStore._extension(file_obj.filename)
+        if isinstance(file_obj.stream, BlobWriter):
+            # Already hashed into the blob tree while the request was read
+            file_path, digest, size = file_obj.stream.commit(extension)
+        else:
+            file_path, digest, size = AttachmentStore.write_blob(file_obj.stream, extension)
+        attachment = AttachmentStore.acquire(digest, attachment_type, file_path, size)
+        
+        if attachment_type == 'gallery_image':
+            ThumbnailService.generate_async(attachment.file_path)
+        return attachment
+    
+    @staticmethod
+    def acquire(digest, attachment_type, file_path, file_size):
+        """
+        Return the attachment for a blob, creating it or adding a reference.
+        
+        A concurrent upload of the same content may insert the row first;
+        the unique (content_hash, attachment_type) makes one insert fail and
+        that request then takes a reference on the winner's row.
+        """
+        attachment = Attachment.query.filter_by(content_hash=digest, attachment_type=attachment_type).first()
+        
+        if attachment is None:
+            try:
+                with db.session.begin_nested():
+                    attachment = Attachment(file_path=file_path, attachment_type=attachment_type,
+                                            content_hash=digest, file_size=file_size, ref_count=1)
+                    db.session.add(attachment)
+                return attachment
+            except IntegrityError:
+                attachment = Attachment.query.filter_by(content_hash=digest, attachment_type=attachment_type).one()
+        
+        # Same bytes under another extension: keep the blob the row already names,
+        # unless a row of the other type still uses the new one
+        if attachment.file_path != file_path and \
+                Attachment.query.filter_by(file_path=file_path).first() is None:
+            _remove(_full_path(file_path))
+        
+        db.session.execute(update(Attachment).where(Attachment.attachment_id == attachment.attachment_id)
+                                             .values(ref_count=Attachment.ref_count + 1, uploaded_at=datetime.utcnow()))
+        db.session.expire(attachment, ['ref_count', 'uploaded_at'])
+        return attachment
+    
+    @staticmethod
+    def release(attachment, references=1):
+        """
+        Drop references; the last one deletes the row and, after commit, its blob.
+        
+        The caller commits, after repointing or deleting the owner if the
+        owner is a foreign key.
+        """
+        db.session.execute(update(Attachment).where(Attachment.attachment_id == attachment.attachment_id)
+                                             .values(ref_count=Attachment.ref_count - references))
+        db.session.expire(attachment, ['ref_count'])
+        
+        if attachment.ref_count > 0:
+            return False
+        
+        db.session.delete(attachment)
+        DeferredDeletion.schedule(attachment.file_path)
+        return True
+    
+    @staticmethod
+    def release_path(file_path):
+        """release() for owners that store the file_path itself, such as logos."""
+        attachment = Attachment.query.filter_by(file_path=file_path, attachment_type='gallery_image').first()
+        if attachment is None:
+            DeferredDeletion.schedule(file_path)
+            return True
+        return AttachmentStore.release(attachment)
+    
+    @staticmethod
+    def release_faculty(faculty_id):
+        """
+        Drop every reference held by a faculty member's profile and activities.
+        
+        For deleting the faculty member: released rows are deleted in the
+        same flush as their owners, so the caller deletes the faculty row
+        inside the same no_autoflush block and then commits.
+        """
+        counts = Counter()
+        for column in _id_references():
+            rows = db.session.query(column).filter(column.table.c.faculty_id == faculty_id, column.isnot(None))
+            counts.update(attachment_id for attachment_id, in rows)
+        
+        if not counts:
+            return 0
+        
+        released = 0
+        attachments = Attachment.query.filter(Attachment.attachment_id.in_(list(counts))).all()
+        # Deleted rows must not be flushed before the owners that still point at them
+        with db.session.no_autoflush:
+            for attachment in attachments:
+                released += AttachmentStore.release(attachment, counts[attachment.attachment_id])
+        return released
+    
+    @staticmethod
+    def owners(attachment_id):
+        """(faculty_id, department_id) of every faculty member whose profile or activities use an attachment."""
+        owner_ids = union_all(*(select(column.table.c.faculty_id).where(column == attachment_id)
+                                for column in _id_references()))
+        return db.session.query(Faculty.faculty_id, Faculty.department_id) \
+                         .filter(Faculty.faculty_id.in_(select(owner_ids.subquery()))).all()
+    
+    @staticmethod
+    def _count_references(attachment_ids, paths):
+        """Owners per attachment id, from every foreign key and path column."""
+        counts = dict.fromkeys(attachment_ids, 0)
+        
+        for column in _id_references():
+            rows = db.session.query(column, func.count()).filter(column.in_(attachment_ids)).group_by(column)
+            for attachment_id, count in rows:
+                counts[attachment_id] += count
+        
+        by_path = {path: attachment_id for attachment_id, path in paths.items()}
+        for column in PATH_REFERENCES:
+            rows = db.session.query(column, func.count()).filter(column.in_(list(by_path))).group_by(column)
+            for path, count in rows:
+                counts[by_path[path]] += count
+        
+        return counts
+    
+    @staticmethod
+    def _merge(duplicate, canonical, references):
+        """Point every owner of `duplicate` at `canonical` and drop the duplicate row."""
+        for column in _id_references():
+            db.session.execute(update(column.table).where(column == duplicate.attachment_id)
+                                                   .values({column.name: canonical.attachment_id}))
+        for column in PATH_REFERENCES:
+            db.session.execute(update(column.table).where(column == duplicate.file_path)
+                                                   .values({column.name: canonical.file_path}))
+        canonical.ref_count += references
+        db.session.delete(duplicate)
+    
+    @staticmethod
+    def migrate(batch_size=MIGRATE_BATCH_SIZE):
+        """
+        Move files saved before the blob store into it.
+        
+        Rows without a content_hash are processed in primary-key batches:
+        each file is hashed and hard-linked (or copied) to its blob path, the
+        row is renamed, its references are counted, and rows whose content
+        already has a blob are merged into that row. Old files are removed
+        only after the batch commits. Returns a dict of counts.
+        """
+        stats = {'migrated': 0, 'merged': 0, 'missing': 0}
+        last_id = 0
+        
+        while True:
+            batch = Attachment.query.filter(Attachment.content_hash.is_(None),
+                                            Attachment.attachment_id > last_id) \
+                                    .order_by(Attachment.attachment_id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].attachment_id
+            
+            references = AttachmentStore._count_references(
+                [attachment.attachment_id for attachment in batch],
+                {attachment.attachment_id: attachment.file_path for attachment in batch})
+            legacy_files = []
+            
+            for attachment in batch:
+                source = _full_path(attachment.file_path)
+                if not os.path.isfile(source):
+                    stats['missing'] += 1
+                    continue
+                
+                digest = hashlib.sha256()
+                with open(source, 'rb') as stream:
+                    for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                digest = digest.hexdigest()
+                
+                canonical = Attachment.query.filter_by(content_hash=digest,
+                                                       attachment_type=attachment.attachment_type).first()
+                if canonical is not None:
+                    AttachmentStore._merge(attachment, canonical, references[attachment.attachment_id])
+                    stats['merged'] += 1
+                else:
+                    file_path = AttachmentStore.blob_path(digest, os.path.splitext(attachment.file_path)[1].lower())
+                    target = _full_path(file_path)
+                    if not os.path.exists(target):
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        try:
+                            os.link(source, target)
+                        except OSError:
+                            shutil.copyfile(source, target)
+                    
+                    for column in PATH_REFERENCES:
+                        db.session.execute(update(column.table).where(column == attachment.file_path)
+                                                               .values({column.name: file_path}))
+                    attachment.file_path = file_path
+                    attachment.content_hash = digest
+                    attachment.file_size = os.path.getsize(target)
+                    attachment.ref_count = references[attachment.attachment_id]
+                    stats['migrated'] += 1
+                
+                # Flush so the next row with the same content finds this one
+                db.session.flush()
+                legacy_files.append(source)
+            
+            db.session.commit()
+            for source in legacy_files:
+                _remove(source)
+        
+        return stats
+    
+    @staticmethod
+    def separate_documents():
+        """
+        Give documents that share a gallery image's row a row of their own.
+        
+        Before rows were keyed by type, uploading a photo with the same bytes
+        as a document turned the shared row into a gallery image, making the
+        document public. Each document column pointing at a gallery image is
+        moved to a document row for the same blob; gallery rows left with no
+        owner are dropped along with their derivatives. Returns the number of
+        references moved.
+        """
+        document_columns = [column for column in _id_references()
+                            if not any(column is gallery for gallery in GALLERY_REFERENCES)]
+        moved = {}
+        for column in document_columns:
+            rows = db.session.query(column, func.count()) \
+                             .join(Attachment, Attachment.attachment_id == column) \
+                             .filter(Attachment.attachment_type == 'gallery_image') \
+                             .group_by(column)
+            for attachment_id, count in rows:
+                moved[attachment_id] = moved.get(attachment_id, 0) + count
+        
+        dropped = []
+        for attachment_id, references in moved.items():
+            gallery = db.session.get(Attachment, attachment_id)
+            document = None
+            if gallery.content_hash is not None:
+                document = Attachment.query.filter_by(content_hash=gallery.content_hash,
+                                                      attachment_type='attachment').first()
+            if document is None:
+                document = Attachment(file_path=gallery.file_path, attachment_type='attachment',
+                                      content_hash=gallery.content_hash, file_size=gallery.file_size,
+                                      uploaded_at=gallery.uploaded_at, ref_count=0)
+                db.session.add(document)
+                db.session.flush()
+            
+            for column in document_columns:
+                db.session.execute(update(column.table).where(column == attachment_id)
+                                                       .values({column.name: document.attachment_id}))
+            document.ref_count += references
+            gallery.ref_count -= references
+            if gallery.ref_count <= 0:
+                db.session.delete(gallery)
+                dropped.append(gallery.file_path)
+        
+        db.session.commit()
+        for file_path in dropped:
+            ThumbnailService.remove(file_path)
+        return sum(moved.values())
+    
+    @staticmethod
+    def sweep(batch_size=SWEEP_BATCH_SIZE, dry_run=False):
+        """
+        Reconcile attachment rows with the files under UPLOAD_FOLDER.
+        
+        The tree is listed once with scandir, which reads names and types
+        without a stat per file. Rows are then checked in primary-key
+        batches against that listing and their owners. Only files with no
+        row are stat'ed, for their age and size. Reclaims:
+        - files no row names (including derivatives and stale temporary files)
+        - rows with no owner left, which are released as if by their owners
+        Anything younger than SWEEP_GRACE_PERIOD is left alone, since it may
+        belong to an upload whose transaction has not committed yet. Rows
+        whose file is missing are only counted. Returns a dict of counts;
+        `dry_run` reports without deleting anything.
+        """
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        started = datetime.utcnow()
+        cutoff = (started - SWEEP_GRACE_PERIOD).timestamp()
+        stats = {'files': 0, 'rows': 0, 'missing_files': 0, 'unreferenced_rows': 0, 'unreferenced_bytes': 0,
+                 'orphan_files': 0, 'orphan_bytes': 0}
+        
+        # Top-level files are uploads from before the blob store
+        top_files, directories = _list_directory(upload_folder)
+        present = set(top_files)
+        for directory in directories:
+            present.update(_walk_files(os.path.join(upload_folder, directory), directory + '/'))
+        stats['files'] = len(present)
+        
+        known_stems = set()
+        last_id = 0
+        while True:
+            batch = Attachment.query.filter(Attachment.attachment_id > last_id) \
+                                    .order_by(Attachment.attachment_id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].attachment_id
+            stats['rows'] += len(batch)
+            
+            # Logos are gallery images; a document naming the same blob is not their owner
+            references = AttachmentStore._count_references(
+                [attachment.attachment_id for attachment in batch],
+                {attachment.attachment_id: attachment.file_path for attachment in batch
+                 if attachment.attachment_type == 'gallery_image'})
+            
+            for attachment in batch:
+                found = attachment.file_path in present
+                present.discard(attachment.file_path)
+                if attachment.attachment_type == 'gallery_image':
+                    known_stems.add(os.path.splitext(attachment.file_path)[0])
+                if attachment.uploaded_at is None or attachment.uploaded_at > started - SWEEP_GRACE_PERIOD:
+                    continue
+                
+                if references[attachment.attachment_id] == 0:
+                    stats['unreferenced_rows'] += 1
+                    stats['unreferenced_bytes'] += attachment.file_size or 0
+                    if not dry_run:
+                        AttachmentStore.release(attachment, attachment.ref_count)
+                elif not found:
+                    stats['missing_files'] += 1
+            
+            if not dry_run:
+                db.session.commit()
+        
+        # Whatever is left has no row, apart from derivatives of gallery images
+        for file_path in sorted(present):
+            source = ThumbnailService.source_stem(file_path)
+            if source is not None and source in known_stems:
+                continue
+            
+            full_path = _full_path(file_path)
+            try:
+                status = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if status.st_mtime > cutoff:
+                continue
+            
+            stats['orphan_files'] += 1
+            stats['orphan_bytes'] += status.st_size
+            if not dry_run:
+                _remove(full_path)
+        
+        return stats
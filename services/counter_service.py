@@ -0,0 +1,76 @@
+from sqlalchemy import func, select
+from models.base import db
+from models.faculty import Faculty
+from models.activity_counter import FacultyActivityCounter, COUNTED_MODELS
+
+
+class CounterService:
+    """Reads and repairs the per-faculty activity counter cache."""
+    
+    @staticmethod
+    def get_counts(faculty_id):
+        """
+        Return the activity counts for a faculty member as a dict.
+        
+        This is a single primary-key lookup. Counter rows are created with
+        the faculty row; one that is still missing (a profile older than the
+        counter table, until `flask repair-activity-counters` runs) is
+        counted from the activity tables without writing, so concurrent
+        reads never race to insert it.
+        """
+        counter = FacultyActivityCounter.query.get(faculty_id)
+        if counter is not None:
+            return counter.as_dict()
+        
+        row = db.session.execute(CounterService._counts_query([faculty_id])).first()
+        return {name: getattr(row, name) if row else 0 for name in COUNTED_MODELS}
+    
+    @staticmethod
+    def _counts_query(faculty_ids=None):
+        """Faculty id and one grouped COUNT per counter column, for `faculty_ids` or every faculty."""
+        columns = [Faculty.faculty_id]
+        subqueries = []
+        for name, model in COUNTED_MODELS.items():
+            counts = select(model.faculty_id, func.count().label('total')).group_by(model.faculty_id)
+            if faculty_ids is not None:
+                counts = counts.where(model.faculty_id.in_(faculty_ids))
+            counts = counts.subquery(f'{name}_counts')
+            subqueries.append(counts)
+            columns.append(func.coalesce(counts.c.total, 0).label(name))
+        
+        source = select(*columns).select_from(Faculty)
+        for counts in subqueries:
+            source = source.outerjoin(counts, counts.c.faculty_id == Faculty.faculty_id)
+        if faculty_ids is not None:
+            source = source.where(Faculty.faculty_id.in_(faculty_ids))
+        return source
+    
+    @staticmethod
+    def rebuild(faculty_ids=None, connection=None):
+        """
+        Recompute counters from the activity tables with set-based statements.
+        
+        `faculty_ids` limits the rebuild to those faculty; None rebuilds every
+        counter. Existing rows are deleted and re-inserted with one
+        INSERT ... SELECT whose columns are grouped COUNT subqueries.
+        Returns the number of counters written.
+        """
+        if connection is None:
+            connection = db.session.connection()
+        
+        table = FacultyActivityCounter.__table__
+        delete = table.delete()
+        
+        if faculty_ids is not None:
+            faculty_ids = list(faculty_ids)
+            if not faculty_ids:
+                return 0
+            delete = delete.where(table.c.faculty_id.in_(faculty_ids))
+        
+        source = CounterService._counts_query(faculty_ids).add_columns(func.now())
+        
+        connection.execute(delete)
+        result = connection.execute(table.insert().from_select(
+            ['faculty_id', *COUNTED_MODELS.keys(), 'updated_at'], source))
+        
+        return result.rowcount
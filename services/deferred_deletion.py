@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.base import db
+from models.attachment import Attachment
+from services.thumbnail_service import ThumbnailService
+
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY = 'deferred_file_deletions'
+
+
+class DeferredDeletion:
+    """
+    Upload files removed only once the transaction that dropped them commits.
+    
+    schedule() records a path on the session; the commit hook hands the
+    paths to a single background thread and a rollback forgets them, so a
+    failed commit never leaves rows pointing at deleted files. Before a
+    file is removed the worker checks that no attachment row names it and
+    that it has not been written again since it was scheduled, as happens
+    when the same content is uploaded again straight away. A file kept only
+    by documents loses its derivatives.
+    """
+    
+    _executor = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def schedule(file_path, session=None):
+        """Delete a file, relative to UPLOAD_FOLDER, after the current transaction commits."""
+        session = session or db.session()
+        session.info.setdefault(SESSION_KEY, []).append((file_path, time.time()))
+    
+    @staticmethod
+    def _pool():
+        with DeferredDeletion._lock:
+            if DeferredDeletion._executor is None:
+                DeferredDeletion._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-deletion')
+            return DeferredDeletion._executor
+    
+    @staticmethod
+    def submit(paths):
+        """Hand scheduled (file_path, scheduled_at) pairs to the worker."""
+        app = current_app._get_current_object()
+        return DeferredDeletion._pool().submit(DeferredDeletion.delete, app, paths)
+    
+    @staticmethod
+    def delete(app, paths):
+        """Remove files that are still unreferenced; runs on the worker thread."""
+        removed = 0
+        with app.app_context():
+            rows = db.session.query(Attachment.file_path, Attachment.attachment_type) \
+                             .filter(Attachment.file_path.in_([path for path, _ in paths])).all()
+            referenced = {row.file_path for row in rows}
+            galleries = {row.file_path for row in rows if row.attachment_type == 'gallery_image'}
+            
+            for file_path, scheduled_at in paths:
+                if file_path in referenced:
+                    # A document sharing the blob keeps it, but not its public thumbnails
+                    if file_path not in galleries:
+                        ThumbnailService.remove(file_path)
+                    continue
+                
+                full_path = os.path.join(app.config['UPLOAD_FOLDER'], *file_path.split('/'))
+                try:
+                    if os.stat(full_path).st_mtime > scheduled_at:
+                        continue
+                    os.remove(full_path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.exception('Could not delete %s', file_path)
+                    continue
+                ThumbnailService.remove(file_path)
+        
+        return removed
+
+
+@event.listens_for(Session, 'after_commit')
+def _submit_deferred_deletions(session):
+    paths = session.info.pop(SESSION_KEY, None)
+    if paths:
+        DeferredDeletion.submit(paths)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deferred_deletions(session):
+    session.info.pop(SESSION_KEY, None)
@@ -0,0 +1,299 @@
+from sqlalchemy import case, func, select
+from models.base import db
+from models.department import College, Department
+from models.faculty import Faculty, WorkExperience, ResearchPublication, HonoursAward
+from models.directory_facet import FacultyDirectoryFacet
+from config.constants import ExperienceTypes, ProfileStatus
+from utils.pagination import clamp_page_size, keyset_page
+
+
+DIRECTORY_PAGE_SIZE = 25
+DIRECTORY_MAX_PAGE_SIZE = 100
+
+# Alphabetical; faculty_id breaks ties between equal names
+DIRECTORY_SORT_KEY = (Faculty.first_name, Faculty.faculty_id)
+
+# Range facets: (key, lowest value, highest value or None for open-ended)
+EXPERIENCE_BUCKETS = (('0-2', 0, 2), ('3-5', 3, 5), ('6-10', 6, 10), ('11-20', 11, 20), ('21+', 21, None))
+PUBLICATION_BUCKETS = (('0', 0, 0), ('1-4', 1, 4), ('5-9', 5, 9), ('10-24', 10, 24), ('25+', 25, None))
+AWARD_BUCKETS = (('0', 0, 0), ('1-2', 1, 2), ('3-5', 3, 5), ('6+', 6, None))
+
+RANGE_FACETS = {
+    'experience': (FacultyDirectoryFacet.experience_years, EXPERIENCE_BUCKETS),
+    'publications': (FacultyDirectoryFacet.publications, PUBLICATION_BUCKETS),
+    'awards': (FacultyDirectoryFacet.awards, AWARD_BUCKETS)
+}
+
+EXPERIENCE_TYPE_COLUMNS = {
+    ExperienceTypes.TEACHING: FacultyDirectoryFacet.teaching_experiences,
+    ExperienceTypes.INDUSTRY: FacultyDirectoryFacet.industry_experiences
+}
+
+PROFILE_STATUSES = (ProfileStatus.PENDING, ProfileStatus.APPROVED,
+                    ProfileStatus.FROZEN, ProfileStatus.UNFROZEN)
+
+FACET_NAMES = ('department', 'college', 'status', 'experience_type', 'experience', 'publications', 'awards')
+
+
+def _bucket_expression(column, buckets):
+    whens = [(column <= high, key) for key, low, high in buckets if high is not None]
+    return case(*whens, else_=buckets[-1][0])
+
+
+def _bucket_range(column, buckets, key):
+    for bucket_key, low, high in buckets:
+        if bucket_key == key:
+            return column >= low if high is None else column.between(low, high)
+
+
+class DirectoryService:
+    """Faceted faculty directory served from the faculty_directory_facets table."""
+    
+    @staticmethod
+    def refresh(faculty_ids=None, connection=None):
+        """
+        Recompute facet rows from the faculty, experience and activity tables.
+        
+        `faculty_ids` limits the refresh to those faculty; None rebuilds every
+        row. Rows are deleted and re-inserted with one INSERT ... SELECT over
+        grouped subqueries, as CounterService.rebuild does. Returns the number
+        of rows written.
+        """
+        if connection is None:
+            connection = db.session.connection()
+        
+        table = FacultyDirectoryFacet.__table__
+        delete = table.delete()
+        
+        if faculty_ids is not None:
+            faculty_ids = list(faculty_ids)
+            if not faculty_ids:
+                return 0
+            delete = delete.where(table.c.faculty_id.in_(faculty_ids))
+        
+        experience = select(
+            WorkExperience.faculty_id,
+            func.sum(case((WorkExperience.experience_type == ExperienceTypes.TEACHING, 1), else_=0)).label('teaching'),
+            func.sum(case((WorkExperience.experience_type == ExperienceTypes.INDUSTRY, 1), else_=0)).label('industry'),
+            func.sum(func.coalesce(WorkExperience.number_of_years, 0)).label('years')
+        ).group_by(WorkExperience.faculty_id)
+        publications = select(ResearchPublication.faculty_id, func.count().label('total')) \
+            .group_by(ResearchPublication.faculty_id)
+        awards = select(HonoursAward.faculty_id, func.count().label('total')) \
+            .group_by(HonoursAward.faculty_id)
+        
+        if faculty_ids is not None:
+            experience = experience.where(WorkExperience.faculty_id.in_(faculty_ids))
+            publications = publications.where(ResearchPublication.faculty_id.in_(faculty_ids))
+            awards = awards.where(HonoursAward.faculty_id.in_(faculty_ids))
+        
+        experience = experience.subquery('experience')
+        publications = publications.subquery('publication_counts')
+        awards = awards.subquery('award_counts')
+        
+        source = select(
+            Faculty.faculty_id, Faculty.department_id, Department.college_id, Faculty.profile_status,
+            func.coalesce(experience.c.teaching, 0), func.coalesce(experience.c.industry, 0),
+            func.coalesce(experience.c.years, 0), func.coalesce(publications.c.total, 0),
+            func.coalesce(awards.c.total, 0), func.now()
+        ).select_from(Faculty) \
+         .outerjoin(Department, Department.department_id == Faculty.department_id) \
+         .outerjoin(experience, experience.c.faculty_id == Faculty.faculty_id) \
+         .outerjoin(publications, publications.c.faculty_id == Faculty.faculty_id) \
+         .outerjoin(awards, awards.c.faculty_id == Faculty.faculty_id)
+        if faculty_ids is not None:
+            source = source.where(Faculty.faculty_id.in_(faculty_ids))
+        
+        connection.execute(delete)
+        result = connection.execute(table.insert().from_select(
+            ['faculty_id', 'department_id', 'college_id', 'profile_status', 'teaching_experiences',
+             'industry_experiences', 'experience_years', 'publications', 'awards', 'updated_at'], source))
+        
+        return result.rowcount
+    
+    @staticmethod
+    def parse_filters(args):
+        """
+        Read the directory filters from request arguments.
+        
+        Raises ValueError for an id that is not a number or a status,
+        experience type or bucket that does not exist.
+        """
+        filters = dict.fromkeys(FACET_NAMES)
+        
+        for name, arg in (('department', 'department_id'), ('college', 'college_id')):
+            value = args.get(arg)
+            if value:
+                try:
+                    filters[name] = int(value)
+                except ValueError:
+                    raise ValueError(f'Invalid {arg}')
+        
+        choices = {
+            'status': PROFILE_STATUSES,
+            'experience_type': tuple(EXPERIENCE_TYPE_COLUMNS),
+            'experience': tuple(key for key, _, _ in EXPERIENCE_BUCKETS),
+            'publications': tuple(key for key, _, _ in PUBLICATION_BUCKETS),
+            'awards': tuple(key for key, _, _ in AWARD_BUCKETS)
+        }
+        for name, allowed in choices.items():
+            value = args.get(name)
+            if value:
+                if value not in allowed:
+                    raise ValueError(f'Invalid {name}')
+                filters[name] = value
+        
+        return filters
+    
+    @staticmethod
+    def _conditions(filters):
+        conditions = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name == 'department':
+                conditions.append(FacultyDirectoryFacet.department_id == value)
+            elif name == 'college':
+                conditions.append(FacultyDirectoryFacet.college_id == value)
+            elif name == 'status':
+                conditions.append(FacultyDirectoryFacet.profile_status == value)
+            elif name == 'experience_type':
+                conditions.append(EXPERIENCE_TYPE_COLUMNS[value] > 0)
+            else:
+                column, buckets = RANGE_FACETS[name]
+                conditions.append(_bucket_range(column, buckets, value))
+        return conditions
+    
+    @staticmethod
+    def _cube(department_id=None):
+        """
+        Count faculty per combination of facet values in one grouped query.
+        
+        The result has at most one row per distinct combination, which is
+        far smaller than the faculty table, and every facet count for any
+        filter selection can be summed from it.
+        """
+        dimensions = [
+            FacultyDirectoryFacet.department_id.label('department'),
+            FacultyDirectoryFacet.college_id.label('college'),
+            FacultyDirectoryFacet.profile_status.label('status'),
+            (FacultyDirectoryFacet.teaching_experiences > 0).label('teaching'),
+            (FacultyDirectoryFacet.industry_experiences > 0).label('industry')
+        ] + [_bucket_expression(column, buckets).label(name) for name, (column, buckets) in RANGE_FACETS.items()]
+        
+        query = db.session.query(*dimensions, func.count().label('total')).group_by(*dimensions)
+        if department_id is not None:
+            query = query.filter(FacultyDirectoryFacet.department_id == department_id)
+        return query.all()
+    
+    @staticmethod
+    def _cell_values(cell, name):
+        """The values a cube cell contributes to one facet."""
+        if name == 'experience_type':
+            values = []
+            if cell.teaching:
+                values.append(ExperienceTypes.TEACHING)
+            if cell.industry:
+                values.append(ExperienceTypes.INDUSTRY)
+            return values
+        return [getattr(cell, name)]
+    
+    @staticmethod
+    def facet_counts(filters, department_id=None):
+        """
+        Return ({facet: {value: count}}, total) for the given filters.
+        
+        Each facet counts faculty matching every filter except its own, so
+        the counts show what selecting another value would return.
+        """
+        cells = DirectoryService._cube(department_id)
+        counts = {name: {} for name in FACET_NAMES}
+        total = 0
+        
+        for cell in cells:
+            failed = [name for name, value in filters.items()
+                      if value is not None and value not in DirectoryService._cell_values(cell, name)]
+            if not failed:
+                total += cell.total
+            # A cell counts towards a facet only if no other facet's filter excludes it
+            for name in FACET_NAMES:
+                if failed and failed != [name]:
+                    continue
+                for value in DirectoryService._cell_values(cell, name):
+                    counts[name][value] = counts[name].get(value, 0) + cell.total
+        
+        return counts, total
+    
+    @staticmethod
+    def _facet_lists(counts):
+        """Turn raw counts into ordered, labelled facet lists."""
+        departments = db.session.query(
+            Department.department_id, Department.department_name, College.college_id, College.college_name
+        ).outerjoin(College, College.college_id == Department.college_id).all()
+        department_names = {row.department_id: row.department_name for row in departments}
+        college_names = {row.college_id: row.college_name for row in departments if row.college_id}
+        
+        def listed(name, labels):
+            return sorted(
+                ({'value': value, 'label': labels.get(value, value), 'count': count}
+                 for value, count in counts[name].items() if value is not None),
+                key=lambda entry: str(entry['label'])
+            )
+        
+        def ordered(name, values):
+            return [{'value': value, 'label': value, 'count': counts[name].get(value, 0)} for value in values]
+        
+        facets = {
+            'department': listed('department', department_names),
+            'college': listed('college', college_names),
+            'status': ordered('status', PROFILE_STATUSES),
+            'experience_type': ordered('experience_type', tuple(EXPERIENCE_TYPE_COLUMNS))
+        }
+        for name, (column, buckets) in RANGE_FACETS.items():
+            facets[name] = ordered(name, [key for key, _, _ in buckets])
+        return facets
+    
+    @staticmethod
+    def page(args, department_id=None):
+        """
+        Return one page of the directory with facet counts.
+        
+        Understands the filters read by parse_filters plus `limit` and the
+        `after`/`before` cursors. `department_id` restricts everything,
+        including the facets, to one department (for HODs). Costs three
+        queries: the facet cube, department labels and the page itself.
+        Raises ValueError for invalid filters or a malformed cursor.
+        """
+        filters = DirectoryService.parse_filters(args)
+        if department_id is not None:
+            filters['department'] = department_id
+        limit = clamp_page_size(args.get('limit'), DIRECTORY_PAGE_SIZE, DIRECTORY_MAX_PAGE_SIZE)
+        
+        query = db.session.query(
+            Faculty.faculty_id, Faculty.first_name, Faculty.last_name, Faculty.regdno, Faculty.email,
+            Department.department_name, College.college_name, FacultyDirectoryFacet.profile_status,
+            FacultyDirectoryFacet.teaching_experiences, FacultyDirectoryFacet.industry_experiences,
+            FacultyDirectoryFacet.experience_years, FacultyDirectoryFacet.publications,
+            FacultyDirectoryFacet.awards
+        ).join(Faculty, Faculty.faculty_id == FacultyDirectoryFacet.faculty_id) \
+         .outerjoin(Department, Department.department_id == FacultyDirectoryFacet.department_id) \
+         .outerjoin(College, College.college_id == FacultyDirectoryFacet.college_id) \
+         .filter(*DirectoryService._conditions(filters))
+        
+        rows, next_cursor, prev_cursor = keyset_page(
+            query, DIRECTORY_SORT_KEY, limit,
+            after=args.get('after'), before=args.get('before'),
+            descending=False
+        )
+        
+        counts, total = DirectoryService.facet_counts(filters, department_id)
+        
+        return {
+            'faculty': rows,
+            'filters': filters,
+            'facets': DirectoryService._facet_lists(counts),
+            'total': total,
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
@@ -0,0 +1,115 @@
+from models.base import db
+from models.faculty import Faculty
+from models.attachment import Attachment
+from models.department import Department
+from models.user import Role, UserRole
+from config.constants import UserRoles
+
+
+PICKER_PAGE_SIZE = 25
+PICKER_MAX_PAGE_SIZE = 100
+
+
+class HODService:
+    """Read models for HOD assignment built from flat, ordered queries."""
+    
+    @staticmethod
+    def hod_assignments():
+        """Map the user id of every current HOD to the time the role was assigned."""
+        rows = db.session.query(UserRole.user_id, UserRole.assigned_at) \
+                         .join(Role, Role.role_id == UserRole.role_id) \
+                         .filter(Role.name == UserRoles.HOD).all()
+        return {user_id: assigned_at for user_id, assigned_at in rows}
+    
+    @staticmethod
+    def _faculty_query():
+        return db.session.query(
+            Faculty.faculty_id, Faculty.user_id, Faculty.department_id,
+            Faculty.first_name, Faculty.last_name, Faculty.email,
+            Faculty.contact_no, Attachment.file_path.label('photo_path')
+        ).outerjoin(Attachment, Attachment.attachment_id == Faculty.photo_attachment_id)
+    
+    @staticmethod
+    def _faculty_dict(row, hod_user_ids):
+        return {
+            'faculty_id': row.faculty_id,
+            'user_id': row.user_id,
+            'full_name': f"{row.first_name} {row.last_name}" if row.last_name else row.first_name,
+            'email': row.email,
+            'contact_no': row.contact_no,
+            'photo_path': row.photo_path,
+            'is_hod': row.user_id in hod_user_ids
+        }
+    
+    @staticmethod
+    def department_heads():
+        """
+        Return one row per department with its current HOD, if any.
+        
+        Costs two queries: departments, and the faculty rows joined to the
+        HOD role assignment, so the cost does not grow with the roster.
+        """
+        departments = db.session.query(Department.department_id, Department.department_name) \
+                                .order_by(Department.department_name).all()
+        
+        rows = HODService._faculty_query() \
+                         .add_columns(UserRole.assigned_at) \
+                         .join(UserRole, UserRole.user_id == Faculty.user_id) \
+                         .join(Role, Role.role_id == UserRole.role_id) \
+                         .filter(Role.name == UserRoles.HOD) \
+                         .order_by(Faculty.department_id, Faculty.first_name, Faculty.last_name, Faculty.faculty_id) \
+                         .all()
+        hod_user_ids = {row.user_id for row in rows}
+        
+        # First HOD by name when a department has more than one
+        head_rows = {}
+        for row in rows:
+            head_rows.setdefault(row.department_id, row)
+        
+        heads = []
+        for department_id, department_name in departments:
+            row = head_rows.get(department_id)
+            heads.append({
+                'department_id': department_id,
+                'department_name': department_name,
+                'hod': HODService._faculty_dict(row, hod_user_ids) if row else None,
+                'assigned_at': row.assigned_at if row else None
+            })
+        
+        return heads
+    
+    @staticmethod
+    def candidates_page(department_id, page=1, per_page=PICKER_PAGE_SIZE):
+        """
+        Return one page of HOD candidates for a department.
+        
+        The current HOD is reported separately so the picker can show it
+        regardless of which page is loaded.
+        """
+        per_page = max(1, min(per_page, PICKER_MAX_PAGE_SIZE))
+        page = max(1, page)
+        
+        hod_user_ids = HODService.hod_assignments()
+        
+        rows = HODService._faculty_query() \
+                         .filter(Faculty.department_id == department_id) \
+                         .order_by(Faculty.first_name, Faculty.last_name, Faculty.faculty_id) \
+                         .offset((page - 1) * per_page) \
+                         .limit(per_page + 1).all()
+        
+        current_hod = None
+        if hod_user_ids:
+            hod_row = HODService._faculty_query() \
+                                .filter(Faculty.department_id == department_id,
+                                        Faculty.user_id.in_(hod_user_ids)) \
+                                .order_by(Faculty.faculty_id).first()
+            if hod_row:
+                current_hod = HODService._faculty_dict(hod_row, hod_user_ids)
+        
+        return {
+            'items': [HODService._faculty_dict(row, hod_user_ids) for row in rows[:per_page]],
+            'current_hod': current_hod,
+            'page': page,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page
+        }
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityCache:
+    """
+    TTL cache of user identity records shared by every worker on the host.
+    
+    Records live in a small SQLite file (IDENTITY_CACHE_PATH, by default
+    under the app's instance folder) so gunicorn workers see each other's
+    entries and invalidations. The file is created readable by its owner
+    only, and records are keyed by a namespace derived from the database
+    URI and SECRET_KEY, so deployments sharing a file never read each
+    other's records. The cache is best effort: any SQLite error is logged
+    and the caller falls back to the database. Set IDENTITY_CACHE_TTL to 0
+    to disable it.
+    """
+    
+    _local = threading.local()
+    
+    @staticmethod
+    def _settings():
+        if not has_app_context():
+            return None, 0
+        config = current_app.config
+        path = config.get('IDENTITY_CACHE_PATH') or \
+            os.path.join(current_app.instance_path, 'identity_cache.sqlite3')
+        return path, config.get('IDENTITY_CACHE_TTL', 300)
+    
+    @staticmethod
+    def _namespace():
+        config = current_app.config
+        key = f"{config.get('SQLALCHEMY_DATABASE_URI')}\0{config['SECRET_KEY']}"
+        return hashlib.sha256(key.encode()).hexdigest()
+    
+    @staticmethod
+    def _create(path):
+        """Create the cache file, and its folder, accessible to this user only."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        # An existing file must not be readable by other users
+        if os.stat(path).st_mode & 0o077:
+            raise sqlite3.OperationalError(f'{path} is accessible to other users')
+    
+    @staticmethod
+    def _connection(path):
+        connections = getattr(IdentityCache._local, 'connections', None)
+        if connections is None:
+            connections = IdentityCache._local.connections = {}
+        
+        conn = connections.get(path)
+        if conn is None:
+            try:
+                IdentityCache._create(path)
+            except OSError as e:
+                raise sqlite3.OperationalError(str(e))
+            conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS identity_records ('
+                'namespace TEXT NOT NULL, user_id INTEGER NOT NULL, record TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, PRIMARY KEY (namespace, user_id))'
+            )
+            connections[path] = conn
+        return conn
+    
+    @staticmethod
+    def get(user_id):
+        """Return the cached record for a user, or None if missing or expired."""
+        path, ttl = IdentityCache._settings()
+        if not ttl:
+            return None
+        
+        try:
+            row = IdentityCache._connection(path).execute(
+                'SELECT record FROM identity_records WHERE namespace = ? AND user_id = ? AND expires_at > ?',
+                (IdentityCache._namespace(), int(user_id), time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            logger.exception('Identity cache read failed')
+            return None
+        
+        return json.loads(row[0]) if row else None
+    
+    @staticmethod
+    def set(record):
+        """Store a record for IDENTITY_CACHE_TTL seconds."""
+        path, ttl = IdentityCache._settings()
+        if not ttl:
+            return
+        
+        try:
+            IdentityCache._connection(path).execute(
+                'INSERT OR REPLACE INTO identity_records (namespace, user_id, record, expires_at) '
+                'VALUES (?, ?, ?, ?)',
+                (IdentityCache._namespace(), record['user_id'], json.dumps(record), time.time() + ttl)
+            )
+        except sqlite3.Error:
+            logger.exception('Identity cache write failed')
+    
+    @staticmethod
+    def invalidate(*user_ids):
+        """Drop the records of the given users so their next request reloads them."""
+        path, ttl = IdentityCache._settings()
+        user_ids = [int(user_id) for user_id in user_ids if user_id is not None]
+        if not ttl or not user_ids:
+            return
+        
+        placeholders = ','.join('?' * len(user_ids))
+        try:
+            IdentityCache._connection(path).execute(
+                f'DELETE FROM identity_records WHERE namespace = ? AND user_id IN ({placeholders})',
+                [IdentityCache._namespace()] + user_ids
+            )
+        except sqlite3.Error:
+            logger.exception('Identity cache invalidation failed for users %s', user_ids)
+    
+    @staticmethod
+    def clear():
+        """Drop every cached record."""
+        path, ttl = IdentityCache._settings()
+        if not ttl:
+            return
+        
+        try:
+            IdentityCache._connection(path).execute('DELETE FROM identity_records WHERE namespace = ?',
+                                                    (IdentityCache._namespace(),))
+        except sqlite3.Error:
+            logger.exception('Identity cache clear failed')
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_faculty_owners(session, flush_context):
+    """Remember users whose account, roles or own faculty row changed; their identity record is stale."""
+    from models.faculty import Faculty
+    from models.user import User, UserRole
+    
+    owners = session.info.setdefault('identity_cache_stale', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Faculty, User, UserRole)):
+            owners.add(obj.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_faculty_owners(session):
+    owners = session.info.pop('identity_cache_stale', None)
+    if owners:
+        IdentityCache.invalidate(*owners)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_faculty_owners(session):
+    session.info.pop('identity_cache_stale', None)
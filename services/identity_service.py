@@ -0,0 +1,242 @@
+from flask import abort, current_app, has_request_context, request
+from flask_login import UserMixin, logout_user
+from sqlalchemy.orm import contains_eager
+from models.base import db
+from models.user import User
+from models.faculty import Faculty
+from models.attachment import Attachment
+from config.constants import UserRoles
+from services.identity_cache import IdentityCache
+
+
+class IdentityContext:
+    """
+    Read-only view of the signed-in user for the lifetime of one request.
+    
+    Holds the user's role names, their own faculty row identifiers and the
+    department they may manage as HOD, so role and department checks never
+    touch the database.
+    """
+    
+    __slots__ = ('user_id', 'role_names', '_faculty', '_load_faculty')
+    
+    def __init__(self, user_id, role_names, faculty_id=None, department_id=None, photo_path=None,
+                 load_faculty=None):
+        self.user_id = user_id
+        self.role_names = frozenset(role_names)
+        # With load_faculty the faculty fields are only fetched when first read
+        self._faculty = None if load_faculty else (faculty_id, department_id, photo_path)
+        self._load_faculty = load_faculty
+    
+    @classmethod
+    def from_user(cls, user):
+        """
+        Build a context from an already loaded user.
+        
+        Role checks only need user.roles; the faculty row and photo are lazy
+        loaded the first time a faculty field is read.
+        """
+        def load_faculty():
+            faculty = user.faculty_profile
+            if faculty is None:
+                return None, None, None
+            photo = faculty.photo_attachment
+            return faculty.faculty_id, faculty.department_id, photo.file_path if photo else None
+        
+        return cls(user.user_id, (role.name for role in user.roles), load_faculty=load_faculty)
+    
+    def _faculty_fields(self):
+        if self._faculty is None:
+            self._faculty = self._load_faculty()
+            self._load_faculty = None
+        return self._faculty
+    
+    @property
+    def faculty_id(self):
+        return self._faculty_fields()[0]
+    
+    @property
+    def department_id(self):
+        return self._faculty_fields()[1]
+    
+    @property
+    def photo_path(self):
+        return self._faculty_fields()[2]
+    
+    def has_role(self, role_name):
+        return role_name in self.role_names
+    
+    @property
+    def is_institution_wide(self):
+        """Admins and principals may act on every department."""
+        return UserRoles.ADMIN in self.role_names or UserRoles.PRINCIPAL in self.role_names
+    
+    @property
+    def hod_department_id(self):
+        """The department this user heads, or None if they are not an HOD."""
+        return self.department_id if UserRoles.HOD in self.role_names else None
+    
+    def can_manage_department(self, department_id):
+        """True if the user may approve, freeze or view faculty of the department."""
+        if self.is_institution_wide:
+            return True
+        return self.hod_department_id is not None and self.hod_department_id == department_id
+    
+    def owns_faculty(self, faculty_id):
+        return self.faculty_id is not None and self.faculty_id == faculty_id
+
+
+class CachedUser(UserMixin):
+    """
+    Stand-in for a User built from a cached identity record.
+    
+    Role checks and the identity context are answered from the record. Any
+    other attribute, read or written, loads the real User row on first use,
+    so code that changes the current user (e.g. its password) still works.
+    """
+    
+    _RECORD_FIELDS = ('user_id', 'username', 'email', 'first_name', 'last_name', 'is_active')
+    
+    def __init__(self, record):
+        for field in self._RECORD_FIELDS:
+            self.__dict__[field] = record[field]
+        self.__dict__['identity'] = IdentityContext(
+            record['user_id'],
+            record['roles'],
+            faculty_id=record['faculty_id'],
+            department_id=record['department_id'],
+            photo_path=record['photo_path']
+        )
+        self.__dict__['_user'] = None
+    
+    def _load(self):
+        user = self.__dict__['_user']
+        if user is None:
+            user = db.session.get(User, self.user_id)
+            if user is None:
+                # Deleted while its cached record was still live
+                IdentityService.invalidate(self.user_id)
+                IdentityService._sign_out()
+            user.identity = self.identity
+            self.__dict__['_user'] = user
+        return user
+    
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+        if name in self._RECORD_FIELDS:
+            self.__dict__[name] = value
+    
+    def get_id(self):
+        return str(self.user_id)
+    
+    def has_role(self, role_name):
+        return self.identity.has_role(role_name)
+    
+    @property
+    def is_admin(self):
+        return self.has_role(UserRoles.ADMIN)
+    
+    @property
+    def is_principal(self):
+        return self.has_role(UserRoles.PRINCIPAL)
+    
+    @property
+    def is_hod(self):
+        return self.has_role(UserRoles.HOD)
+    
+    @property
+    def is_faculty(self):
+        return self.has_role(UserRoles.FACULTY)
+    
+    @property
+    def is_student(self):
+        return self.has_role(UserRoles.STUDENT)
+
+
+class IdentityService:
+    """Loads users together with their identity context."""
+    
+    @staticmethod
+    def load_user(user_id):
+        """
+        Return the active user for an id, or None.
+        
+        Served from the shared IdentityCache when possible, in which case no
+        query runs at all. On a miss the user, their roles and their own
+        faculty row are loaded in a single query and the record is cached.
+        Inactive users are never returned, so deactivation takes effect on
+        the next request once the record is invalidated.
+        """
+        user_id = int(user_id)
+        
+        record = IdentityCache.get(user_id)
+        if record is not None:
+            return CachedUser(record) if record['is_active'] else None
+        
+        user = IdentityService._load_from_db(user_id)
+        if user is None:
+            return None
+        
+        IdentityCache.set(IdentityService._record(user))
+        return user if user.is_active else None
+    
+    @staticmethod
+    def invalidate(*user_ids):
+        """Forget cached identities after their users, roles or status changed."""
+        IdentityCache.invalidate(*user_ids)
+    
+    @staticmethod
+    def _sign_out():
+        """End the request of a user who no longer exists."""
+        if not has_request_context():
+            raise LookupError('User no longer exists')
+        logout_user()
+        if request.path.startswith('/api/'):
+            abort(401)
+        abort(current_app.login_manager.unauthorized())
+    
+    @staticmethod
+    def _load_from_db(user_id):
+        """Load a user, their roles and their own faculty row in a single query."""
+        rows = db.session.query(User, Faculty.faculty_id, Faculty.department_id, Attachment.file_path) \
+                         .outerjoin(User.roles) \
+                         .outerjoin(Faculty, Faculty.user_id == User.user_id) \
+                         .outerjoin(Attachment, Attachment.attachment_id == Faculty.photo_attachment_id) \
+                         .options(contains_eager(User.roles)) \
+                         .filter(User.user_id == user_id) \
+                         .populate_existing() \
+                         .all()
+        
+        if not rows:
+            return None
+        
+        user, faculty_id, department_id, photo_path = rows[0]
+        user.identity = IdentityContext(
+            user.user_id,
+            (role.name for role in user.roles),
+            faculty_id=faculty_id,
+            department_id=department_id,
+            photo_path=photo_path
+        )
+        return user
+    
+    @staticmethod
+    def _record(user):
+        identity = user.identity
+        return {
+            'user_id': user.user_id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_active': bool(user.is_active),
+            'roles': sorted(identity.role_names),
+            'faculty_id': identity.faculty_id,
+            'department_id': identity.department_id,
+            'photo_path': identity.photo_path
+        }
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.base import db
+from models.faculty import LookupTable
+
+
+LookupEntry = namedtuple('LookupEntry', ['lookup_id', 'lookup_type', 'lookup_value'])
+
+
+class LookupRegistry:
+    """
+    In-process, read-only copy of the lookup_tables rows.
+    
+    Loaded with one query (at startup and again after any commit that touches
+    LookupTable) into immutable mappings keyed by lookup_id and lookup_type,
+    so dropdowns and list labels never query the database.
+    """
+    
+    _by_id = None
+    _by_type = None
+    _fingerprint = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def warm():
+        """(Re)load every lookup row and return the new (by_id, by_type) mappings."""
+        rows = db.session.query(LookupTable.lookup_id, LookupTable.lookup_type, LookupTable.lookup_value) \
+                         .order_by(LookupTable.lookup_id).all()
+        
+        by_id = {}
+        by_type = {}
+        for row in rows:
+            entry = LookupEntry(*row)
+            by_id[entry.lookup_id] = entry
+            by_type.setdefault(entry.lookup_type, []).append(entry)
+        
+        by_id = MappingProxyType(by_id)
+        by_type = MappingProxyType({key: tuple(value) for key, value in by_type.items()})
+        fingerprint = hashlib.sha1(repr([tuple(row) for row in rows]).encode('utf-8')).hexdigest()
+        
+        with LookupRegistry._lock:
+            LookupRegistry._by_id = by_id
+            LookupRegistry._by_type = by_type
+            LookupRegistry._fingerprint = fingerprint
+        
+        return by_id, by_type
+    
+    @staticmethod
+    def invalidate():
+        """Drop the loaded rows; the next read reloads them."""
+        with LookupRegistry._lock:
+            LookupRegistry._by_id = None
+            LookupRegistry._by_type = None
+            LookupRegistry._fingerprint = None
+    
+    @staticmethod
+    def _maps():
+        by_id, by_type = LookupRegistry._by_id, LookupRegistry._by_type
+        if by_id is None or by_type is None:
+            by_id, by_type = LookupRegistry.warm()
+        return by_id, by_type
+    
+    @staticmethod
+    def fingerprint():
+        """
+        Digest of the loaded rows, for validators of responses that show labels.
+        
+        It depends only on the rows, so every worker holding the same lookup
+        data reports the same value.
+        """
+        fingerprint = LookupRegistry._fingerprint
+        if fingerprint is None:
+            LookupRegistry.warm()
+            fingerprint = LookupRegistry._fingerprint
+        return fingerprint
+    
+    @staticmethod
+    def get(lookup_id):
+        """Return the LookupEntry for an id, or None."""
+        if lookup_id is None:
+            return None
+        return LookupRegistry._maps()[0].get(int(lookup_id))
+    
+    @staticmethod
+    def label(lookup_id, default='N/A'):
+        """Return the display value for a lookup id."""
+        entry = LookupRegistry.get(lookup_id)
+        return entry.lookup_value if entry else default
+    
+    @staticmethod
+    def options(lookup_type, values=None):
+        """
+        Return the entries of one lookup type in id order.
+        
+        If `values` is given, only entries whose value is in it are returned.
+        """
+        entries = LookupRegistry._maps()[1].get(lookup_type, ())
+        if values is None:
+            return entries
+        allowed = set(values)
+        return tuple(entry for entry in entries if entry.lookup_value in allowed)
+
+
+@event.listens_for(Session, 'after_flush')
+def _flag_lookup_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, LookupTable):
+            session.info['lookup_registry_stale'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_lookup_registry(session):
+    if session.info.pop('lookup_registry_stale', False):
+        LookupRegistry.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_lookup_changes(session):
+    session.info.pop('lookup_registry_stale', None)
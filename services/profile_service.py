@@ -0,0 +1,209 @@
+from datetime import datetime
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from models.base import db
+from models.attachment import Attachment
+from models.department import Department
+from models.faculty import (
+    Faculty, FacultyAdditionalDetails, WorkExperience, TeachingActivity, ResearchPublication,
+    WorkshopSeminar, MDPFDP, HonoursAward, ResearchConsultancy, Activity
+)
+
+
+class ProfileService:
+    """Loads a faculty profile together with its related sections."""
+    
+    # Collection relationship on Faculty -> many-to-one relationships on each row
+    # (attachments) that the templates dereference. Lookup labels come from
+    # the LookupRegistry instead of a join.
+    SECTIONS = {
+        'work_experiences': (Faculty.work_experiences, [WorkExperience.service_certificate]),
+        'teaching_activities': (Faculty.teaching_activities, [TeachingActivity.attachment]),
+        'research_publications': (Faculty.research_publications, [ResearchPublication.attachment]),
+        'workshops_seminars': (Faculty.workshops_seminars, [WorkshopSeminar.attachment]),
+        'mdp_fdp': (Faculty.mdp_fdp, [MDPFDP.attachment]),
+        'honours_awards': (Faculty.honours_awards, [HonoursAward.attachment]),
+        'research_consultancy': (Faculty.research_consultancy, [ResearchConsultancy.attachment]),
+        'activities': (Faculty.activities, [Activity.attachment])
+    }
+    
+    # Profile field -> (Faculty columns it reads, (many-to-one relationship, its columns) or None)
+    FIELDS = {
+        'faculty_id': ((Faculty.faculty_id,), None),
+        'regdno': ((Faculty.regdno,), None),
+        'name': ((Faculty.first_name, Faculty.last_name), None),
+        'gender': ((Faculty.gender,), None),
+        'dob': ((Faculty.dob,), None),
+        'contact_no': ((Faculty.contact_no,), None),
+        'email': ((Faculty.email,), None),
+        'address': ((Faculty.address,), None),
+        'join_date': ((Faculty.join_date,), None),
+        'is_active': ((Faculty.is_active,), None),
+        'edit_enabled': ((Faculty.edit_enabled,), None),
+        'profile_status': ((Faculty.profile_status,), None),
+        'department': ((Faculty.department_id,), (Faculty.department, (Department.department_name,))),
+        'photo_url': ((Faculty.photo_attachment_id,), (Faculty.photo_attachment, (Attachment.file_path,)))
+    }
+    
+    # Related sections that can be requested alongside the fields
+    INCLUDES = ('additional_details',) + tuple(SECTIONS)
+    
+    # Row class behind each include, for validators()
+    INCLUDE_MODELS = dict(
+        [('additional_details', FacultyAdditionalDetails)] +
+        [(name, relationship.property.mapper.class_) for name, (relationship, _) in SECTIONS.items()]
+    )
+    
+    @staticmethod
+    def sparse_options(fields, include=()):
+        """
+        Build loader options for a partial profile.
+        
+        Only the Faculty columns behind `fields` are selected, the department
+        and photo are joined only when their fields are asked for, and
+        `include` chooses additional_details and activity sections. The
+        profile itself is one query; each included activity section adds one.
+        """
+        columns = [Faculty.faculty_id]
+        options = []
+        
+        for name in fields:
+            field_columns, related = ProfileService.FIELDS[name]
+            columns.extend(field_columns)
+            if related:
+                relationship, related_columns = related
+                options.append(joinedload(relationship).load_only(*related_columns))
+        
+        if 'additional_details' in include:
+            options.append(joinedload(Faculty.additional_details))
+        
+        for name in include:
+            if name in ProfileService.SECTIONS:
+                relationship, children = ProfileService.SECTIONS[name]
+                options.append(selectinload(relationship).options(*[joinedload(child) for child in children]))
+        
+        return [load_only(*columns)] + options
+    
+    @staticmethod
+    def profile_options(sections=None):
+        """
+        Build the loader options for a profile graph.
+        
+        The faculty row, its department, attachments and additional details are
+        joined into the main query; every requested section is fetched with one
+        extra SELECT ... IN query that also joins its attachment rows.
+        A full profile therefore costs 1 + len(sections) queries no matter how
+        many rows each section holds.
+        """
+        if sections is None:
+            sections = ProfileService.SECTIONS.keys()
+        
+        options = [
+            joinedload(Faculty.department),
+            joinedload(Faculty.photo_attachment),
+            joinedload(Faculty.aadhar_attachment),
+            joinedload(Faculty.pan_attachment),
+            joinedload(Faculty.additional_details)
+        ]
+        
+        for name in sections:
+            relationship, children = ProfileService.SECTIONS[name]
+            options.append(selectinload(relationship).options(*[joinedload(child) for child in children]))
+        
+        return options
+    
+    @staticmethod
+    def load_profile(faculty_id=None, user_id=None, sections=None, fields=None):
+        """
+        Load a faculty profile by faculty_id or user_id.
+        
+        `sections` limits which activity collections are eager loaded; pass an
+        empty tuple to load only the profile, department and additional details.
+        With `fields`, only those profile fields are loaded (see sparse_options)
+        and `sections` may also name 'additional_details'.
+        Returns None if no matching profile exists.
+        """
+        if fields is None:
+            options = ProfileService.profile_options(sections)
+        else:
+            options = ProfileService.sparse_options(fields, sections or ())
+        query = Faculty.query.options(*options)
+        
+        if faculty_id is not None:
+            query = query.filter(Faculty.faculty_id == faculty_id)
+        elif user_id is not None:
+            query = query.filter(Faculty.user_id == user_id)
+        else:
+            return None
+        
+        return query.first()
+    
+    @staticmethod
+    def validators(faculty_id, fields=(), include=()):
+        """
+        Return (state, last_modified) for a profile representation.
+        
+        One query reads the faculty row's updated_at, that of the department
+        and photo when those fields are requested, and max(updated_at) and
+        count(*) of every included section, each an index lookup on
+        faculty_id. `state` changes whenever a row behind the representation
+        is added, changed or removed; `last_modified` is the newest of the
+        timestamps. Returns None if the faculty does not exist.
+        """
+        columns = [Faculty.updated_at]
+        query = select(Faculty.faculty_id).where(Faculty.faculty_id == faculty_id)
+        
+        if 'department' in fields:
+            columns.append(Department.updated_at)
+            query = query.outerjoin(Department, Department.department_id == Faculty.department_id)
+        if 'photo_url' in fields:
+            columns.append(Attachment.updated_at)
+            query = query.outerjoin(Attachment, Attachment.attachment_id == Faculty.photo_attachment_id)
+        
+        for name in include:
+            model = ProfileService.INCLUDE_MODELS[name]
+            owned = model.faculty_id == Faculty.faculty_id
+            columns.append(select(func.max(model.updated_at)).where(owned).scalar_subquery())
+            columns.append(select(func.count()).select_from(model).where(owned).scalar_subquery())
+        
+        row = db.session.execute(query.add_columns(*columns)).first()
+        if row is None:
+            return None
+        
+        state = tuple(row)
+        last_modified = max((value for value in state if isinstance(value, datetime)), default=None)
+        return state, last_modified
+
+
+# Rows whose removal changes a profile representation
+PROFILE_ROW_MODELS = tuple(ProfileService.INCLUDE_MODELS.values())
+
+
+@event.listens_for(Session, 'after_flush')
+def _touch_faculty_on_removal(session, flush_context):
+    """
+    Bump the owner's updated_at when a section row is deleted or moved away.
+    
+    A removed row leaves no timestamp behind, so without this Last-Modified
+    would not advance and If-Modified-Since could answer 304 for a stale copy.
+    """
+    owners = set()
+    removed = set()
+    
+    for obj in session.deleted:
+        if isinstance(obj, Faculty):
+            removed.add(obj.faculty_id)
+        elif isinstance(obj, PROFILE_ROW_MODELS):
+            owners.add(obj.faculty_id)
+    
+    for obj in session.dirty:
+        if isinstance(obj, PROFILE_ROW_MODELS):
+            owners.update(inspect(obj).attrs.faculty_id.history.deleted)
+    
+    owners.discard(None)
+    owners -= removed
+    if owners:
+        table = Faculty.__table__
+        session.connection().execute(
+            table.update().where(table.c.faculty_id.in_(owners)).values(updated_at=datetime.utcnow())
+        )
@@ -0,0 +1,111 @@
+from sqlalchemy import update
+from sqlalchemy.orm import load_only
+from models.base import db
+from models.faculty import Faculty
+from config.constants import ProfileStatus
+from services.directory_service import DirectoryService
+from services.stats_service import StatsService
+from mailservice.email_service import profile_status_messages, send_emails
+
+
+# Largest selection one bulk request may change
+BULK_MAX_IDS = 500
+
+# Action -> (new profile status, new edit_enabled or None to leave it)
+BULK_ACTIONS = {
+    'approve': (ProfileStatus.APPROVED, None),
+    'freeze': (ProfileStatus.FROZEN, False),
+    'unfreeze': (ProfileStatus.UNFROZEN, True)
+}
+
+
+class ProfileStatusService:
+    """Set-based approve, freeze and unfreeze of many faculty profiles."""
+    
+    @staticmethod
+    def parse_ids(values):
+        """
+        Read faculty ids from a list of ids or comma-separated strings.
+        
+        Returns the distinct ids in the order given. Raises ValueError if
+        an id is not a number, none are given or there are more than
+        BULK_MAX_IDS.
+        """
+        if isinstance(values, (str, int)):
+            values = [values]
+        
+        ids = []
+        for value in values or ():
+            for item in str(value).split(','):
+                item = item.strip()
+                if not item:
+                    continue
+                try:
+                    faculty_id = int(item)
+                except ValueError:
+                    raise ValueError(f'Invalid faculty id: {item}')
+                if faculty_id not in ids:
+                    ids.append(faculty_id)
+        
+        if not ids:
+            raise ValueError('No faculty selected')
+        if len(ids) > BULK_MAX_IDS:
+            raise ValueError(f'At most {BULK_MAX_IDS} profiles can be changed at once')
+        return ids
+    
+    @staticmethod
+    def apply(action, faculty_ids, identity):
+        """
+        Apply a bulk action to `faculty_ids` on behalf of `identity`.
+        
+        One query loads the selected rows and checks them against the
+        caller's department scope. If any id is missing or out of scope
+        nothing changes; otherwise a single UPDATE ... WHERE faculty_id IN
+        (...) moves every profile not already in the target status, the
+        directory facets follow in the same transaction, and one batch of
+        notification emails is queued after the commit.
+        
+        Returns a dict with 'updated', 'unchanged', 'missing' and
+        'forbidden' id lists.
+        """
+        status, edit_enabled = BULK_ACTIONS[action]
+        
+        rows = Faculty.query.options(load_only(
+            Faculty.faculty_id, Faculty.department_id, Faculty.profile_status,
+            Faculty.first_name, Faculty.last_name, Faculty.email
+        )).filter(Faculty.faculty_id.in_(faculty_ids)).all()
+        found = {row.faculty_id: row for row in rows}
+        
+        result = {
+            'updated': [],
+            'unchanged': [],
+            'missing': [faculty_id for faculty_id in faculty_ids if faculty_id not in found],
+            'forbidden': [row.faculty_id for row in rows if not identity.can_manage_department(row.department_id)]
+        }
+        if result['missing'] or result['forbidden']:
+            return result
+        
+        for faculty_id in faculty_ids:
+            if found[faculty_id].profile_status == status:
+                result['unchanged'].append(faculty_id)
+            else:
+                result['updated'].append(faculty_id)
+        if not result['updated']:
+            return result
+        
+        values = {'profile_status': status}
+        if edit_enabled is not None:
+            values['edit_enabled'] = edit_enabled
+        
+        # Rendered while the rows are loaded; the commit expires them
+        messages = profile_status_messages(map(found.get, result['updated']), status)
+        
+        # Bulk UPDATEs bypass the flush hooks, so refresh the facet rows here
+        db.session.execute(update(Faculty).where(Faculty.faculty_id.in_(result['updated'])).values(**values))
+        DirectoryService.refresh(result['updated'], connection=db.session.connection())
+        db.session.commit()
+        
+        StatsService.invalidate()
+        send_emails(messages)
+        
+        return result
@@ -0,0 +1,154 @@
+from sqlalchemy import func, select
+from models.base import db
+from models.faculty import Faculty, FacultyAdditionalDetails, Activity
+from models.attachment import Attachment
+from models.department import Department
+from models.user import Role, UserRole
+from models.activity_counter import COUNTED_MODELS as ACTIVITY_MODELS
+from config.constants import UserRoles, ProfileStatus
+from services.stats_service import StatsService
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}" if last_name else first_name
+
+
+class ReportService:
+    """Set-based reports over faculty activity tables."""
+    
+    @staticmethod
+    def faculty_activity_rows(department_id):
+        """
+        Return one row per faculty member in a department with activity counts.
+        
+        Every activity table is aggregated with a GROUP BY faculty_id subquery
+        restricted to the department's faculty, and all subqueries are outer
+        joined onto the faculty list, so the whole breakdown is a single query.
+        """
+        department_faculty = select(Faculty.faculty_id).where(Faculty.department_id == department_id)
+        
+        count_columns = []
+        query = db.session.query(
+            Faculty.faculty_id,
+            Faculty.first_name,
+            Faculty.last_name,
+            Faculty.join_date,
+            Faculty.profile_status,
+            FacultyAdditionalDetails.position
+        ).outerjoin(FacultyAdditionalDetails, FacultyAdditionalDetails.faculty_id == Faculty.faculty_id)
+        
+        for name, model in ACTIVITY_MODELS.items():
+            counts = select(model.faculty_id, func.count().label('total')) \
+                .where(model.faculty_id.in_(department_faculty)) \
+                .group_by(model.faculty_id) \
+                .subquery(f'{name}_counts')
+            query = query.outerjoin(counts, counts.c.faculty_id == Faculty.faculty_id)
+            count_columns.append(func.coalesce(counts.c.total, 0).label(name))
+        
+        query = query.add_columns(*count_columns) \
+                     .filter(Faculty.department_id == department_id) \
+                     .order_by(Faculty.first_name, Faculty.last_name)
+        
+        rows = []
+        for row in query.all():
+            rows.append({
+                'faculty_id': row.faculty_id,
+                'full_name': _full_name(row.first_name, row.last_name),
+                'position': row.position,
+                'join_date': row.join_date,
+                'profile_status': row.profile_status,
+                **{name: getattr(row, name) for name in ACTIVITY_MODELS}
+            })
+        
+        return rows
+    
+    @staticmethod
+    def department_report(department):
+        """
+        Build the department report: per-faculty rows plus totals and averages.
+        
+        Returns (report, rows) where report holds `faculty_count`,
+        `total_<metric>` and `avg_<metric>` for every metric in ACTIVITY_MODELS.
+        """
+        rows = ReportService.faculty_activity_rows(department.department_id)
+        num_faculty = len(rows)
+        
+        report = {
+            'department': department,
+            'faculty_count': num_faculty
+        }
+        
+        for name in ACTIVITY_MODELS:
+            total = sum(row[name] for row in rows)
+            report[f'total_{name}'] = total
+            report[f'avg_{name}'] = total / num_faculty if num_faculty > 0 else 0
+        
+        return report, rows
+    
+    @staticmethod
+    def institution_report(recent_limit=10):
+        """
+        Build the fully materialized view model for the admin faculty report.
+        
+        Returns a dict with `status_counts`, `department_stats` (one row per
+        department with status counts and its HOD) and `recent_activities`.
+        Every value is a plain dict or scalar, so the template cannot trigger
+        lazy loads. The report costs three queries plus the StatsService
+        snapshot, independent of the number of departments or faculty.
+        """
+        # Query 1: departments
+        departments = db.session.query(Department.department_id, Department.department_name) \
+                                .order_by(Department.department_name).all()
+        
+        # Query 2: HODs with their photo, one per department
+        hod_rows = db.session.query(
+            Faculty.department_id, Faculty.first_name, Faculty.last_name, Attachment.file_path
+        ).join(UserRole, UserRole.user_id == Faculty.user_id) \
+         .join(Role, Role.role_id == UserRole.role_id) \
+         .outerjoin(Attachment, Attachment.attachment_id == Faculty.photo_attachment_id) \
+         .filter(Role.name == UserRoles.HOD) \
+         .order_by(Faculty.faculty_id).all()
+        
+        hods = {}
+        for department_id, first_name, last_name, photo_path in hod_rows:
+            hods.setdefault(department_id, {
+                'full_name': _full_name(first_name, last_name),
+                'photo_path': photo_path
+            })
+        
+        department_stats = []
+        for department_id, department_name in departments:
+            counts = StatsService.status_counts(department_id)
+            department_stats.append({
+                'department_id': department_id,
+                'department_name': department_name,
+                'faculty_count': counts['total'],
+                'pending_count': counts[ProfileStatus.PENDING],
+                'frozen_count': counts[ProfileStatus.FROZEN],
+                'hod': hods.get(department_id)
+            })
+        
+        # Query 3: recent activities with faculty, department and photo
+        activity_rows = db.session.query(
+            Activity.activity_title, Activity.type, Activity.date,
+            Faculty.first_name, Faculty.last_name, Department.department_name, Attachment.file_path
+        ).join(Faculty, Faculty.faculty_id == Activity.faculty_id) \
+         .outerjoin(Department, Department.department_id == Faculty.department_id) \
+         .outerjoin(Attachment, Attachment.attachment_id == Faculty.photo_attachment_id) \
+         .order_by(Activity.created_at.desc()) \
+         .limit(recent_limit).all()
+        
+        recent_activities = [{
+            'activity_title': row.activity_title,
+            'type': row.type,
+            'date': row.date,
+            'faculty_name': _full_name(row.first_name, row.last_name),
+            'department_name': row.department_name,
+            'photo_path': row.file_path
+        } for row in activity_rows]
+        
+        return {
+            'status_counts': StatsService.status_counts(),
+            'department_stats': department_stats,
+            'recent_activities': recent_activities
+        }
@@ -0,0 +1,208 @@
+from sqlalchemy import and_, case, distinct, false, func, inspect, literal, or_, select, union_all
+from models.base import db
+from models.faculty import Faculty, ResearchPublication, ResearchConsultancy, WorkshopSeminar
+from models.department import Department
+from models.search_index import SearchTerm, INDEXED_MODELS, document_postings, tokenize
+
+
+SEARCH_RESULT_LIMIT = 20
+SEARCH_MAX_RESULT_LIMIT = 50
+
+# Longer queries are truncated; shorter terms only match exactly, since a
+# one-letter prefix would expand to a large part of the vocabulary
+MAX_QUERY_TERMS = 6
+MIN_PREFIX_LENGTH = 2
+
+# Exact term matches count double compared to prefix matches
+EXACT_MATCH_BOOST = 2
+
+REBUILD_BATCH_SIZE = 1000
+
+# Document type -> (title column, detail column) shown for each hit
+RESULT_COLUMNS = {
+    'publication': (ResearchPublication.title, ResearchPublication.journal_name),
+    'project': (ResearchConsultancy.project_title, ResearchConsultancy.status),
+    'workshop': (WorkshopSeminar.title, WorkshopSeminar.organized_by)
+}
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}" if last_name else first_name
+
+
+class SearchService:
+    """Ranked, prefix-matching search over the search_terms inverted index."""
+    
+    @staticmethod
+    def parse_query(text):
+        """Return the distinct terms of a query string, in order, capped at MAX_QUERY_TERMS."""
+        terms = []
+        for term in tokenize(text):
+            if term not in terms:
+                terms.append(term)
+        return terms[:MAX_QUERY_TERMS]
+    
+    @staticmethod
+    def _scope(identity):
+        """
+        Return the filter limiting postings to documents the user may see, or None for all.
+        
+        Mirrors who may open a profile: admins and principals see everything,
+        HODs their department, and everyone else only their own documents.
+        """
+        if identity.is_institution_wide:
+            return None
+        
+        table = SearchTerm.__table__
+        conditions = []
+        if identity.faculty_id is not None:
+            conditions.append(table.c.faculty_id == identity.faculty_id)
+        if identity.hod_department_id is not None:
+            conditions.append(table.c.faculty_id.in_(
+                select(Faculty.faculty_id).where(Faculty.department_id == identity.hod_department_id)
+            ))
+        
+        if not conditions:
+            return false()
+        return conditions[0] if len(conditions) == 1 else or_(*conditions)
+    
+    @staticmethod
+    def _ranked_matches(terms, scope, doc_types, limit):
+        table = SearchTerm.__table__
+        branches = []
+        
+        # One branch per query term; a document must match every term
+        for position, term in enumerate(terms):
+            if len(term) >= MIN_PREFIX_LENGTH:
+                # Terms are [a-z0-9], all of which sort below '{'
+                match = and_(table.c.term >= term, table.c.term < term + '{')
+            else:
+                match = table.c.term == term
+            
+            branch = select(
+                table.c.doc_type, table.c.doc_id,
+                literal(position).label('position'),
+                case((table.c.term == term, table.c.weight * EXACT_MATCH_BOOST), else_=table.c.weight).label('score')
+            ).where(match)
+            
+            if scope is not None:
+                branch = branch.where(scope)
+            if doc_types:
+                branch = branch.where(table.c.doc_type.in_(doc_types))
+            branches.append(branch)
+        
+        matches = union_all(*branches).subquery('matches')
+        score = func.sum(matches.c.score).label('score')
+        ranked = select(matches.c.doc_type, matches.c.doc_id, score) \
+            .group_by(matches.c.doc_type, matches.c.doc_id) \
+            .having(func.count(distinct(matches.c.position)) == len(terms)) \
+            .order_by(score.desc(), matches.c.doc_type, matches.c.doc_id.desc()) \
+            .limit(limit)
+        
+        return db.session.execute(ranked).all()
+    
+    @staticmethod
+    def _hydrate(doc_type, doc_ids):
+        """Return {doc_id: result dict} for the given documents of one type."""
+        if doc_type == 'faculty':
+            rows = db.session.query(
+                Faculty.faculty_id, Faculty.first_name, Faculty.last_name,
+                Faculty.regdno, Department.department_name
+            ).outerjoin(Department, Department.department_id == Faculty.department_id) \
+             .filter(Faculty.faculty_id.in_(doc_ids)).all()
+            return {row.faculty_id: {
+                'title': _full_name(row.first_name, row.last_name),
+                'detail': row.regdno,
+                'faculty_id': row.faculty_id,
+                'faculty_name': _full_name(row.first_name, row.last_name),
+                'department': row.department_name
+            } for row in rows}
+        
+        model = INDEXED_MODELS[doc_type][0]
+        key = inspect(model).primary_key[0]
+        title, detail = RESULT_COLUMNS[doc_type]
+        rows = db.session.query(
+            key.label('doc_id'), title.label('title'), detail.label('detail'),
+            Faculty.faculty_id, Faculty.first_name, Faculty.last_name, Department.department_name
+        ).join(Faculty, Faculty.faculty_id == model.faculty_id) \
+         .outerjoin(Department, Department.department_id == Faculty.department_id) \
+         .filter(key.in_(doc_ids)).all()
+        return {row.doc_id: {
+            'title': row.title,
+            'detail': row.detail,
+            'faculty_id': row.faculty_id,
+            'faculty_name': _full_name(row.first_name, row.last_name),
+            'department': row.department_name
+        } for row in rows}
+    
+    @staticmethod
+    def search(identity, text, doc_types=None, limit=SEARCH_RESULT_LIMIT):
+        """
+        Return the best matching documents the user may see, best first.
+        
+        Every query term must match a document, either exactly or as a prefix
+        of an indexed term. Documents are scored by the summed field weights
+        of their matching terms, with exact matches boosted. Costs one ranking
+        query plus one query per document type among the hits.
+        """
+        terms = SearchService.parse_query(text)
+        if not terms:
+            return []
+        
+        matches = SearchService._ranked_matches(terms, SearchService._scope(identity), doc_types, limit)
+        
+        ids_by_type = {}
+        for match in matches:
+            ids_by_type.setdefault(match.doc_type, []).append(match.doc_id)
+        documents = {doc_type: SearchService._hydrate(doc_type, doc_ids)
+                     for doc_type, doc_ids in ids_by_type.items()}
+        
+        results = []
+        for match in matches:
+            document = documents[match.doc_type].get(match.doc_id)
+            if document is not None:
+                results.append(dict(document, type=match.doc_type, id=match.doc_id, score=int(match.score)))
+        return results
+    
+    @staticmethod
+    def rebuild(connection=None):
+        """
+        Rebuild the whole inverted index from the indexed tables.
+        
+        Documents are read in primary key batches and their postings bulk inserted.
+        Returns the number of documents indexed.
+        """
+        if connection is None:
+            connection = db.session.connection()
+        
+        table = SearchTerm.__table__
+        connection.execute(table.delete())
+        
+        documents = 0
+        for doc_type, (model, weights) in INDEXED_MODELS.items():
+            key = inspect(model).primary_key[0]
+            columns = [key.label('doc_id'), model.faculty_id.label('owner_id')] + \
+                      [getattr(model, attribute) for attribute in weights]
+            
+            # Walk the table in primary key order, one batch of documents at a time
+            last_id = 0
+            while True:
+                rows = connection.execute(
+                    select(*columns).where(key > last_id).order_by(key).limit(REBUILD_BATCH_SIZE)
+                ).all()
+                if not rows:
+                    break
+                
+                postings = [
+                    {'term': term, 'doc_type': doc_type, 'doc_id': row.doc_id,
+                     'faculty_id': row.owner_id, 'weight': weight}
+                    for row in rows
+                    for term, weight in document_postings(doc_type, row._mapping).items()
+                ]
+                if postings:
+                    connection.execute(table.insert(), postings)
+                
+                documents += len(rows)
+                last_id = rows[-1].doc_id
+        
+        return documents
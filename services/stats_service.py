@@ -0,0 +1,164 @@
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from models.base import db
+from models.faculty import Faculty
+from models.department import Department
+from models.user import Role, User, UserRole
+from config.constants import UserRoles, ProfileStatus
+
+
+PROFILE_STATUSES = (ProfileStatus.PENDING, ProfileStatus.APPROVED,
+                    ProfileStatus.FROZEN, ProfileStatus.UNFROZEN)
+
+
+def _empty_status_counts():
+    counts = {status: 0 for status in PROFILE_STATUSES}
+    counts['total'] = 0
+    return counts
+
+
+class StatsService:
+    """
+    Dashboard statistics computed with grouped aggregates and cached briefly.
+    
+    Commits that add or remove faculty, departments or role assignments, or
+    that move a faculty member to another status or department, drop the
+    snapshot through the session hooks below. Bulk UPDATEs bypass them and
+    call invalidate() themselves.
+    """
+    
+    _cache = {}
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def snapshot():
+        """
+        Return the institution-wide statistics snapshot.
+        
+        The snapshot is built from two grouped queries (faculty by department and
+        status, users by role) and shared by every dashboard widget until
+        STATS_CACHE_TTL seconds have passed.
+        """
+        ttl = current_app.config.get('STATS_CACHE_TTL', 60)
+        now = time.monotonic()
+        
+        with StatsService._lock:
+            entry = StatsService._cache.get('snapshot')
+            if entry and now - entry[0] < ttl:
+                return entry[1]
+        
+        snapshot = StatsService._compute_snapshot()
+        
+        with StatsService._lock:
+            StatsService._cache['snapshot'] = (now, snapshot)
+        
+        return snapshot
+    
+    @staticmethod
+    def invalidate():
+        """Drop the cached snapshot so the next read recomputes it."""
+        with StatsService._lock:
+            StatsService._cache.clear()
+    
+    @staticmethod
+    def status_counts(department_id=None):
+        """Faculty counts by profile status, for one department or all of them."""
+        snapshot = StatsService.snapshot()
+        if department_id is None:
+            return dict(snapshot['status_counts'])
+        return dict(snapshot['department_counts'].get(int(department_id), _empty_status_counts()))
+    
+    @staticmethod
+    def department_faculty_count(department_id):
+        """Number of faculty in a department."""
+        return StatsService.status_counts(department_id)['total']
+    
+    @staticmethod
+    def role_distribution():
+        """Number of users holding each dashboard role."""
+        return dict(StatsService.snapshot()['role_distribution'])
+    
+    @staticmethod
+    def department_count():
+        """Number of departments."""
+        return StatsService.snapshot()['department_count']
+    
+    @staticmethod
+    def _compute_snapshot():
+        status_counts = _empty_status_counts()
+        department_counts = {}
+        
+        # Query 1: faculty histogram by department and status
+        rows = db.session.query(
+            Faculty.department_id, Faculty.profile_status, func.count(Faculty.faculty_id)
+        ).group_by(Faculty.department_id, Faculty.profile_status).all()
+        
+        for department_id, status, count in rows:
+            status_counts['total'] += count
+            if status in status_counts:
+                status_counts[status] += count
+            
+            if department_id is not None:
+                dept_counts = department_counts.setdefault(department_id, _empty_status_counts())
+                dept_counts['total'] += count
+                if status in dept_counts:
+                    dept_counts[status] += count
+        
+        # Query 2: users per role, with the department total as a scalar subquery
+        department_total = select(func.count(Department.department_id)).scalar_subquery()
+        rows = db.session.query(
+            Role.name, func.count(UserRole.user_id), department_total
+        ).outerjoin(UserRole, UserRole.role_id == Role.role_id).group_by(Role.name).all()
+        
+        role_counts = {name: count for name, count, _ in rows}
+        department_count = rows[0][2] if rows else Department.query.count()
+        
+        role_distribution = {
+            'admin': role_counts.get(UserRoles.ADMIN, 0),
+            'principal': role_counts.get(UserRoles.PRINCIPAL, 0),
+            'hod': role_counts.get(UserRoles.HOD, 0),
+            'faculty': role_counts.get(UserRoles.FACULTY, 0)
+        }
+        
+        return {
+            'status_counts': status_counts,
+            'department_counts': department_counts,
+            'role_distribution': role_distribution,
+            'department_count': department_count
+        }
+
+
+# Rows whose insertion or deletion changes a count in the snapshot
+COUNTED_MODELS = (Faculty, Department, User, UserRole)
+
+
+def _changes_snapshot(obj):
+    """True if an updated row moves a count in the snapshot."""
+    state = inspect(obj)
+    if isinstance(obj, Faculty):
+        return state.attrs.profile_status.history.has_changes() or state.attrs.department_id.history.has_changes()
+    if isinstance(obj, User):
+        # Roles appended to User.roles become user_roles rows in the flush
+        return state.attrs.roles.history.has_changes()
+    return False
+
+
+@event.listens_for(Session, 'after_flush')
+def _flag_stats_changes(session, flush_context):
+    if any(isinstance(obj, COUNTED_MODELS) for obj in list(session.new) + list(session.deleted)) or \
+            any(_changes_snapshot(obj) for obj in session.dirty):
+        session.info['stats_snapshot_stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_stats_snapshot(session):
+    if session.info.pop('stats_snapshot_stale', False):
+        StatsService.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stats_changes(session):
+    session.info.pop('stats_snapshot_stale', None)
@@ -0,0 +1,224 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_request_context, request, url_for
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIRECTORY = 'derivatives'
+
+# Derivative paths remembered as rendered, least recently used dropped first
+READY_CACHE_SIZE = 10000
+
+# Seconds before an image that failed to render is tried again
+FAILED_RETRY_AFTER = 300
+FAILED_CACHE_SIZE = 1000
+
+# name: (edge in pixels, crop to a square); sized for 2x displays
+DERIVATIVE_SIZES = {
+    'avatar': (96, True),
+    'thumbnail': (256, False)
+}
+
+# Extension and Pillow save options per output format
+DERIVATIVE_FORMATS = {
+    'webp': ('.webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('.jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True})
+}
+
+
+def _flatten(image):
+    """RGB copy of an image, with any transparency composited onto white."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _write_image(image, full_path, options):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(full_path))
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            image.save(out, **options)
+        os.replace(temp_path, full_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class ThumbnailService:
+    """
+    Small WebP and JPEG renditions of gallery images for avatars and previews.
+    
+    Derivatives are rendered by a thread pool, either right after an upload
+    or the first time a page asks for a file that has none yet; until then
+    the page gets the original. They sit next to the blob tree under
+    derivatives/, named after the source file, so content-addressed sources
+    get immutable derivatives. Rendered paths and failures are remembered
+    in bounded maps; a failure is retried after FAILED_RETRY_AFTER seconds.
+    """
+    
+    _executor = None
+    _lock = threading.Lock()
+    _pending = set()
+    _ready = OrderedDict()
+    _failed = OrderedDict()
+    
+    @staticmethod
+    def _mark_ready(derivative):
+        # Caller holds _lock
+        ThumbnailService._ready[derivative] = True
+        ThumbnailService._ready.move_to_end(derivative)
+        while len(ThumbnailService._ready) > READY_CACHE_SIZE:
+            ThumbnailService._ready.popitem(last=False)
+    
+    @staticmethod
+    def _mark_failed(file_path):
+        # Caller holds _lock
+        ThumbnailService._failed[file_path] = time.monotonic() + FAILED_RETRY_AFTER
+        ThumbnailService._failed.move_to_end(file_path)
+        while len(ThumbnailService._failed) > FAILED_CACHE_SIZE:
+            ThumbnailService._failed.popitem(last=False)
+    
+    @staticmethod
+    def _recently_failed(file_path):
+        # Caller holds _lock
+        retry_at = ThumbnailService._failed.get(file_path)
+        if retry_at is None:
+            return False
+        if time.monotonic() < retry_at:
+            return True
+        del ThumbnailService._failed[file_path]
+        return False
+    
+    @staticmethod
+    def derivative_path(file_path, size, image_format):
+        """Path of a derivative relative to UPLOAD_FOLDER."""
+        stem = os.path.splitext(file_path)[0]
+        if stem.startswith('blobs/'):
+            stem = stem[len('blobs/'):]
+        return f'{DERIVATIVE_DIRECTORY}/{stem}-{size}{DERIVATIVE_FORMATS[image_format][0]}'
+    
+    @staticmethod
+    def source_stem(derivative):
+        """Source file_path without its extension for a derivative path, or None for other paths."""
+        prefix = DERIVATIVE_DIRECTORY + '/'
+        if not derivative.startswith(prefix) or '-' not in derivative:
+            return None
+        stem = derivative[len(prefix):].rsplit('-', 1)[0]
+        return 'blobs/' + stem if '/' in stem else stem
+    
+    @staticmethod
+    def render(source, upload_folder, file_path):
+        """Write every size and format of one image; runs on a pool thread."""
+        try:
+            with Image.open(source) as original:
+                # Let the JPEG decoder downscale while reading
+                largest = max(edge for edge, _ in DERIVATIVE_SIZES.values())
+                original.draft('RGB', (largest * 2, largest * 2))
+                image = ImageOps.exif_transpose(original)
+                
+                for size, (edge, crop) in DERIVATIVE_SIZES.items():
+                    if crop:
+                        resized = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+                    else:
+                        resized = image.copy()
+                        resized.thumbnail((edge, edge), Image.LANCZOS)
+                    
+                    for image_format, (_, options) in DERIVATIVE_FORMATS.items():
+                        derivative = ThumbnailService.derivative_path(file_path, size, image_format)
+                        full_path = os.path.join(upload_folder, *derivative.split('/'))
+                        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                        frame = _flatten(resized) if image_format == 'jpeg' else resized
+                        _write_image(frame, full_path, options)
+                        with ThumbnailService._lock:
+                            ThumbnailService._mark_ready(derivative)
+        except Exception:
+            logger.exception('Could not render derivatives of %s', file_path)
+            with ThumbnailService._lock:
+                ThumbnailService._mark_failed(file_path)
+        finally:
+            with ThumbnailService._lock:
+                ThumbnailService._pending.discard(file_path)
+    
+    @staticmethod
+    def _pool():
+        with ThumbnailService._lock:
+            if ThumbnailService._executor is None:
+                ThumbnailService._executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('THUMBNAIL_WORKERS', 2),
+                    thread_name_prefix='thumbnails'
+                )
+            return ThumbnailService._executor
+    
+    @staticmethod
+    def generate_async(file_path):
+        """Queue the derivatives of an image unless already queued or recently failed."""
+        with ThumbnailService._lock:
+            if file_path in ThumbnailService._pending or ThumbnailService._recently_failed(file_path):
+                return None
+            ThumbnailService._pending.add(file_path)
+        
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        source = os.path.join(upload_folder, *file_path.split('/'))
+        return ThumbnailService._pool().submit(ThumbnailService.render, source, upload_folder, file_path)
+    
+    @staticmethod
+    def _exists(derivative):
+        with ThumbnailService._lock:
+            if derivative in ThumbnailService._ready:
+                ThumbnailService._ready.move_to_end(derivative)
+                return True
+        if os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], *derivative.split('/'))):
+            with ThumbnailService._lock:
+                ThumbnailService._mark_ready(derivative)
+            return True
+        return False
+    
+    @staticmethod
+    def is_rendered(file_path):
+        """True if every size and format of an image exists."""
+        return all(ThumbnailService._exists(ThumbnailService.derivative_path(file_path, size, image_format))
+                   for size in DERIVATIVE_SIZES for image_format in DERIVATIVE_FORMATS)
+    
+    @staticmethod
+    def url(file_path, size='avatar'):
+        """
+        URL of an image's derivative, for templates.
+        
+        WebP is chosen when the page request accepts it, JPEG otherwise.
+        Falls back to the original (and queues the derivatives) while none
+        has been rendered yet.
+        """
+        image_format = 'webp' if has_request_context() and request.accept_mimetypes['image/webp'] else 'jpeg'
+        derivative = ThumbnailService.derivative_path(file_path, size, image_format)
+        
+        if ThumbnailService._exists(derivative):
+            return url_for('static', filename='uploads/' + derivative)
+        
+        ThumbnailService.generate_async(file_path)
+        return url_for('static', filename='uploads/' + file_path)
+    
+    @staticmethod
+    def remove(file_path):
+        """Delete every derivative of an image."""
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        with ThumbnailService._lock:
+            ThumbnailService._failed.pop(file_path, None)
+        for size in DERIVATIVE_SIZES:
+            for image_format in DERIVATIVE_FORMATS:
+                derivative = ThumbnailService.derivative_path(file_path, size, image_format)
+                with ThumbnailService._lock:
+                    ThumbnailService._ready.pop(derivative, None)
+                try:
+                    os.remove(os.path.join(upload_folder, *derivative.split('/')))
+                except FileNotFoundError:
+                    pass
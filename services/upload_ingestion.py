@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from collections import deque
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+from services.attachment_store import BlobWriter
+
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes of every accepted content type
+SIGNATURES = {
+    'pdf': (b'%PDF-',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'jpeg': (b'\xff\xd8\xff',),
+    # Word 97-2003 compound file and Office Open XML zip container
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',)
+}
+SNIFF_LENGTH = max(len(signature) for signatures in SIGNATURES.values() for signature in signatures)
+
+# Content type each allowed extension must contain
+EXTENSION_TYPES = {'pdf': 'pdf', 'png': 'png', 'jpg': 'jpeg', 'jpeg': 'jpeg', 'doc': 'doc', 'docx': 'docx'}
+
+RECENT_UPLOADS = 50
+
+
+def sniff_type(header):
+    """Content type named by a file's leading bytes, or None if unrecognised."""
+    for content_type, signatures in SIGNATURES.items():
+        if header.startswith(signatures):
+            return content_type
+    return None
+
+
+def _size_limit(filename, max_size):
+    return RequestEntityTooLarge(f'{filename} is larger than the {max_size / (1024 * 1024):.3g} MB limit.')
+
+
+def _extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+class UploadStream(BlobWriter):
+    """
+    File part of a multipart request, written straight into the blob tree.
+    
+    Werkzeug's form parser hands over the body in fixed-size chunks as it
+    reads it. Each chunk is hashed and written to disk at once, so a worker
+    never holds more than one chunk of an upload in memory. The first bytes
+    are checked against the extension's signature and the running size
+    against MAX_UPLOAD_SIZE; either failure aborts the request before the
+    rest of the body is read.
+    """
+    
+    def __init__(self, filename, max_size):
+        super().__init__()
+        self.filename = filename
+        self.max_size = max_size
+        self.content_type = None
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self._header = b''
+    
+    def _reject(self, error, reason):
+        self.close()
+        UploadMetrics.reject(reason)
+        raise error
+    
+    def _check_type(self, header):
+        self.content_type = sniff_type(header)
+        if self.content_type is None or self.content_type != EXTENSION_TYPES.get(_extension(self.filename)):
+            self._reject(UnsupportedMediaType(f'{self.filename} is not a valid '
+                                              f'{_extension(self.filename).upper()} file.'), 'content')
+    
+    def write(self, data):
+        if self.size + len(self._header) + len(data) > self.max_size:
+            self._reject(_size_limit(self.filename, self.max_size), 'size')
+        
+        # Hold back the first bytes until the signature can be checked
+        if self.content_type is None:
+            self._header += data
+            if len(self._header) < SNIFF_LENGTH:
+                return len(data)
+            self._check_type(self._header)
+            data, self._header = self._header, b''
+            super().write(data)
+            return len(data)
+        
+        return super().write(data)
+    
+    def seek(self, offset, *args):
+        # The parser rewinds the stream once the part is complete
+        if self.elapsed is None:
+            if self.content_type is None:
+                self._check_type(self._header)
+                super().write(self._header)
+                self._header = b''
+            self.elapsed = time.perf_counter() - self.started
+            UploadMetrics.record(self.metrics())
+        return super().seek(offset, *args)
+    
+    def metrics(self):
+        """Size, duration and throughput of the upload, once fully received."""
+        return {
+            'filename': self.filename,
+            'content_type': self.content_type,
+            'bytes': self.size,
+            'seconds': round(self.elapsed, 6),
+            'bytes_per_second': round(self.size / self.elapsed) if self.elapsed else None
+        }
+
+
+class UploadRequest(Request):
+    """Request class that streams file uploads through UploadStream."""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Empty file inputs still arrive as parts with no filename
+        if not filename:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        
+        if _extension(filename) not in current_app.config['ALLOWED_EXTENSIONS']:
+            UploadMetrics.reject('extension')
+            raise UnsupportedMediaType(f'{filename} is not an allowed file type.')
+        
+        max_size = current_app.config['MAX_UPLOAD_SIZE']
+        if content_length and content_length > max_size:
+            UploadMetrics.reject('size')
+            raise _size_limit(filename, max_size)
+        
+        stream = UploadStream(filename, max_size)
+        self.__dict__.setdefault('_upload_streams', []).append(stream)
+        return stream
+    
+    def close(self):
+        # Also covers parts of a request that was aborted mid-parse
+        for stream in self.__dict__.pop('_upload_streams', ()):
+            stream.close()
+        super().close()
+
+
+class UploadMetrics:
+    """Upload throughput and rejection counts for this worker process."""
+    
+    _lock = threading.Lock()
+    _totals = {'uploads': 0, 'bytes': 0, 'seconds': 0.0}
+    _rejected = {'extension': 0, 'content': 0, 'size': 0}
+    _recent = deque(maxlen=RECENT_UPLOADS)
+    
+    @staticmethod
+    def record(metrics):
+        logger.info('Received %s: %d bytes in %.3fs (%s bytes/s)', metrics['filename'],
+                    metrics['bytes'], metrics['seconds'], metrics['bytes_per_second'])
+        with UploadMetrics._lock:
+            UploadMetrics._totals['uploads'] += 1
+            UploadMetrics._totals['bytes'] += metrics['bytes']
+            UploadMetrics._totals['seconds'] += metrics['seconds']
+            UploadMetrics._recent.append(metrics)
+    
+    @staticmethod
+    def reject(reason):
+        with UploadMetrics._lock:
+            UploadMetrics._rejected[reason] += 1
+    
+    @staticmethod
+    def snapshot():
+        """Totals, rejections and the most recent uploads, newest first."""
+        with UploadMetrics._lock:
+            totals = dict(UploadMetrics._totals)
+            rejected = dict(UploadMetrics._rejected)
+            recent = list(reversed(UploadMetrics._recent))
+        
+        totals['bytes_per_second'] = round(totals['bytes'] / totals['seconds']) if totals['seconds'] else None
+        totals['seconds'] = round(totals['seconds'], 6)
+        return {'totals': totals, 'rejected': rejected, 'recent': recent}
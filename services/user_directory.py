@@ -0,0 +1,79 @@
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
+from models.user import User, Role
+from utils.pagination import clamp_page_size, keyset_page
+
+
+USER_PAGE_SIZE = 50
+USER_MAX_PAGE_SIZE = 200
+
+# Newest accounts first; user_id breaks ties between equal timestamps
+USER_SORT_KEY = (User.created_at, User.user_id)
+
+
+class UserDirectoryService:
+    """Filtered, keyset-paginated listing of user accounts."""
+    
+    @staticmethod
+    def parse_filters(args):
+        """Read the role, active and name-prefix filters from request arguments."""
+        active = args.get('active', '').lower()
+        return {
+            'role': args.get('role') or None,
+            'active': True if active in ('1', 'true', 'yes') else False if active in ('0', 'false', 'no') else None,
+            'prefix': (args.get('q') or '').strip() or None
+        }
+    
+    @staticmethod
+    def filtered_query(role=None, active=None, prefix=None):
+        query = User.query
+        
+        if role:
+            query = query.filter(User.roles.any(Role.name == role))
+        
+        if active is not None:
+            query = query.filter(User.is_active.is_(active))
+        
+        if prefix:
+            query = query.filter(or_(
+                User.username.startswith(prefix, autoescape=True),
+                User.first_name.startswith(prefix, autoescape=True),
+                User.last_name.startswith(prefix, autoescape=True),
+                User.email.startswith(prefix, autoescape=True)
+            ))
+        
+        return query
+    
+    @staticmethod
+    def ordered_query(args):
+        """Every user matching the request filters, newest first, for streamed exports."""
+        filters = UserDirectoryService.parse_filters(args)
+        return UserDirectoryService.filtered_query(**filters) \
+                                   .options(selectinload(User.roles)) \
+                                   .order_by(*[column.desc() for column in USER_SORT_KEY])
+    
+    @staticmethod
+    def page(args):
+        """
+        Return one page of users for the given request arguments.
+        
+        Understands `role`, `active`, `q` (name, username or email prefix),
+        `limit`, and the `after`/`before` cursors from a previous page. Raises
+        ValueError for a malformed cursor.
+        """
+        filters = UserDirectoryService.parse_filters(args)
+        limit = clamp_page_size(args.get('limit'), USER_PAGE_SIZE, USER_MAX_PAGE_SIZE)
+        
+        query = UserDirectoryService.filtered_query(**filters).options(selectinload(User.roles))
+        users, next_cursor, prev_cursor = keyset_page(
+            query, USER_SORT_KEY, limit,
+            after=args.get('after'), before=args.get('before')
+        )
+        
+        return {
+            'users': users,
+            'filters': filters,
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
@@ -0,0 +1,95 @@
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.base import db as _db
+from config.config import TestingConfig
+
+
+def _create_tables(uri):
+    # create_app() seeds roles and lookups, so the schema must exist first
+    import models.user, models.department, models.faculty, models.attachment  # noqa: F401
+    import models.activity_counter, models.search_index, models.directory_facet  # noqa: F401
+    
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    _db.init_app(app)
+    with app.app_context():
+        _db.create_all()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The application on a fresh SQLite database, with the identity, stats and access caches off."""
+    uri = 'sqlite:///' + str(tmp_path / 'test.db')
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', uri)
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_BINDS', {})
+    monkeypatch.setattr(TestingConfig, 'IDENTITY_CACHE_TTL', 0)
+    monkeypatch.setattr(TestingConfig, 'STATS_CACHE_TTL', 0)
+    monkeypatch.setattr(TestingConfig, 'ATTACHMENT_ACCESS_TTL', 0)
+    monkeypatch.setattr(TestingConfig, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    _create_tables(uri)
+    
+    from app import create_app
+    # No app context stays pushed: a request run inside one would reuse its g,
+    # and Flask-Login would keep the previous request's user. Tests push
+    # their own context for setup and leave it before calling the client.
+    return create_app('testing')
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements sent to the database inside the block."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def login(client, user_id):
+    """Sign a test client in as a user through the session cookie."""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+
+
+def create_faculty(db, department, key, role_name='faculty', **columns):
+    """Create a user with one role and their faculty row, in a department or in none."""
+    from models.user import User, Role
+    from models.faculty import Faculty
+    
+    user = User(username=f'user{key}', email=f'user{key}@example.com', first_name='First', last_name=key)
+    # Tests sign in through the session or a token; hashing a password per user is slow
+    user.password_hash = 'unused'
+    user.roles.append(Role.query.filter_by(name=role_name).one())
+    db.session.add(user)
+    db.session.flush()
+    
+    faculty = Faculty(user_id=user.user_id, regdno=f'R{key}', first_name='First', last_name=key,
+                      email=f'faculty{key}@example.com', join_date=date(2020, 1, 1),
+                      department_id=department.department_id if department else None, **columns)
+    db.session.add(faculty)
+    db.session.flush()
+    return faculty
@@ -0,0 +1,49 @@
+"""Activity counters are created with the faculty row and never written on read."""
+from models.activity_counter import FacultyActivityCounter
+from models.department import College, Department
+from models.faculty import Activity, ResearchPublication, LookupTable
+from services.counter_service import CounterService
+from tests.conftest import count_queries, create_faculty
+
+
+def _faculty(db):
+    college = College(college_name='College', college_code='C')
+    department = Department(department_name='Department', department_code='D', college=college)
+    db.session.add(department)
+    db.session.flush()
+    return create_faculty(db, department, 'owner')
+
+
+def test_counter_created_with_faculty(app, db):
+    with app.app_context():
+        faculty = _faculty(db)
+        publication_type = LookupTable.query.filter_by(lookup_type='publication_type').first().lookup_id
+        db.session.add(ResearchPublication(faculty_id=faculty.faculty_id, title='Paper', type_id=publication_type))
+        db.session.commit()
+        
+        counter = db.session.get(FacultyActivityCounter, faculty.faculty_id)
+        assert counter is not None
+        assert counter.publications == 1
+
+
+def test_missing_counter_is_counted_without_writing(app, db):
+    with app.app_context():
+        faculty = _faculty(db)
+        db.session.add_all([Activity(faculty_id=faculty.faculty_id, activity_title=f'Activity {i}')
+                            for i in range(2)])
+        db.session.commit()
+        # A profile from before the counter table existed
+        db.session.query(FacultyActivityCounter).delete()
+        db.session.commit()
+        
+        with count_queries(db.engine) as statements:
+            counts = CounterService.get_counts(faculty.faculty_id)
+        assert counts['activities'] == 2
+        assert counts['publications'] == 0
+        assert all(statement.lstrip().startswith('SELECT') for statement in statements)
+        assert db.session.get(FacultyActivityCounter, faculty.faculty_id) is None
+        
+        # `flask repair-activity-counters` backfills it
+        assert CounterService.rebuild() == 1
+        db.session.commit()
+        assert db.session.get(FacultyActivityCounter, faculty.faculty_id).activities == 2
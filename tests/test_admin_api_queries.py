@@ -0,0 +1,53 @@
+"""Admin API list endpoints cost the same number of queries at any result size."""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models.department import College, Department
+from models.user import User
+from config.constants import ProfileStatus
+from tests.conftest import count_queries, create_faculty
+
+
+def _seed(db, departments, faculty_per_department):
+    """Add a college of departments, each with pending and approved faculty and an HOD."""
+    offset = Department.query.count()
+    college = College(college_name='College', college_code=f'C{offset}')
+    for d in range(offset, offset + departments):
+        department = Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+        db.session.add(department)
+        db.session.flush()
+        create_faculty(db, department, f'{d}_hod', role_name='hod')
+        for i in range(faculty_per_department):
+            status = ProfileStatus.PENDING if i % 2 else ProfileStatus.APPROVED
+            create_faculty(db, department, f'{d}_{i}', profile_status=status)
+    db.session.commit()
+
+
+def _queries(app, db, url):
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').one()
+        token = create_access_token(identity=str(admin.user_id))
+        engine = db.engine
+    
+    with count_queries(engine) as statements:
+        response = app.test_client().get(url, headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('url', [
+    '/api/admin/users',
+    '/api/admin/departments',
+    '/api/admin/pending-approvals',
+    '/api/admin/dashboard-stats'
+])
+def test_admin_list_queries_stay_flat(app, db, url):
+    with app.app_context():
+        _seed(db, departments=1, faculty_per_department=2)
+    small = _queries(app, db, url)
+    
+    # Ten times the departments, faculty, roles and pending profiles
+    with app.app_context():
+        _seed(db, departments=9, faculty_per_department=2)
+        _seed(db, departments=10, faculty_per_department=18)
+    assert _queries(app, db, url) == small
@@ -0,0 +1,51 @@
+"""HODs only ever see their own department's approval queue."""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models.department import College, Department
+from config.constants import ProfileStatus
+from tests.conftest import create_faculty
+
+
+def _seed(db):
+    """Two departments with one pending profile each, an HOD of the first and an HOD with no department."""
+    college = College(college_name='College', college_code='C')
+    departments = [Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                   for d in range(2)]
+    db.session.add_all(departments)
+    db.session.flush()
+    for d, department in enumerate(departments):
+        create_faculty(db, department, f'pending{d}', profile_status=ProfileStatus.PENDING)
+    hod = create_faculty(db, departments[0], 'hod', role_name='hod', profile_status=ProfileStatus.APPROVED)
+    orphan = create_faculty(db, None, 'orphan', role_name='hod', profile_status=ProfileStatus.APPROVED)
+    db.session.commit()
+    return {
+        'hod': create_access_token(identity=str(hod.user_id)),
+        'orphan': create_access_token(identity=str(orphan.user_id))
+    }
+
+
+@pytest.fixture
+def tokens(app, db):
+    with app.app_context():
+        return _seed(db)
+
+
+def _get(client, token, query_string=''):
+    return client.get('/api/admin/pending-approvals' + query_string,
+                      headers={'Authorization': f'Bearer {token}'})
+
+
+def test_hod_sees_own_department_queue(client, tokens):
+    response = _get(client, tokens['hod'])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 1
+    assert [row['name'] for row in body['pending']] == ['First pending0']
+
+
+@pytest.mark.parametrize('query_string', ['', '?stream=1'], ids=['page', 'stream'])
+def test_hod_without_department_gets_no_queue(client, tokens, query_string):
+    response = _get(client, tokens['orphan'], query_string)
+    assert response.status_code == 404
+    assert 'pending' not in response.get_json()
@@ -0,0 +1,111 @@
+"""Uploaded documents are only served to their owner and the people who may view the owner's profile."""
+import hashlib
+import os
+
+import pytest
+
+from models.attachment import Attachment
+from models.department import College, Department
+from services.attachment_store import AttachmentStore
+from tests.conftest import create_faculty, login
+
+
+DOCUMENT = b'%PDF-1.4\n' + bytes(range(256)) * 16
+PHOTO = b'\x89PNG\r\n\x1a\n' + bytes(range(256))
+
+
+def _blob(upload_folder, content, extension, attachment_type):
+    """Write content into the blob tree and return its Attachment row."""
+    digest = hashlib.sha256(content).hexdigest()
+    file_path = AttachmentStore.blob_path(digest, extension)
+    full_path = os.path.join(upload_folder, *file_path.split('/'))
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'wb') as f:
+        f.write(content)
+    return Attachment(file_path=file_path, attachment_type=attachment_type, content_hash=digest,
+                      file_size=len(content))
+
+
+def _seed(app, db):
+    """An owner with an Aadhaar scan and a photo, a peer in their department and the HOD of another."""
+    college = College(college_name='College', college_code='C')
+    departments = [Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                   for d in range(2)]
+    db.session.add_all(departments)
+    db.session.flush()
+    
+    document = _blob(app.config['UPLOAD_FOLDER'], DOCUMENT, '.pdf', 'attachment')
+    photo = _blob(app.config['UPLOAD_FOLDER'], PHOTO, '.png', 'gallery_image')
+    db.session.add_all([document, photo])
+    db.session.flush()
+    
+    owner = create_faculty(db, departments[0], 'owner', aadhar_attachment_id=document.attachment_id,
+                           photo_attachment_id=photo.attachment_id)
+    peer = create_faculty(db, departments[0], 'peer')
+    other_hod = create_faculty(db, departments[1], 'hod', role_name='hod')
+    db.session.commit()
+    return {
+        'owner': owner.user_id,
+        'peer': peer.user_id,
+        'other_hod': other_hod.user_id,
+        'document': (document.attachment_id, document.file_path),
+        'photo': photo.file_path
+    }
+
+
+@pytest.fixture
+def seeded(app, db, tmp_path):
+    # Keep uploads under the static folder, as in production, so a path URL would find the file
+    app.static_folder = str(tmp_path / 'static')
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'static' / 'uploads')
+    with app.app_context():
+        return _seed(app, db)
+
+
+def _client(app, user_id):
+    client = app.test_client()
+    login(client, user_id)
+    return client
+
+
+def test_owner_downloads_document(app, seeded):
+    attachment_id, _ = seeded['document']
+    response = _client(app, seeded['owner']).get(f'/attachments/{attachment_id}')
+    assert response.status_code == 200
+    assert response.data == DOCUMENT
+    assert 'private' in response.headers['Cache-Control']
+
+
+@pytest.mark.parametrize('viewer', ['peer', 'other_hod'])
+def test_other_faculty_cannot_download_document(app, seeded, viewer):
+    attachment_id, _ = seeded['document']
+    response = _client(app, seeded[viewer]).get(f'/attachments/{attachment_id}')
+    assert response.status_code == 403
+
+
+def test_requests_keep_their_own_signed_in_user(app, seeded):
+    attachment_id, _ = seeded['document']
+    assert _client(app, seeded['owner']).get(f'/attachments/{attachment_id}').status_code == 200
+    assert _client(app, seeded['peer']).get(f'/attachments/{attachment_id}').status_code == 403
+
+
+def test_document_is_not_served_by_static_path(app, seeded):
+    client = _client(app, seeded['owner'])
+    _, file_path = seeded['document']
+    assert client.get(f'/static/uploads/{file_path}').status_code == 404
+    # Gallery images under the same folder still are
+    assert client.get(f"/static/uploads/{seeded['photo']}").status_code == 200
+
+
+def test_range_and_conditional_requests(app, seeded):
+    attachment_id, _ = seeded['document']
+    client = _client(app, seeded['owner'])
+    
+    response = client.get(f'/attachments/{attachment_id}', headers={'Range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert response.data == DOCUMENT[:10]
+    
+    etag = client.get(f'/attachments/{attachment_id}').headers['ETag']
+    response = client.get(f'/attachments/{attachment_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
@@ -0,0 +1,51 @@
+"""HODs only ever browse their own department in the faculty directory."""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models.department import College, Department
+from config.constants import ProfileStatus
+from tests.conftest import create_faculty
+
+
+def _seed(db):
+    """Two departments with two faculty each, an HOD of the first and an HOD with no department."""
+    college = College(college_name='College', college_code='C')
+    departments = [Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                   for d in range(2)]
+    db.session.add_all(departments)
+    db.session.flush()
+    for d, department in enumerate(departments):
+        for i in range(2):
+            create_faculty(db, department, f'{d}_{i}', profile_status=ProfileStatus.APPROVED)
+    hod = create_faculty(db, departments[0], 'hod', role_name='hod')
+    orphan = create_faculty(db, None, 'orphan', role_name='hod')
+    db.session.commit()
+    return {
+        'hod': create_access_token(identity=str(hod.user_id)),
+        'orphan': create_access_token(identity=str(orphan.user_id))
+    }
+
+
+@pytest.fixture
+def tokens(app, db):
+    with app.app_context():
+        return _seed(db)
+
+
+def _get(client, token):
+    return client.get('/api/faculty/directory', headers={'Authorization': f'Bearer {token}'})
+
+
+def test_hod_browses_own_department(client, tokens):
+    response = _get(client, tokens['hod'])
+    assert response.status_code == 200
+    body = response.get_json()
+    # Two faculty and the HOD
+    assert body['total'] == 3
+    assert {row['department'] for row in body['faculty']} == {'Department 0'}
+
+
+def test_hod_without_department_is_rejected(client, tokens):
+    response = _get(client, tokens['orphan'])
+    assert response.status_code == 404
+    assert 'faculty' not in response.get_json()
@@ -0,0 +1,35 @@
+"""The HOD assignment page reads only HOD rows, however large the roster."""
+from models.department import College, Department
+from services.hod_service import HODService
+from tests.conftest import count_queries, create_faculty
+
+
+def _seed(db, faculty_per_department):
+    """Three departments, the first two with an HOD, each with `faculty_per_department` other faculty."""
+    college = College(college_name='College', college_code='C')
+    departments = [Department(department_name=f'Department {d}', department_code=f'D{d}', college=college)
+                   for d in range(3)]
+    db.session.add_all(departments)
+    db.session.flush()
+    for d, department in enumerate(departments):
+        if d < 2:
+            create_faculty(db, department, f'{d}_hod', role_name='hod')
+        for i in range(faculty_per_department):
+            create_faculty(db, department, f'{d}_{i}')
+    db.session.commit()
+
+
+def test_department_heads(app, db):
+    with app.app_context():
+        _seed(db, faculty_per_department=2)
+        
+        with count_queries(db.engine) as statements:
+            heads = HODService.department_heads()
+        # Departments, then only the faculty rows holding the HOD role
+        assert len(statements) == 2
+        assert 'user_roles' in statements[1]
+        
+        hods = {head['department_name']: head['hod'] and head['hod']['full_name'] for head in heads}
+        assert hods == {'Department 0': 'First 0_hod', 'Department 1': 'First 1_hod', 'Department 2': None}
+        assert all(head['assigned_at'] is not None for head in heads if head['hod'])
+
@@ -0,0 +1,32 @@
+"""Role checks on users other than the signed-in one only load their roles."""
+from models.department import College, Department
+from models.user import User
+from tests.conftest import count_queries, create_faculty
+
+
+def _user(db):
+    college = College(college_name='College', college_code='C')
+    department = Department(department_name='Department', department_code='D', college=college)
+    db.session.add(department)
+    db.session.flush()
+    user_id, department_id = create_faculty(db, department, 'hod', role_name='hod').user_id, department.department_id
+    db.session.commit()
+    db.session.remove()
+    return db.session.get(User, user_id), department_id
+
+
+def test_role_check_loads_only_roles(app, db):
+    with app.app_context():
+        user, department_id = _user(db)
+        
+        with count_queries(db.engine) as statements:
+            assert user.is_hod
+            assert not user.is_admin
+        assert len(statements) == 1
+        
+        # The faculty row is fetched once, when a faculty field is first read
+        with count_queries(db.engine) as statements:
+            assert user.identity.hod_department_id == department_id
+            assert user.identity.faculty_id is not None
+            assert user.identity.photo_path is None
+        assert len(statements) == 1
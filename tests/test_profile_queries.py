@@ -0,0 +1,113 @@
+"""The profile page and API cost a fixed number of queries however many rows a profile has."""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models.attachment import Attachment
+from models.department import College, Department
+from models.faculty import (
+    FacultyAdditionalDetails, WorkExperience, TeachingActivity, ResearchPublication,
+    WorkshopSeminar, MDPFDP, HonoursAward, ResearchConsultancy, Activity, LookupTable
+)
+from services.profile_service import ProfileService
+from tests.conftest import count_queries, create_faculty, login
+
+
+def _lookup(lookup_type):
+    return LookupTable.query.filter_by(lookup_type=lookup_type).first().lookup_id
+
+
+def _seed_profile(db, rows):
+    """A faculty member with `rows` entries, each with an attachment, in every section."""
+    college = College(college_name='College', college_code='C')
+    department = Department(department_name='Department', department_code='D', college=college)
+    db.session.add(department)
+    db.session.flush()
+    faculty = create_faculty(db, department, 'owner')
+    fid = faculty.faculty_id
+    db.session.add(FacultyAdditionalDetails(faculty_id=fid))
+    
+    def attachment(n):
+        row = Attachment(file_path=f'document-{n}.pdf', attachment_type='attachment')
+        db.session.add(row)
+        db.session.flush()
+        return row.attachment_id
+    
+    publication_type, workshop_type = _lookup('publication_type'), _lookup('workshop_type')
+    fdp_type, award_category, agency = _lookup('fdp_mdp_type'), _lookup('award_category'), _lookup('funding_agency')
+    for i in range(rows):
+        n = i * 10
+        db.session.add_all([
+            WorkExperience(faculty_id=fid, institution_name='Institute', experience_type='Teaching',
+                           service_certificate_attachment_id=attachment(n)),
+            TeachingActivity(faculty_id=fid, course_name='Course', attachment_id=attachment(n + 1)),
+            ResearchPublication(faculty_id=fid, title='Paper', type_id=publication_type,
+                                attachment_id=attachment(n + 2)),
+            WorkshopSeminar(faculty_id=fid, title='Workshop', type_id=workshop_type,
+                            attachment_id=attachment(n + 3)),
+            MDPFDP(faculty_id=fid, title='Programme', type_id=fdp_type, attachment_id=attachment(n + 4)),
+            HonoursAward(faculty_id=fid, award_title='Award', category_id=award_category,
+                         attachment_id=attachment(n + 5)),
+            ResearchConsultancy(faculty_id=fid, project_title='Project', agency_id=agency,
+                                attachment_id=attachment(n + 6)),
+            Activity(faculty_id=fid, activity_title='Activity', attachment_id=attachment(n + 7))
+        ])
+    db.session.commit()
+    return faculty.faculty_id, faculty.user_id
+
+
+def _view_profile_queries(app, db, rows):
+    with app.app_context():
+        faculty_id, user_id = _seed_profile(db, rows)
+        engine = db.engine
+    client = app.test_client()
+    login(client, user_id)
+    
+    with count_queries(engine) as statements:
+        response = client.get(f'/faculty/profile/view/{faculty_id}')
+    assert response.status_code == 200
+    return len(statements)
+
+
+def _api_profile_queries(app, db, rows, query_string=''):
+    with app.app_context():
+        _, user_id = _seed_profile(db, rows)
+        token = create_access_token(identity=str(user_id))
+        engine = db.engine
+    client = app.test_client()
+    
+    with count_queries(engine) as statements:
+        response = client.get('/api/faculty/profile' + query_string, headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+@pytest.fixture(params=[1, 10], ids=['1-row', '10-rows'])
+def rows(request):
+    return request.param
+
+
+# The signed-in user, the target faculty row checked by
+# same_department_required, then the profile and one query per section
+VIEW_PROFILE_BUDGET = 1 + 1 + 1 + len(ProfileService.SECTIONS)
+
+# The JWT user, the ETag/Last-Modified probe and the profile with its
+# additional details
+API_PROFILE_BUDGET = 3
+
+# ... plus one query per requested section
+API_FULL_PROFILE_BUDGET = API_PROFILE_BUDGET + len(ProfileService.SECTIONS)
+
+
+def test_view_profile_query_budget(app, db, rows):
+    assert _view_profile_queries(app, db, rows) == VIEW_PROFILE_BUDGET
+
+
+def test_api_profile_query_budget(app, db, rows):
+    count, _ = _api_profile_queries(app, db, rows)
+    assert count == API_PROFILE_BUDGET
+
+
+def test_api_full_profile_query_budget(app, db, rows):
+    count, profile = _api_profile_queries(app, db, rows, '?include=' + ','.join(ProfileService.SECTIONS))
+    assert count == API_FULL_PROFILE_BUDGET
+    assert len(profile['research_publications']) == rows
@@ -0,0 +1,36 @@
+"""Bulk status changes send the same emails as the single-profile notifications."""
+from flask_jwt_extended import create_access_token
+
+from models.department import College, Department
+from models.faculty import Faculty
+from models.user import User
+from config.constants import ProfileStatus
+from mailservice.email_service import profile_status_message
+from tests.conftest import create_faculty
+
+
+def test_bulk_approval_sends_single_profile_email(app, db, client, monkeypatch):
+    sent = []
+    monkeypatch.setattr('services.profile_status.send_emails', sent.extend)
+    
+    with app.app_context():
+        college = College(college_name='College', college_code='C')
+        department = Department(department_name='Department', department_code='D', college=college)
+        db.session.add(department)
+        db.session.flush()
+        faculty_ids = [create_faculty(db, department, str(i), profile_status=ProfileStatus.PENDING).faculty_id
+                       for i in range(2)]
+        db.session.commit()
+        admin = User.query.filter_by(username='admin').one()
+        token = create_access_token(identity=str(admin.user_id))
+    
+    response = client.post('/api/admin/approve-profiles', json={'faculty_ids': faculty_ids},
+                           headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    
+    with app.test_request_context():
+        expected = [profile_status_message(db.session.get(Faculty, faculty_id), ProfileStatus.APPROVED)
+                    for faculty_id in faculty_ids]
+    assert [(msg.subject, msg.recipients, msg.body, msg.html) for msg in sent] == \
+           [(msg.subject, msg.recipients, msg.body, msg.html) for msg in expected]
+    assert all('Profile Approved' in msg.html for msg in sent)
@@ -0,0 +1,42 @@
+import hashlib
+from datetime import timezone
+from flask import Response, request
+
+def make_etag(*parts):
+    """Strong entity tag for a representation whose state is described by `parts`."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def _http_date(value):
+    """HTTP dates have whole seconds; stored timestamps are naive UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+def with_validators(response, etag, last_modified=None):
+    """Attach ETag and Last-Modified, and make clients revalidate before reuse."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    # The body depends on the caller's token, so shared caches must not reuse it
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+def not_modified(etag, last_modified=None):
+    """
+    Return a 304 response if the client's copy is current, otherwise None.
+    
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the request carries no entity tags. Call this before loading or
+    serializing anything.
+    """
+    if request.if_none_match:
+        current = request.if_none_match.contains_weak(etag)
+    elif last_modified is not None and request.if_modified_since is not None:
+        current = _http_date(last_modified) <= request.if_modified_since
+    else:
+        current = False
+    
+    if not current:
+        return None
+    return with_validators(Response(status=304), etag, last_modified)
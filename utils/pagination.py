@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+def clamp_page_size(value, default, maximum):
+    """Parse a requested page size and keep it within 1..maximum."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(value, maximum))
+
+def encode_cursor(values):
+    """Encode the sort key of a row as an opaque, URL-safe cursor."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """
+    Decode a cursor produced by encode_cursor for the given sort columns.
+    
+    Raises ValueError if the cursor is malformed or does not match the columns.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise ValueError('Invalid cursor')
+    
+    values = []
+    for column, value in zip(columns, payload):
+        python_type = column.type.python_type
+        if value is not None and python_type is datetime:
+            if not isinstance(value, str):
+                raise ValueError('Invalid cursor')
+            value = datetime.fromisoformat(value)
+        elif value is not None and not isinstance(value, python_type):
+            raise ValueError('Invalid cursor')
+        values.append(value)
+    return values
+
+def _seek_condition(columns, values, less_than):
+    """Row-value comparison (a, b) < (x, y) written out so every backend can use the index."""
+    conditions = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal = [c == v for c, v in zip(columns[:i], values[:i])]
+        conditions.append(and_(*equal, column < value if less_than else column > value))
+    return or_(*conditions)
+
+def keyset_page(query, columns, limit, after=None, before=None, descending=True):
+    """
+    Fetch one page of `query` ordered by `columns`, seeking from a cursor.
+    
+    Rows are ordered descending by default (newest first); pass
+    descending=False for oldest-first queues. `after` moves forward through
+    that order and `before` moves back. Returns (items, next_cursor,
+    prev_cursor); a cursor is None when there is nothing further in that
+    direction. Every page costs a single indexed range scan regardless of
+    how deep it is.
+    """
+    forward = [column.desc() if descending else column.asc() for column in columns]
+    backward = [column.asc() if descending else column.desc() for column in columns]
+    
+    if before:
+        values = decode_cursor(before, columns)
+        rows = query.filter(_seek_condition(columns, values, less_than=not descending)) \
+                    .order_by(*backward) \
+                    .limit(limit + 1).all()
+        has_more = len(rows) > limit
+        items = list(reversed(rows[:limit]))
+        more_before, more_after = has_more, True
+    else:
+        if after:
+            values = decode_cursor(after, columns)
+            query = query.filter(_seek_condition(columns, values, less_than=descending))
+        rows = query.order_by(*forward).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        items = rows[:limit]
+        more_before, more_after = bool(after), has_more
+    
+    def key(row):
+        return encode_cursor([getattr(row, column.key) for column in columns])
+    
+    next_cursor = key(items[-1]) if items and more_after else None
+    prev_cursor = key(items[0]) if items and more_before else None
+    return items, next_cursor, prev_cursor
@@ -0,0 +1,44 @@
+from flask import Response, current_app, stream_with_context
+
+STREAM_BATCH_SIZE = 1000
+
+def wants_stream(args):
+    """True if the request asked for the streamed export of a collection."""
+    return (args.get('stream') or '').lower() in ('1', 'true', 'yes')
+
+def iter_json_array(items, serialize, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yield a JSON array of serialize(item) for each item, a batch at a time.
+    
+    The opening bracket is yielded before the first row is fetched, so the
+    client receives bytes as soon as the query starts.
+    """
+    dumps = current_app.json.dumps
+    yield '['
+    
+    chunk = []
+    first = True
+    for item in items:
+        chunk.append(dumps(serialize(item), separators=(',', ':')))
+        if len(chunk) >= batch_size:
+            yield ('' if first else ',') + ','.join(chunk)
+            first = False
+            chunk = []
+    
+    if chunk:
+        yield ('' if first else ',') + ','.join(chunk)
+    yield ']'
+
+def stream_json_array(items, serialize, batch_size=STREAM_BATCH_SIZE):
+    """
+    Return a streamed JSON array response for an iterable of rows.
+    
+    Pass a query using yield_per so rows are fetched in batches and only one
+    batch of objects and JSON text is held in memory at a time. The request
+    context (and database session) stays open until the last row is sent.
+    """
+    response = Response(stream_with_context(iter_json_array(items, serialize, batch_size)),
+                        mimetype='application/json')
+    # Ask nginx not to buffer the whole body before forwarding it
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response